@@ -0,0 +1,123 @@
+import hashlib
+import os
+from os.path import isfile, join
+import numpy as np
+from keras.layers import Input, Dense, Dropout
+from keras.losses import categorical_crossentropy
+from keras.models import Model
+from keras.optimizers import SGD
+from AIIntuition.journeys.journey4.imagedataset import ImageDataset
+
+"""
+Train a new classifier head on the cached output of a frozen CNN.
+"""
+
+
+class EmbeddingCache:
+    """
+    When the cnn* layers are frozen their output for a given image never changes, so rather than run the whole
+    convolution stack forward on every image in every epoch, run it once over the data set and train the new
+    classifier head on the result.
+
+    The output of the CNN (the cnnOutput_Flatten layer by default) is computed in batches & written to a memory
+    mapped .npy in the cache directory, keyed by the data set name & shape and a hash of the CNN weights, so it is
+    only recomputed when the data set or the (loaded) weights change. The head has the same layers & names as
+    build_classifier_layers in the notebook, so once trained its weights are copied into the full model with
+    transfer_head.
+
+    The embeddings are taken in inference mode (Dropout off, BatchNorm using its moving statistics), which is how
+    frozen layers behave once the model is deployed.
+    """
+
+    __file_ext = '.npy'
+
+    def __init__(self,
+                 model: Model,
+                 layer_name: str = 'cnnOutput_Flatten',
+                 cache_dir: str = '.embedding_cache',
+                 batch_size: int = 128):
+        """
+        :param model: The model holding the (loaded & frozen) CNN layers
+        :param layer_name: The name of the last CNN layer, whose output is the embedding
+        :param cache_dir: The directory to hold the embeddings, created if it does not exist
+        :param batch_size: The number of images per predict call when computing embeddings
+        """
+        self._encoder = Model(inputs=model.input, outputs=model.get_layer(layer_name).output)
+        self._cache_dir = cache_dir
+        self._batch_size = batch_size
+        os.makedirs(self._cache_dir, exist_ok=True)
+
+    @property
+    def embedding_size(self) -> int:
+        """
+        The number of features in each embedding
+        """
+        return int(np.prod(self._encoder.output_shape[1:]))
+
+    def __weights_hash(self) -> str:
+        h = hashlib.sha1()
+        for w in self._encoder.get_weights():
+            h.update(str(w.shape).encode('utf-8'))
+            h.update(np.ascontiguousarray(w).tobytes())
+        return h.hexdigest()
+
+    def embed(self,
+              x: np.ndarray,
+              name: str) -> np.ndarray:
+        """
+        The embeddings of the given images, computed once and then loaded from the cache
+        :param x: The images, uint8 images are normalised to 0.0 - 1.0 a batch at a time
+        :param name: A name that identifies the images e.g. 'apples-6-train', a changed set of images must be given
+        a new name (the shape & CNN weights are part of the key, the pixels are not)
+        :return: Read only memory mapped (num images, embedding size) float32 embeddings
+        """
+        key = hashlib.sha1((name + str(x.shape) + str(x.dtype) + self.__weights_hash()).encode('utf-8')).hexdigest()
+        file_name = join(self._cache_dir, name + '-' + key + self.__file_ext)
+        if not isfile(file_name):
+            tmp_file = file_name + '.tmp'
+            emb = np.lib.format.open_memmap(tmp_file, mode='w+', dtype=np.float32,
+                                            shape=(len(x), self.embedding_size))
+            for b in range(0, len(x), self._batch_size):
+                batch = x[b:b + self._batch_size]
+                if batch.dtype == np.uint8:
+                    batch = ImageDataset.normalise(batch)
+                pred = self._encoder.predict(batch, batch_size=self._batch_size)
+                emb[b:b + len(batch)] = pred.reshape(len(batch), -1)
+            emb.flush()
+            del emb
+            os.replace(tmp_file, file_name)
+        return np.load(file_name, mmap_mode='r')
+
+    def build_head(self,
+                   num_classes: int) -> Model:
+        """
+        A compiled classifier head that takes embeddings as input, with the same layers & names as
+        build_classifier_layers in the notebook
+        :param num_classes: The number of output classes
+        :return: The head model
+        """
+        head_in = Input(shape=(self.embedding_size,), name='clEmbeddingInput')
+        cl_l1 = Dense(25, activation='relu', name='clInput_Dense')(head_in)
+        cl_l2 = Dropout(rate=0.25, name='cl1_Dropout')(cl_l1)
+        cl_out = Dense(num_classes, activation='softmax', name='clOutput')(cl_l2)
+        head = Model(inputs=[head_in], outputs=[cl_out])
+        head.compile(loss=categorical_crossentropy,
+                     optimizer=SGD(lr=0.01),
+                     metrics=['accuracy'])
+        return head
+
+    @classmethod
+    def transfer_head(cls,
+                      head: Model,
+                      model: Model) -> None:
+        """
+        Copy the weights of the trained head into the layers of the same name in the full model
+        :param head: The head trained on embeddings
+        :param model: The full model with the CNN & classifier layers
+        """
+        for layer in head.layers:
+            weights = layer.get_weights()
+            if len(weights) > 0:
+                model.get_layer(layer.name).set_weights(weights)
+        return
+
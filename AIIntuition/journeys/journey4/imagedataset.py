@@ -0,0 +1,207 @@
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from os import listdir
+from os.path import isdir, isfile, join
+from typing import Dict, List, Tuple
+import numpy as np
+from PIL import Image
+
+"""
+Load the Fruit-360 style image data sets as uint8 arrays, decoded in parallel and cached on disk.
+"""
+
+
+class ImageDataset:
+    """
+    Load the images of a list of classes (one sub directory per class in both the test & train data directories)
+    as (num images, height, width, channels) uint8 arrays with integer class labels.
+
+    Images are decoded by a pool of threads (the JPEG decode in PIL releases the GIL) straight into a pre allocated
+    .npy file in the cache directory, in a random order so the data set is shuffled as it is loaded. Later loads of
+    the same class list (with the same image files) memory map the cached file, so nothing is decoded and nothing is
+    copied, the pixels are paged in from disk as they are used.
+
+    The pixels are held as uint8 (1/8 of the memory of the float64 arrays of the notebook), use normalise to rescale
+    a batch to 0.0 - 1.0 as it is used.
+    """
+
+    TEST = 'test'
+    TRAIN = 'train'
+    __file_ext = '.npy'
+    __jpg = re.compile(r'\.jpg$', flags=re.IGNORECASE)
+
+    def __init__(self,
+                 test_data_dir: str,
+                 train_data_dir: str,
+                 cache_dir: str = '.image_cache',
+                 image_shape: Tuple[int, int, int] = (100, 100, 3),
+                 num_workers: int = None,
+                 seed: int = None):
+        """
+        :param test_data_dir: The directory holding one sub directory of test images per class
+        :param train_data_dir: The directory holding one sub directory of training images per class
+        :param cache_dir: The directory to hold the decoded data sets, created if it does not exist
+        :param image_shape: The (height, width, channels) every image must have
+        :param num_workers: The number of decode threads, by default the number of CPUs
+        :param seed: Optional seed for the order images are shuffled into when first decoded
+        """
+        self._data_dirs = {self.TEST: test_data_dir, self.TRAIN: train_data_dir}
+        self._cache_dir = cache_dir
+        self._image_shape = tuple(image_shape)
+        self._num_workers = num_workers if num_workers is not None else (os.cpu_count() or 1)
+        self._rnd = np.random.RandomState(seed)
+        os.makedirs(self._cache_dir, exist_ok=True)
+
+    @classmethod
+    def one_hot_dicts(cls,
+                      classes: List[str]) -> Tuple[Dict[str, np.ndarray], Dict[str, str]]:
+        """
+        The one hot encoding of the given list of classes, as create_one_hot_encoding_dicts in the notebook
+        :return: class name : one hot vector, string form of one hot vector : class name
+        """
+        class_to_one_hot = dict()
+        one_hot_to_class = dict()
+        for i, c in enumerate(classes):
+            oh = np.zeros((len(classes)))
+            oh[i] = 1
+            class_to_one_hot[c] = oh
+            one_hot_to_class[np.array2string(oh)] = c
+        return class_to_one_hot, one_hot_to_class
+
+    @classmethod
+    def one_hot(cls,
+                labels: np.ndarray,
+                num_classes: int,
+                dtype=np.float32) -> np.ndarray:
+        """
+        The one hot encoding of the given integer labels
+        :return: (num labels, num classes) array
+        """
+        return np.eye(num_classes, dtype=dtype)[labels]
+
+    @classmethod
+    def normalise(cls,
+                  x: np.ndarray,
+                  dtype=np.float32) -> np.ndarray:
+        """
+        Rescale uint8 pixels to 0.0 to 1.0
+        """
+        return x.astype(dtype) / 255.0
+
+    @classmethod
+    def list_files(cls,
+                   data_dir: str) -> List[str]:
+        """
+        The JPG files in the given directory, in name order
+        """
+        return sorted(f for f in listdir(data_dir) if isfile(join(data_dir, f)) and cls.__jpg.search(f))
+
+    def load(self,
+             classes: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict, Dict]:
+        """
+        Load the given list of classes, the nth class has label n
+        :param classes: The names of the classes (sub directories) to load
+        :return: x_train, y_train, x_test, y_test as load_data in the notebook except x is read only memory mapped
+        uint8 and y is float32. Plus the one hot dictionaries.
+        """
+        x_train, labels_train = self.load_split(classes, self.TRAIN)
+        x_test, labels_test = self.load_split(classes, self.TEST)
+        one_hot_dict, item_dict = self.one_hot_dicts(classes)
+        return x_train, \
+            self.one_hot(labels_train, len(classes)), \
+            x_test, \
+            self.one_hot(labels_test, len(classes)), \
+            one_hot_dict, \
+            item_dict
+
+    def load_split(self,
+                   classes: List[str],
+                   split: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Load the test or train images of the given classes, decoding & caching them if they are not already cached.
+        :param classes: The names of the classes (sub directories) to load
+        :param split: ImageDataset.TEST or ImageDataset.TRAIN
+        :return: Read only memory mapped (n, height, width, channels) uint8 images, (n,) uint8 class labels
+        """
+        files = self.__files(classes, split)
+        key = self.__key(classes, split, files)
+        x_file = join(self._cache_dir, key + '.x' + self.__file_ext)
+        y_file = join(self._cache_dir, key + '.y' + self.__file_ext)
+        if not (isfile(x_file) and isfile(y_file)):
+            self.__decode(files, x_file, y_file)
+        return np.load(x_file, mmap_mode='r'), np.load(y_file)
+
+    def __files(self,
+                classes: List[str],
+                split: str) -> List[Tuple[str, int]]:
+        """
+        The image files of the given classes
+        :return: [(file path, label)]
+        """
+        files = []
+        for label, c in enumerate(classes):
+            class_dir = join(self._data_dirs[split], c)
+            if not isdir(class_dir):
+                raise ValueError('Cannot load unknown class - missing from ' + split + ' data set [' + c + ']')
+            files.extend((join(class_dir, f), label) for f in self.list_files(class_dir))
+        if len(files) == 0:
+            raise ValueError('No images to load for classes: ' + str(classes))
+        return files
+
+    def __key(self,
+              classes: List[str],
+              split: str,
+              files: List[Tuple[str, int]]) -> str:
+        """
+        Hash of the classes, image shape & the name and size of every image, so added, removed or changed images
+        are a miss rather than a stale hit.
+        """
+        h = hashlib.sha1()
+        h.update(json.dumps([split, classes, self._image_shape]).encode('utf-8'))
+        for f, label in files:
+            h.update((os.path.relpath(f, self._data_dirs[split]) + ':' + str(os.path.getsize(f)) + ':' +
+                      str(label) + '\n').encode('utf-8'))
+        return split + '-' + h.hexdigest()
+
+    def __decode(self,
+                 files: List[Tuple[str, int]],
+                 x_file: str,
+                 y_file: str) -> None:
+        """
+        Decode the given images in parallel, in random order, into the cache files. The files are written under
+        temporary names & renamed when complete, so an interrupted decode never leaves a partial cache entry.
+        """
+        order = self._rnd.permutation(len(files))
+        tmp_x = x_file + '.tmp'
+        x = np.lib.format.open_memmap(tmp_x, mode='w+', dtype=np.uint8, shape=(len(files),) + self._image_shape)
+        labels = np.zeros(len(files), dtype=np.uint8)
+
+        def decode_one(i: int) -> None:
+            f, label = files[i]
+            with Image.open(f) as img:
+                pixels = np.asarray(img.convert('RGB') if self._image_shape[-1] == 3 else img)
+            if pixels.shape != self._image_shape:
+                raise ValueError('Image ' + f + ' has shape ' + str(pixels.shape) + ' expected ' +
+                                 str(self._image_shape))
+            x[order[i]] = pixels
+            labels[order[i]] = label
+
+        with ThreadPoolExecutor(max_workers=self._num_workers) as pool:
+            for _ in pool.map(decode_one, range(len(files))):
+                pass
+        x.flush()
+        del x
+        np.save(y_file + '.tmp' + self.__file_ext, labels)
+        os.replace(tmp_x, x_file)
+        os.replace(y_file + '.tmp' + self.__file_ext, y_file)
+        return
+
+
+if __name__ == "__main__":
+    data_dir = '../../data'
+    ds = ImageDataset(data_dir + '/Test', data_dir + '/Train')
+    xtr, ytr, xte, yte, _, items = ds.load(["Apple Golden 1", "Apple Red 1"])
+    print(xtr.shape, xtr.dtype, ytr.shape, xte.shape, yte.shape)
@@ -0,0 +1,270 @@
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, Tuple
+import numpy as np
+from AIIntuition.journeys.journey4.imagedataset import ImageDataset
+
+try:
+    from tflite_runtime.interpreter import Interpreter  # The small runtime only package, e.g. on a Raspberry Pi
+except ImportError:
+    try:
+        from tensorflow.lite import Interpreter
+    except ImportError:
+        Interpreter = None
+
+"""
+Export a trained Keras classifier as a quantised TensorFlow Lite model & run it.
+"""
+
+
+class LiteModel:
+    """
+    A TensorFlow Lite version of a trained classifier for fast inference on ARM CPUs (e.g. Raspberry Pi).
+
+    export converts the Keras model with its weights (and for int8 its activations, calibrated on a sample of
+    representative images) quantised, int8 models are ~1/4 and float16 ~1/2 the size of the float32 model. The
+    exported model keeps float32 input & output so it is a drop in replacement: predict takes the same images as the
+    Keras model (uint8 images are normalised) and returns the class scores.
+
+    Only the interpreter is needed to run the model, from the tflite_runtime package if installed else from
+    TensorFlow. Exporting needs TensorFlow.
+    """
+
+    INT8 = 'int8'
+    FLOAT16 = 'float16'
+    FLOAT32 = 'float32'
+
+    def __init__(self,
+                 file_name: str,
+                 num_threads: int = None):
+        """
+        :param file_name: The exported .tflite model
+        :param num_threads: The number of CPU threads the interpreter uses, by default the interpreter default. Not
+        supported by the TensorFlow 1.x interpreter.
+        """
+        if Interpreter is None:
+            raise RuntimeError('No TensorFlow Lite interpreter, install tflite_runtime or tensorflow')
+        self._file_name = file_name
+        if num_threads is None:  # The TensorFlow 1.x interpreter has no num_threads argument
+            self._interpreter = Interpreter(model_path=file_name)
+        else:
+            self._interpreter = Interpreter(model_path=file_name, num_threads=num_threads)
+        self._interpreter.allocate_tensors()
+        self._input = self._interpreter.get_input_details()[0]
+        self._output = self._interpreter.get_output_details()[0]
+        self._batch_size = int(self._input['shape'][0])
+
+    @classmethod
+    def export(cls,
+               model,
+               file_name: str,
+               quantisation: str = INT8,
+               representative_images: np.ndarray = None,
+               num_calibration: int = 100) -> int:
+        """
+        Convert the Keras model to a TensorFlow Lite model
+        :param model: The trained Keras model
+        :param file_name: The .tflite file to write
+        :param quantisation: LiteModel.INT8, LiteModel.FLOAT16 or LiteModel.FLOAT32 (no quantisation)
+        :param representative_images: Images to calibrate the int8 activation ranges, e.g. x_train, required for int8
+        :param num_calibration: The number of representative images to calibrate with
+        :return: The size of the exported model in bytes
+        """
+        import tensorflow as tf
+
+        if quantisation not in (cls.INT8, cls.FLOAT16, cls.FLOAT32):
+            raise ValueError('Unknown quantisation: ' + str(quantisation))
+        if quantisation == cls.INT8 and representative_images is None:
+            raise ValueError('Representative images are required to calibrate int8 quantisation')
+
+        h5_file = None
+        if hasattr(tf.lite.TFLiteConverter, 'from_keras_model'):
+            converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        else:  # TensorFlow 1.x converts from a saved Keras model file
+            h5_file = os.path.join(tempfile.mkdtemp(), 'model.h5')
+            model.save(h5_file)
+            converter = tf.lite.TFLiteConverter.from_keras_model_file(h5_file)
+
+        if quantisation != cls.FLOAT32:
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        if quantisation == cls.FLOAT16:
+            converter.target_spec.supported_types = [tf.float16]
+        elif quantisation == cls.INT8:
+            sample = np.random.choice(len(representative_images),
+                                      size=min(num_calibration, len(representative_images)), replace=False)
+
+            def representative_data():
+                for i in np.sort(sample):
+                    img = representative_images[i:i + 1]
+                    yield [ImageDataset.normalise(img) if img.dtype == np.uint8 else img.astype(np.float32)]
+
+            converter.representative_dataset = representative_data
+            converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+
+        lite_model = converter.convert()
+        with open(file_name, 'wb') as f:
+            f.write(lite_model)
+        if h5_file is not None:
+            os.remove(h5_file)
+            os.rmdir(os.path.dirname(h5_file))
+        return len(lite_model)
+
+    @property
+    def size(self) -> int:
+        """
+        The size of the model file in bytes
+        """
+        return os.path.getsize(self._file_name)
+
+    def predict(self,
+                x: np.ndarray,
+                batch_size: int = 32) -> np.ndarray:
+        """
+        The class scores of the given images, as Keras model.predict
+        :param x: The (n, height, width, channels) images, uint8 images are normalised to 0.0 - 1.0
+        :param batch_size: The number of images per interpreter invocation
+        :return: (n, num classes) float32 scores
+        """
+        scores = None
+        for b in range(0, len(x), batch_size):
+            batch = x[b:b + batch_size]
+            if batch.dtype == np.uint8 and self._input['dtype'] == np.float32:
+                batch = ImageDataset.normalise(batch)
+            batch = self.__quantise(batch, self._input)
+            if len(batch) != self._batch_size:
+                self._interpreter.resize_tensor_input(self._input['index'], (len(batch),) + batch.shape[1:])
+                self._interpreter.allocate_tensors()
+                self._batch_size = len(batch)
+            self._interpreter.set_tensor(self._input['index'], batch)
+            self._interpreter.invoke()
+            out = self.__dequantise(self._interpreter.get_tensor(self._output['index']), self._output)
+            if scores is None:
+                scores = np.zeros((len(x),) + out.shape[1:], dtype=np.float32)
+            scores[b:b + len(batch)] = out
+        return scores
+
+    @classmethod
+    def __quantise(cls,
+                   x: np.ndarray,
+                   details: Dict) -> np.ndarray:
+        """
+        The given values in the dtype of the tensor, quantised with the tensor scale & zero point if an integer type
+        """
+        dtype = details['dtype']
+        scale, zero_point = details.get('quantization', (0.0, 0))
+        if np.issubdtype(dtype, np.integer) and scale > 0 and x.dtype != dtype:
+            info = np.iinfo(dtype)
+            return np.clip(np.round(x / scale + zero_point), info.min, info.max).astype(dtype)
+        return x.astype(dtype, copy=False)
+
+    @classmethod
+    def __dequantise(cls,
+                     x: np.ndarray,
+                     details: Dict) -> np.ndarray:
+        scale, zero_point = details.get('quantization', (0.0, 0))
+        if np.issubdtype(x.dtype, np.integer) and scale > 0:
+            return (x.astype(np.float32) - zero_point) * scale
+        return x.astype(np.float32, copy=False)
+
+    @classmethod
+    def benchmark(cls,
+                  keras_model,
+                  lite_model: 'LiteModel',
+                  x: np.ndarray,
+                  batch_size: int = 1,
+                  num_images: int = 100) -> Dict[str, float]:
+        """
+        Compare the latency, model size, memory used while predicting & predictions of the Keras & Lite models over
+        the same images. Memory is measured in a second pass over the images, after the timed pass, so that measuring
+        it does not slow down the timed predictions.
+        :param keras_model: The float32 Keras model
+        :param lite_model: The exported model
+        :param x: The images to predict
+        :param batch_size: The number of images per predict call, 1 for single image latency
+        :param num_images: The number of images (from the start of x) to predict
+        :return: Per image latency (ms) of each model, the speed up, the size (bytes) of the Keras model parameters
+        as float32, the size (bytes) of the .tflite file, for each model the peak bytes allocated through Python (incl.
+        NumPy arrays) & the peak growth in resident memory (bytes, None where not available) while predicting, and the
+        fraction of images both models put in the same class
+        """
+        x = x[:num_images]
+        x_float = ImageDataset.normalise(x) if x.dtype == np.uint8 else x
+        keras_model.predict(x_float[:batch_size], batch_size=batch_size)  # warm up
+        lite_model.predict(x[:batch_size], batch_size=batch_size)
+
+        def keras_predict() -> np.ndarray:
+            return np.concatenate([keras_model.predict(x_float[b:b + batch_size], batch_size=batch_size)
+                                   for b in range(0, len(x), batch_size)])
+
+        def lite_predict() -> np.ndarray:
+            return lite_model.predict(x, batch_size=batch_size)
+
+        start = time.perf_counter()
+        keras_scores = keras_predict()
+        keras_ms = 1000 * (time.perf_counter() - start) / len(x)
+
+        start = time.perf_counter()
+        lite_scores = lite_predict()
+        lite_ms = 1000 * (time.perf_counter() - start) / len(x)
+
+        keras_alloc, keras_rss = cls.__peak_memory(keras_predict)
+        lite_alloc, lite_rss = cls.__peak_memory(lite_predict)
+
+        return {'keras_ms_per_image': keras_ms,
+                'lite_ms_per_image': lite_ms,
+                'speed_up': keras_ms / max(lite_ms, 1e-12),
+                'keras_param_bytes': 4 * keras_model.count_params(),
+                'lite_file_bytes': lite_model.size,
+                'keras_peak_alloc_bytes': keras_alloc,
+                'lite_peak_alloc_bytes': lite_alloc,
+                'keras_peak_rss_growth_bytes': keras_rss,
+                'lite_peak_rss_growth_bytes': lite_rss,
+                'agreement': float(np.mean(np.argmax(keras_scores, axis=1) == np.argmax(lite_scores, axis=1)))}
+
+    @classmethod
+    def __peak_memory(cls,
+                      predict: Callable[[], np.ndarray]) -> Tuple[int, int]:
+        """
+        The peak memory used while running the given predict. Allocations through Python (incl. NumPy arrays) are
+        traced with tracemalloc; the memory the TensorFlow runtimes allocate natively is only seen in the resident set
+        size, which is sampled on a background thread where it can be read (Linux /proc).
+        :return: Peak bytes allocated through Python, Peak growth in resident set size in bytes or None
+        """
+        rss_start = cls.__rss()
+        rss_peak = [rss_start]
+        done = threading.Event()
+
+        def sample() -> None:
+            while not done.wait(0.001):
+                rss_peak[0] = max(rss_peak[0], cls.__rss())
+
+        sampler = None
+        if rss_start is not None:
+            sampler = threading.Thread(target=sample, name='LiteModelRSS', daemon=True)
+            sampler.start()
+        tracemalloc.start()
+        try:
+            predict()
+            _, alloc_peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            done.set()
+            if sampler is not None:
+                sampler.join()
+        if rss_start is None:
+            return alloc_peak, None
+        return alloc_peak, max(rss_peak[0], cls.__rss()) - rss_start
+
+    @classmethod
+    def __rss(cls) -> int:
+        """
+        The resident set size of this process in bytes, None if it cannot be read on this platform
+        """
+        try:
+            with open('/proc/self/statm', 'r') as statm:
+                return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, AttributeError):
+            return None
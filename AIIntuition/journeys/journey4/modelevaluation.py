@@ -0,0 +1,118 @@
+import time
+from typing import List
+import numpy as np
+from AIIntuition.journeys.journey4.imagedataset import ImageDataset
+
+"""
+Evaluate a classifier over a test set in large batches.
+"""
+
+
+class ModelEvaluation:
+    """
+    The accuracy, confusion matrix & throughput of a classifier over (a sample of) a test set, in place of calling
+    predict once per image as test_model_prediction in the notebook does.
+
+    The sampled images are predicted in batches of batch_size, in index order so a memory mapped test set is read
+    sequentially, uint8 images are normalised a batch at a time. The predicted & expected classes are the argmax of
+    the whole prediction & one hot arrays in one step.
+    """
+
+    def __init__(self,
+                 expected: np.ndarray,
+                 predicted: np.ndarray,
+                 num_classes: int,
+                 seconds: float,
+                 class_names: List[str] = None):
+        """
+        :param expected: The (n,) expected class labels
+        :param predicted: The (n,) predicted class labels
+        :param num_classes: The number of classes
+        :param seconds: The elapsed time of the predictions
+        :param class_names: Optional names of the classes, in label order
+        """
+        self._num_images = len(expected)
+        self._seconds = seconds
+        self._class_names = class_names if class_names is not None else [str(c) for c in range(0, num_classes)]
+        self._confusion = np.zeros((num_classes, num_classes), dtype=np.int64)
+        np.add.at(self._confusion, (expected, predicted), 1)
+
+    @classmethod
+    def evaluate(cls,
+                 model,
+                 x_test_set: np.ndarray,
+                 y_test_set: np.ndarray,
+                 num_to_test: int = None,
+                 batch_size: int = 256,
+                 class_names: List[str] = None,
+                 seed: int = None) -> 'ModelEvaluation':
+        """
+        Predict a random sample of the test set in batches
+        :param model: The (Keras) model, anything with predict(x, batch_size) returning (n, num classes) scores
+        :param x_test_set: The test images, uint8 images are normalised to 0.0 - 1.0 before prediction
+        :param y_test_set: The one hot expected classes
+        :param num_to_test: The number of images to sample (with replacement as the notebook), all if not given
+        :param batch_size: The number of images per predict call
+        :param class_names: Optional names of the classes, in label order
+        :param seed: Optional seed for the sample
+        :return: The evaluation
+        """
+        if num_to_test is None:
+            idx = np.arange(0, len(x_test_set))
+        else:
+            idx = np.sort(np.random.RandomState(seed).randint(len(x_test_set), size=num_to_test))
+        expected = np.argmax(np.asarray(y_test_set)[idx], axis=1)
+        predicted = np.zeros(len(idx), dtype=np.int64)
+        start = time.perf_counter()
+        for b in range(0, len(idx), batch_size):
+            batch = x_test_set[idx[b:b + batch_size]]
+            if batch.dtype == np.uint8:
+                batch = ImageDataset.normalise(batch)
+            predicted[b:b + batch_size] = np.argmax(model.predict(batch, batch_size=batch_size), axis=1)
+        seconds = time.perf_counter() - start
+        return ModelEvaluation(expected, predicted, y_test_set.shape[1], seconds, class_names)
+
+    @property
+    def num_images(self) -> int:
+        """
+        The number of images evaluated
+        """
+        return self._num_images
+
+    @property
+    def accuracy(self) -> float:
+        """
+        The fraction of images correctly classified
+        """
+        return float(np.trace(self._confusion)) / max(1, self._num_images)
+
+    @property
+    def confusion_matrix(self) -> np.ndarray:
+        """
+        The (num classes, num classes) counts of images by expected class (row) & predicted class (column)
+        """
+        return self._confusion.copy()
+
+    @property
+    def class_accuracy(self) -> np.ndarray:
+        """
+        The fraction of images of each expected class correctly classified, NaN for classes not in the sample
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.diag(self._confusion) / np.sum(self._confusion, axis=1)
+
+    @property
+    def images_per_second(self) -> float:
+        """
+        The prediction throughput
+        """
+        return self._num_images / max(self._seconds, 1e-12)
+
+    def __str__(self) -> str:
+        s = 'Overall Score : ' + str(round(100 * self.accuracy, 1)) + '% of ' + str(self._num_images) + \
+            ' images at ' + str(round(self.images_per_second, 1)) + ' images/sec\n'
+        width = max(len(n) for n in self._class_names)
+        s += ' ' * width + ' ' + ' '.join('{:>6}'.format(i) for i in range(0, len(self._class_names))) + '\n'
+        for i, name in enumerate(self._class_names):
+            s += name.rjust(width) + ' ' + ' '.join('{:>6}'.format(n) for n in self._confusion[i]) + '\n'
+        return s
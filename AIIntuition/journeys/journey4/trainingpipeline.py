@@ -0,0 +1,185 @@
+import queue
+import threading
+from typing import Iterator, List, Tuple
+import numpy as np
+from AIIntuition.journeys.journey4.imagedataset import ImageDataset
+
+"""
+Stream shuffled, normalised & augmented training batches from uint8 (memory mapped) data sets.
+"""
+
+
+class TrainingPipeline:
+    """
+    Batches for model training drawn from one or more data sets without concatenating or converting them, in place of
+    building x_all_train as float64 arrays in memory. Each data set is a pair of uint8 images (typically the read
+    only memory mapped arrays of ImageDataset) & their classes, as one hot rows or integer labels.
+
+    Each epoch visits every image of every data set once in a (optionally) shuffled order. A background thread
+    gathers each batch, normalises it to float32 0.0 - 1.0, optionally augments it (random horizontal & vertical
+    flips and brightness) and queues it, up to prefetch batches ahead of the consumer. Only the queued batches are
+    ever held in memory, so the data sets can be larger than RAM.
+    """
+
+    def __init__(self,
+                 data_sets: List[Tuple[np.ndarray, np.ndarray]],
+                 num_classes: int,
+                 batch_size: int = 32,
+                 shuffle: bool = True,
+                 augment: bool = False,
+                 prefetch: int = 4,
+                 seed: int = None):
+        """
+        :param data_sets: List of (images, classes) e.g. [(x_train, y_train_7c), (x1_train, y1_train_7c)]
+        :param num_classes: The number of classes of the one hot output
+        :param batch_size: The number of images per batch
+        :param shuffle: If True the images are visited in a new random order every epoch
+        :param augment: If True apply random flips & brightness to every batch
+        :param prefetch: The maximum number of batches prepared ahead of the consumer
+        :param seed: Optional seed for the shuffle & augmentation
+        """
+        if len(data_sets) == 0:
+            raise ValueError('At least one data set is required')
+        if batch_size <= 0 or prefetch <= 0:
+            raise ValueError('Batch size & prefetch must be > 0, given: ' + str(batch_size) + ', ' + str(prefetch))
+        self._images = [x for x, _ in data_sets]
+        self._labels = [self.__labels(y) for _, y in data_sets]
+        for x, labels in zip(self._images, self._labels):
+            if len(x) != len(labels):
+                raise ValueError('Data set has ' + str(len(x)) + ' images but ' + str(len(labels)) + ' classes')
+        self._starts = np.cumsum([0] + [len(x) for x in self._images])
+        self._num_classes = num_classes
+        self._batch_size = batch_size
+        self._shuffle = shuffle
+        self._augment = augment
+        self._prefetch = prefetch
+        self._rnd = np.random.RandomState(seed)
+
+    @classmethod
+    def __labels(cls,
+                 y: np.ndarray) -> np.ndarray:
+        """
+        The integer labels of the given one hot rows or labels
+        """
+        y = np.asarray(y)
+        return np.argmax(y, axis=1) if y.ndim == 2 else y.astype(np.int64)
+
+    @property
+    def num_images(self) -> int:
+        """
+        The number of images in all data sets
+        """
+        return int(self._starts[-1])
+
+    def __len__(self) -> int:
+        """
+        The number of batches per epoch
+        """
+        return (self.num_images + self._batch_size - 1) // self._batch_size
+
+    def batches(self,
+                epochs: int = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Generator of training batches, prepared on a background thread
+        :param epochs: The number of epochs, forever if not given (as Keras fit_generator expects)
+        :return: Iterator of (float32 images, float32 one hot classes)
+        """
+        batches = queue.Queue(maxsize=self._prefetch)
+        stop = threading.Event()
+        done = object()
+
+        def put(item) -> bool:
+            """
+            Queue the item, giving up if the consumer stops first, so the producer never blocks on a full queue
+            nobody is reading.
+            :return: True if the item was queued
+            """
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce() -> None:
+            try:
+                epoch = 0
+                while epochs is None or epoch < epochs:
+                    for batch in self.__epoch():
+                        if not put(batch):
+                            return
+                    epoch += 1
+                put(done)
+            except Exception as e:
+                put(e)
+
+        producer = threading.Thread(target=produce, name='TrainingPipeline', daemon=True)
+        producer.start()
+        try:
+            while True:
+                batch = batches.get()
+                if batch is done:
+                    return
+                if isinstance(batch, Exception):
+                    raise batch
+                yield batch
+        finally:
+            stop.set()
+            producer.join()
+
+    def __epoch(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        The batches of one epoch
+        """
+        order = self._rnd.permutation(self.num_images) if self._shuffle else np.arange(0, self.num_images)
+        for b in range(0, len(order), self._batch_size):
+            yield self.__batch(order[b:b + self._batch_size])
+
+    def __batch(self,
+                idx: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gather the images with the given (all data set) indices, reading each data set in index order.
+        """
+        ds = np.searchsorted(self._starts, idx, side='right') - 1
+        x = np.empty((len(idx),) + self._images[0].shape[1:], dtype=np.float32)
+        labels = np.empty(len(idx), dtype=np.int64)
+        for d in np.unique(ds):
+            rows = np.flatnonzero(ds == d)
+            local = idx[rows] - self._starts[d]
+            in_order = np.argsort(local)
+            x[rows[in_order]] = ImageDataset.normalise(self._images[d][local[in_order]])
+            labels[rows] = self._labels[d][local]
+        if self._augment:
+            self.__augment(x)
+        return x, ImageDataset.one_hot(labels, self._num_classes)
+
+    def __augment(self,
+                  x: np.ndarray) -> None:
+        """
+        Randomly flip (horizontally & vertically) and scale the brightness of each image, in place.
+        """
+        n = len(x)
+        h_flip = self._rnd.rand(n) < 0.5
+        x[h_flip] = x[h_flip, :, ::-1]
+        v_flip = self._rnd.rand(n) < 0.5
+        x[v_flip] = x[v_flip, ::-1]
+        x *= self._rnd.uniform(0.8, 1.2, size=(n,) + (1,) * (x.ndim - 1)).astype(np.float32)
+        np.clip(x, 0.0, 1.0, out=x)
+        return
+
+    def fit(self,
+            model,
+            epochs: int,
+            validation_data: Tuple[np.ndarray, np.ndarray] = None):
+        """
+        Train the (Keras) model on the pipeline
+        :param model: The compiled model
+        :param epochs: The number of epochs
+        :param validation_data: Optional (x, y) validation data, uint8 images are normalised
+        :return: The training history
+        """
+        if validation_data is not None and validation_data[0].dtype == np.uint8:
+            validation_data = (ImageDataset.normalise(validation_data[0]), validation_data[1])
+        fit = model.fit_generator if hasattr(model, 'fit_generator') else model.fit
+        return fit(self.batches(), steps_per_epoch=len(self), epochs=epochs, validation_data=validation_data)
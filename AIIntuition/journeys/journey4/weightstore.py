@@ -0,0 +1,174 @@
+import json
+import os
+import re
+import struct
+from typing import Dict, List, Tuple
+import numpy as np
+
+"""
+All the layer weights of a model in one indexed, memory mappable file.
+"""
+
+
+class WeightStore:
+    """
+    A single file holding the weights of every layer (whose name matches a pattern) of a model, in place of the one
+    pickled <layer>.npy per layer of aij_save_cnn_layers.
+
+    The file is a magic number, the length of a JSON index, the index and then the raw weight arrays, each aligned to
+    64 bytes. The index lists, by layer name, the offset, shape & dtype of each weight array of the layer, so layers
+    are loaded by memory mapping just the arrays needed - nothing is pickled or un-pickled.
+    """
+
+    MAGIC = b'AIJWTS01'
+    __align = 64
+    __header = struct.Struct('<8sQ')
+
+    @classmethod
+    def model_layers(cls,
+                     model) -> List:
+        """
+        The layers of the model, if the model wraps other models (e.g. when compiled for multiple GPU) the layers of
+        the wrapped models are given in place of the wrapped model.
+        """
+        layers = []
+        for layer in model.layers:
+            if hasattr(layer, 'layers'):
+                layers.extend(cls.model_layers(layer))
+            else:
+                layers.append(layer)
+        return layers
+
+    @classmethod
+    def save(cls,
+             model,
+             file_name: str,
+             pattern: str = '.*') -> List[str]:
+        """
+        Save the weights of all layers with names that match the pattern
+        :param model: The (Keras) model
+        :param file_name: The weight store file to write
+        :param pattern: Regular expression the layer names must match e.g. '.*cnn.*'
+        :return: The names of the layers saved
+        """
+        weights = {layer.name: layer.get_weights()
+                   for layer in cls.model_layers(model) if re.search(pattern, layer.name)}
+        cls.write(file_name, weights)
+        return list(weights.keys())
+
+    @classmethod
+    def load(cls,
+             model,
+             file_name: str,
+             pattern: str = '.*',
+             trainable: bool = True) -> List[str]:
+        """
+        Load the weights of all layers with names that match the pattern and that are in the store
+        :param model: The (Keras) model, must have the same layer structure as the model the layers were saved from
+        :param file_name: The weight store file to read
+        :param pattern: Regular expression the layer names must match e.g. 'cnn.*'
+        :param trainable: The trainable flag to set on the loaded layers
+        :return: The names of the layers loaded
+        """
+        weights = cls.read(file_name, pattern)
+        loaded = []
+        for layer in cls.model_layers(model):
+            if layer.name in weights:
+                layer.set_weights(weights[layer.name])
+                layer.trainable = trainable
+                loaded.append(layer.name)
+        return loaded
+
+    @classmethod
+    def write(cls,
+              file_name: str,
+              weights: Dict[str, List[np.ndarray]]) -> None:
+        """
+        Write the given weights to a weight store file, the file is written under a temporary name & then renamed.
+        :param file_name: The weight store file to write
+        :param weights: Layer name : list of weight arrays of the layer
+        """
+        arrays = []
+        index = {}
+        offset = 0
+        for name, layer_weights in weights.items():
+            entries = []
+            for w in layer_weights:
+                w = np.ascontiguousarray(w)
+                entries.append({'offset': offset, 'shape': list(w.shape), 'dtype': w.dtype.str})
+                arrays.append(w)
+                offset += cls.__padded(w.nbytes)
+            index[name] = entries
+        index_bytes = json.dumps(index).encode('utf-8')
+        data_start = cls.__padded(cls.__header.size + len(index_bytes))
+
+        tmp_file = file_name + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(cls.__header.pack(cls.MAGIC, len(index_bytes)))
+            f.write(index_bytes)
+            f.write(b'\0' * (data_start - cls.__header.size - len(index_bytes)))
+            for w in arrays:
+                f.write(w.tobytes())
+                f.write(b'\0' * (cls.__padded(w.nbytes) - w.nbytes))
+        os.replace(tmp_file, file_name)
+        return
+
+    @classmethod
+    def index(cls,
+              file_name: str) -> Tuple[Dict[str, List[Dict]], int]:
+        """
+        The index of a weight store file
+        :return: Layer name : [{offset, shape, dtype}] for each weight array of the layer, Offset of the weight data
+        """
+        with open(file_name, 'rb') as f:
+            header = f.read(cls.__header.size)
+            if len(header) != cls.__header.size:
+                raise ValueError('Not a weight store, file too short: ' + file_name)
+            magic, index_len = cls.__header.unpack(header)
+            if magic != cls.MAGIC:
+                raise ValueError('Not a weight store, bad magic number: ' + file_name)
+            index = json.loads(f.read(index_len).decode('utf-8'))
+        return index, cls.__padded(cls.__header.size + index_len)
+
+    @classmethod
+    def read(cls,
+             file_name: str,
+             pattern: str = '.*') -> Dict[str, List[np.ndarray]]:
+        """
+        The weights of all layers in the store with names that match the pattern
+        :param file_name: The weight store file to read
+        :param pattern: Regular expression the layer names must match
+        :return: Layer name : list of read only memory mapped weight arrays of the layer
+        """
+        index, data_start = cls.index(file_name)
+        weights = {}
+        for name, entries in index.items():
+            if re.search(pattern, name):
+                weights[name] = [cls.__map(file_name, data_start, e) for e in entries]
+        return weights
+
+    @classmethod
+    def __map(cls,
+              file_name: str,
+              data_start: int,
+              entry: Dict) -> np.ndarray:
+        shape = tuple(entry['shape'])
+        dtype = np.dtype(entry['dtype'])
+        if int(np.prod(shape)) == 0:
+            return np.zeros(shape, dtype=dtype)  # np.memmap cannot map an empty array
+        return np.memmap(file_name, dtype=dtype, mode='r', offset=data_start + entry['offset'], shape=shape)
+
+    @classmethod
+    def __padded(cls,
+                 num_bytes: int) -> int:
+        return (num_bytes + cls.__align - 1) // cls.__align * cls.__align
+
+
+if __name__ == "__main__":
+    test_file = 'weight_store_test.aijw'
+    WeightStore.write(test_file, {'cnn1_Conv2d': [np.random.rand(5, 5, 3, 16).astype(np.float32),
+                                                  np.zeros(16, dtype=np.float32)],
+                                  'clOutput': [np.random.rand(25, 6), np.random.rand(6)]})
+    print({k: [(e['shape'], e['dtype']) for e in v] for k, v in WeightStore.index(test_file)[0].items()})
+    print({k: [w.shape for w in v] for k, v in WeightStore.read(test_file, 'cnn.*').items()})
+    os.remove(test_file)
@@ -7,9 +7,11 @@ from AIIntuition.journeys.journey5.task import Task
 from AIIntuition.journeys.journey5.taskprofile import TaskProfile
 from AIIntuition.journeys.journey5.randomtaskprofile import RandomTaskProfile
 from AIIntuition.journeys.journey5.util import Util
+from AIIntuition.journeys.journey5.demandhistory import DemandHistory
 
 
 class App(Task):
+    __record_demand_history = False
 
     def __init__(self,
                  task_profile: TaskProfile):
@@ -29,6 +31,7 @@ class App(Task):
 
         # Properties that change during execution
         self._cost = 0  # for the task lifetime , does not reset
+        self._demand_history = None  # for the task lifetime , does not reset, created on first record
 
         self._run_time_in_elapse_hours = None
         self._compute_deficit = None
@@ -81,6 +84,14 @@ class App(Task):
         """
         return deepcopy(self._failed)
 
+    @property
+    def max_mem(self) -> int:
+        """
+        The maximum memory the Load can demand on the Compute resource it is running on
+        :return: The amount of memory in MG (int)
+        """
+        return deepcopy(self._max_mem_demand)
+
     @property
     def current_mem(self) -> int:
         """
@@ -159,6 +170,10 @@ class App(Task):
         cc = self.current_compute
         self._current_comp = self.__compute_demand(local_hour_of_day)
         self._current_mem = self.__memory_demand(local_hour_of_day)
+        if App.__record_demand_history:
+            if self._demand_history is None:
+                self._demand_history = DemandHistory()
+            self._demand_history.record(local_hour_of_day, self._current_comp, self._current_mem)
         return [self.current_compute,
                 cc,
                 self.core_type,
@@ -213,6 +228,37 @@ class App(Task):
         self._cost += cost
         return
 
+    @property
+    def demand_history(self) -> DemandHistory:
+        """
+        The recent hourly compute & memory demand of the task and the forecast of its demand over the next 24 hours
+        :return: The demand history of the task, this is the live history not a copy. None if demand history is not
+        being recorded (see record_demand_history) or no demand has been recorded yet.
+        """
+        return self._demand_history
+
+    @classmethod
+    def record_demand_history(cls,
+                              record: bool) -> None:
+        """
+        Turn recording of the hourly demand history of all Apps on or off, it is off by default as it adds to the
+        cost of every hour of every task. The Scheduler sets this from its demand_history argument when it runs.
+        :param record: True to record the demand history
+        """
+        cls.__record_demand_history = record
+        return
+
+    @property
+    def steady_state(self) -> bool:
+        """
+        Is the resource demand of the task the same every hour - a flat load profile, no memory volatility & no
+        compute deficit
+        :return: True if the task is in a steady state
+        """
+        return self._load_profile == Task.LoadProfile.FLAT and \
+            self._memory_volatility == 0 and \
+            self._compute_deficit == 0
+
     def __memory_demand(self,
                         local_hour_of_day: int) -> int:
         """
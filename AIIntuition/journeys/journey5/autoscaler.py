@@ -0,0 +1,146 @@
+from typing import Dict, List, Tuple
+import numpy as np
+from AIIntuition.journeys.journey5.cputype import CPUType
+from AIIntuition.journeys.journey5.core import Core
+from AIIntuition.journeys.journey5.memory import Memory
+from AIIntuition.journeys.journey5.datacenter import DataCenter
+from AIIntuition.journeys.journey5.host import Host
+from AIIntuition.journeys.journey5.fixedcoreprofile import FixedCoreProfile
+from AIIntuition.journeys.journey5.fixedhostprofile import FixedHostProfile
+from AIIntuition.journeys.journey5.randomcoreprofile import RandomCoreProfile
+from AIIntuition.journeys.journey5.fleetmetrics import FleetMetrics
+from AIIntuition.journeys.journey5.rebalancer import Rebalancer
+from AIIntuition.journeys.journey5.systemtime import SystemTime
+
+"""
+Grow and shrink the fleet to keep Data Center utilisation within a target band.
+"""
+
+
+class Autoscaler:
+    """
+    At each hour boundary the memory & compute utilisation of every Data Center is read from FleetMetrics. If the
+    higher of the two is above the band a Host is added to the Data Center, with a core type drawn from the capacity
+    distribution of the Data Center performance tier & core count and memory drawn as for a random Host. If it is
+    below the band the least utilised Host in the Data Center is drained, by migrating its tasks to other Hosts, and
+    then retired. At most one Host per Data Center is added or retired per hour and a Data Center is left alone for
+    a cool down period after each change, so the effect of a change is seen before the next.
+    """
+
+    def __init__(self,
+                 low: float = 0.3,
+                 high: float = 0.8,
+                 min_hosts_per_dc: int = 1,
+                 max_hosts: int = 100,
+                 cool_down: int = 6,
+                 migration_cost: float = 1.0,
+                 rng: np.random.RandomState = None):
+        """
+        :param low: Utilisation below which a Data Center is shrunk
+        :param high: Utilisation above which a Data Center is grown
+        :param min_hosts_per_dc: The fewest Hosts to leave in a Data Center
+        :param max_hosts: The most Hosts in the whole fleet
+        :param cool_down: The hours to leave a Data Center alone after a Host is added or retired
+        :param migration_cost: The cost booked to each task migrated off a Host being retired
+        :param rng: Optional random state to draw new Host profiles from, if not given the global numpy random state
+        """
+        if not 0.0 <= low < high:
+            raise ValueError('Utilisation band must have 0.0 <= low < high, given: ' + str(low) + ', ' + str(high))
+        self._low = low
+        self._high = high
+        self._min_hosts_per_dc = min_hosts_per_dc
+        self._max_hosts = max_hosts
+        self._cool_down = cool_down
+        self._migration_cost = migration_cost
+        self._rnd = np.random if rng is None else rng
+        self._drain = Rebalancer(mem_threshold=min(1.0, high), compute_threshold=1.0, migration_cost=migration_cost)
+        self._last_change = {}  # Data Center : absolute hour of last change
+        self._num_added = 0
+        self._num_retired = 0
+
+    @property
+    def num_added(self) -> int:
+        """
+        The number of Hosts added by the autoscaler
+        """
+        return self._num_added
+
+    @property
+    def num_retired(self) -> int:
+        """
+        The number of Hosts retired by the autoscaler
+        """
+        return self._num_retired
+
+    def scale(self,
+              sys_time: SystemTime) -> Tuple[int, int]:
+        """
+        Add or retire Hosts in any Data Center outside of the utilisation band
+        :param sys_time: The current system time, at the hour boundary
+        :return: The number of Hosts added, The number of Hosts retired
+        """
+        now = sys_time.hours
+        hosts = Host.all_hosts()
+        by_dc = self.__hosts_by_dc(hosts)
+        added = 0
+        retired = 0
+        for dc, counters in sorted(FleetMetrics.data_center_metrics().items()):
+            if now - self._last_change.get(dc, -self._cool_down) < self._cool_down:
+                continue
+            util = max(FleetMetrics.utilisation(counters))
+            dc_hosts = by_dc.get(dc, [])
+            if util > self._high and len(hosts) + added - retired < self._max_hosts:
+                self.__add_host(sys_time, DataCenter.get_by_country_code(DataCenter.CountryCode(dc)))
+                self._last_change[dc] = now
+                added += 1
+            elif util < self._low and len(dc_hosts) > self._min_hosts_per_dc:
+                self._last_change[dc] = now  # Cool down after a failed drain too, rather than retry every hour
+                if self.__drain_and_retire(sys_time, dc_hosts, hosts):
+                    retired += 1
+                    hosts = Host.all_hosts()
+        self._num_added += added
+        self._num_retired += retired
+        return added, retired
+
+    def __add_host(self,
+                   sys_time: SystemTime,
+                   dc: DataCenter) -> Host:
+        """
+        Create a Host in the given Data Center with a core type drawn from the Data Center capacity distribution.
+        """
+        core_type = CPUType.from_ordinal(int(self._rnd.choice(len(CPUType), p=dc.core_p_dist)))
+        core_counts, p_dist = RandomCoreProfile._p_dist_type[core_type]
+        core_count = core_counts[self._rnd.choice(len(core_counts), p=p_dist)]
+        mem_sizes, p_dist = Memory._p_dist_type[core_type]
+        mem_size = mem_sizes[self._rnd.choice(len(mem_sizes), p=p_dist)]
+        return Host(sys_time,
+                    dc,
+                    FixedHostProfile(core=Core(FixedCoreProfile(core_type=core_type, core_count=core_count)),
+                                     mem=mem_size))
+
+    def __drain_and_retire(self,
+                           sys_time: SystemTime,
+                           dc_hosts: List[Host],
+                           hosts: List[Host]) -> bool:
+        """
+        Migrate all tasks off the least utilised Host in the Data Center & retire it. A target is found for every task
+        before any is moved, if any task cannot be placed no task is migrated & the Host is left in service.
+        :return: True if a Host was retired
+        """
+        hst = min(dc_hosts, key=lambda h: max(FleetMetrics.utilisation(FleetMetrics.host_metrics(h.id))))
+        tasks = hst.migration_candidates()
+        targets = self._drain.select_targets(hosts, hst, tasks)
+        if targets is None:
+            return False
+        for task, target in zip(tasks, targets):
+            hst.migrate_task(sys_time, task, target, self._migration_cost)
+        hst.retire(sys_time)
+        return True
+
+    @classmethod
+    def __hosts_by_dc(cls,
+                      hosts: List[Host]) -> Dict[str, List[Host]]:
+        by_dc = {}
+        for h in hosts:
+            by_dc.setdefault(h.data_center, []).append(h)
+        return by_dc
@@ -8,6 +8,7 @@ from AIIntuition.journeys.journey5.app import App
 from AIIntuition.journeys.journey5.infrnditer import InfRndIter
 from AIIntuition.journeys.journey5.policy import Policy
 from AIIntuition.journeys.journey5.seqpolicy import SequentialPolicy
+from AIIntuition.journeys.journey5.randompolicy import RandomPolicy
 from AIIntuition.journeys.journey5.fixedtaskprofile import FixedTaskProfile
 from AIIntuition.journeys.journey5.fixedhostprofile import FixedHostProfile
 from AIIntuition.journeys.journey5.fixedcoreprofile import FixedCoreProfile
@@ -159,3 +160,39 @@ class Cases:
             compute_iter = InfRndIter(Host.all_hosts())
 
             return num_host, num_app, policy, compute_iter, num_run_days
+
+    class SteadyState(Case):
+        @classmethod
+        def set_up(cls) -> Tuple[int, int, Policy, Iterable, int]:
+            """
+            Set-up the environment for a schedule test case.
+            A fleet of hosts running only flat load, zero volatility apps that fit comfortably, such that every host
+            is in a steady state, e.g. to run with the Scheduler logging only the first execution of each day.
+            """
+            num_host = 4
+            num_app = 40
+            num_run_days = 10
+
+            dc1 = DataCenter(DataCenter.CountryCode.ICELAND)
+            dc2 = DataCenter(DataCenter.CountryCode.GREAT_BRITAIN)
+
+            hosts = []
+            for i in range(0, num_host):
+                fhp = FixedHostProfile(core=Core(FixedCoreProfile(core_type=CPUType.GENERAL, core_count=16)), mem=256)
+                hosts.append(Host(SystemTime(0, 0), dc1 if i % 2 == 0 else dc2, fhp))
+
+            policy = RandomPolicy()
+
+            for i in range(0, num_app):
+                ftp = FixedTaskProfile(max_mem=8,
+                                       mem_vol=0,
+                                       cpu_type=CPUType.GENERAL if i % 2 == 0 else CPUType.BATCH,
+                                       load_factor=1 + i % 3,
+                                       load_profile=Task.LoadProfile.FLAT,
+                                       run_time=24 + (i * 7) % 48)
+                app = App(ftp)
+                policy.select_optimal_compute(app).associate_task(SystemTime(0, 0), app)
+
+            compute_iter = InfRndIter(Host.all_hosts())
+
+            return num_host, num_app, policy, compute_iter, num_run_days
@@ -1,5 +1,5 @@
 from abc import ABC, abstractclassmethod, abstractmethod
-from typing import List
+from typing import Callable, List
 from copy import deepcopy
 from random import randint
 from AIIntuition.journeys.journey5.task import Task
@@ -15,6 +15,7 @@ class Compute(ABC):
     LEN_MAX_COMPUTE = len(str(MAX_COMPUTE_ID))
     __compute_ids = {}
     __all_computes = {}
+    __generation = 0
 
     @property
     @abstractmethod
@@ -106,6 +107,15 @@ class Compute(ABC):
         """
         raise NotImplementedError
 
+    @property
+    @abstractmethod
+    def compute_cost(self) -> float:
+        """
+        The cost of one unit of compute on the compute resource
+        :return: The unit compute cost
+        """
+        raise NotImplementedError
+
     @property
     @abstractmethod
     def num_associated_task(self) -> int:
@@ -139,20 +149,35 @@ class Compute(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def all_tasks(self) -> List[Task]:
+    def is_associated(self,
+                      task_id: str) -> bool:
+        """
+        Is the task with the given id currently associated with this Compute
+        :param task_id: The id of the task
+        :return: True if the task is associated
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def all_tasks(self,
+                  accept: Callable[[Task], bool] = None) -> List[Task]:
         """
         Create a deepcopy list of all tasks associated with the host at this point in time
+        :param accept: Optional test of each (live) task, only the tasks accepted are copied & listed
         :return: A list of tasks
         """
         raise NotImplementedError
 
     @abstractmethod
     def run_next_task(self,
-                      sys_time: SystemTime) -> None:
+                      sys_time: SystemTime,
+                      log_first_execution_only: bool = False) -> None:
         """
         Randomly pick a load from the list of associated and run it - eventually all loads will be run. It is possible
         that loads will not all be run an equal number of times.
         :param sys_time: The current system time of the scheduler (global time)
+        :param log_first_execution_only: If True only the first execution of the day of a load in a steady state is
+        logged, the load is run exactly as if False.
         """
         raise NotImplementedError
 
@@ -161,8 +186,31 @@ class Compute(ABC):
                    compute_id: str,
                    inst: 'Compute') -> None:
         cls.__all_computes[compute_id] = inst
+        cls.__generation += 1
         return
 
+    @classmethod
+    def deregister(cls,
+                   compute_id: str) -> None:
+        """
+        Remove the given compute from the set of existing computes e.g. when a Host is retired.
+        :param compute_id: The id of the compute to remove
+        """
+        if compute_id not in cls.__all_computes:
+            raise ValueError('Compute id:' + compute_id + ' does not exist')
+        del cls.__all_computes[compute_id]
+        cls.__generation += 1
+        return
+
+    @classmethod
+    def generation(cls) -> int:
+        """
+        A count that changes every time a compute is created or removed, so holders of a list of computes can tell
+        when the list is out of date.
+        :return: The current generation
+        """
+        return cls.__generation
+
     @classmethod
     def gen_compute_id(cls,
                        inst: 'Compute') -> str:
@@ -205,8 +253,8 @@ class Compute(ABC):
         Return the Compute that is currently associated with the given task
         :return: The Compute running the task or None of the task is not linked to a compute.
         """
-        for c in cls.__all_computes.keys():
-            for t in cls.__all_computes[c].all_tasks():
-                if t.id == task.id:
-                    return cls.__all_computes[c]
+        task_id = task.id
+        for c in cls.__all_computes.values():
+            if c.is_associated(task_id):
+                return c
         return None
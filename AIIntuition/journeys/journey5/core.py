@@ -1,4 +1,5 @@
 from copy import deepcopy
+import numpy as np
 from AIIntuition.journeys.journey5.cputype import CPUType
 from AIIntuition.journeys.journey5.coreprofile import CoreProfile
 from AIIntuition.journeys.journey5.randomcoreprofile import RandomCoreProfile
@@ -23,24 +24,16 @@ class Core:
     }
     '''
 
-    __core_equivalency = {
-        # Demand Core + Actual Core
-        CPUType.GPU + CPUType.GPU: 1.0,
-        CPUType.GPU + CPUType.GENERAL: 0.1,
-        CPUType.GPU + CPUType.BATCH: 0.05,
-        CPUType.GENERAL + CPUType.GENERAL: 1.0,
-        CPUType.GENERAL + CPUType.GPU: 2.0,
-        CPUType.GENERAL + CPUType.BATCH: 0.25,
-        CPUType.BATCH + CPUType.BATCH: 1.0,
-        CPUType.BATCH + CPUType.GENERAL: 2.0,
-        CPUType.BATCH + CPUType.GPU: 4.0
-    }
+    # Demand Core (row) by Actual Core (column), both indexed by CPUType.ordinal
+    #                              GPU,  CPU,  BAT
+    __core_equivalency = np.array([[1.0, 0.1, 0.05],  # GPU
+                                   [2.0, 1.0, 0.25],  # CPU
+                                   [4.0, 2.0, 1.0]  # BAT
+                                   ])
 
-    __core_cost = {
-        CPUType.GPU: 1.0,
-        CPUType.GENERAL: 0.25,
-        CPUType.BATCH: 0.1
-    }
+    # Unit cost of each Core type, indexed by CPUType.ordinal
+    #                        GPU,  CPU,  BAT
+    __core_cost = np.array([1.0, 0.25, 0.1])
 
     def __init__(self,
                  core_profile: CoreProfile):
@@ -63,7 +56,7 @@ class Core:
 
     @property
     def core_cost(self) -> float:
-        return deepcopy(self.__core_cost[self._core_type])
+        return float(self.__core_cost[self._core_type.ordinal])
 
     @classmethod
     def core_compute_equivalency(cls,
@@ -75,10 +68,33 @@ class Core:
         :param given_core_type: The core type available from a Compute source
         :return: The factor to translate from required to given efficacy
         """
-        mapping = required_core_type + given_core_type
-        if mapping not in cls.__core_equivalency:
-            raise ValueError('Core equivalency for [' + mapping + '] does not exist')
-        return cls.__core_equivalency[mapping]
+        if not isinstance(required_core_type, CPUType) or not isinstance(given_core_type, CPUType):
+            raise ValueError('Core equivalency for [' + str(required_core_type) + str(given_core_type) +
+                             '] does not exist')
+        return float(cls.__core_equivalency[required_core_type.ordinal, given_core_type.ordinal])
+
+    @classmethod
+    def core_compute_equivalencies(cls,
+                                   required_core_types: np.ndarray,
+                                   given_core_types: np.ndarray) -> np.ndarray:
+        """
+        The compute equivalency for a batch of (required, given) core pairs in a single lookup.
+        :param required_core_types: Array of CPUType ordinals required by the Loads
+        :param given_core_types: Array of CPUType ordinals available from the Compute sources, broadcast against
+        required_core_types e.g. (tasks, 1) & (1, hosts) gives the (tasks, hosts) equivalency matrix.
+        :return: Array of factors to translate from required to given efficacy
+        """
+        return cls.__core_equivalency[required_core_types, given_core_types]
+
+    @classmethod
+    def core_costs(cls,
+                   core_types: np.ndarray) -> np.ndarray:
+        """
+        The unit cost for a batch of core types in a single lookup.
+        :param core_types: Array of CPUType ordinals
+        :return: Array of unit core costs
+        """
+        return cls.__core_cost[core_types]
 
 
 if __name__ == "__main__":
@@ -87,3 +103,6 @@ if __name__ == "__main__":
     print(c)
     eq = c.core_compute_equivalency(CPUType.GPU, CPUType.GENERAL)
     print(str(eq))
+    ords = np.array([ct.ordinal for ct in CPUType.cpu_types()])
+    print(Core.core_compute_equivalencies(ords[:, None], ords[None, :]))
+    print(Core.core_costs(ords))
@@ -9,6 +9,12 @@ class CPUType(Enum):
     GENERAL = 'CPU'
     BATCH = 'BAT'
 
+    def __init__(self,
+                 mnemonic: str):
+        # Members are created in declaration order, so the count of members already created is a stable
+        # integer ordinal in range 0 to len(CPUType) - 1 that can be used to index dense arrays.
+        self._ordinal = len(self.__class__.__members__)
+
     def __str__(self):
         return self.value
 
@@ -18,6 +24,24 @@ class CPUType(Enum):
         else:
             ValueError('Cannot add :' + self.__class__.__name__ + 'with :' + other.__class__.__name__)
 
+    @property
+    def ordinal(self) -> int:
+        """
+        The stable integer ordinal of the CPU Type
+        :return: Ordinal in range 0 to len(CPUType) - 1
+        """
+        return self._ordinal
+
+    @classmethod
+    def from_ordinal(cls,
+                     ordinal: int) -> 'CPUType':
+        """
+        The CPU Type with the given ordinal
+        :param ordinal: The ordinal as returned by CPUType.ordinal
+        :return: The matching CPU Type
+        """
+        return list(cls)[ordinal]
+
     @classmethod
     def cpu_types(cls) -> List['CPUType']:
         return deepcopy([cls.GPU,
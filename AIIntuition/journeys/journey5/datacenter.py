@@ -80,19 +80,22 @@ class DataCenter:
         self.__all_data_centers[country_code] = self
 
     @classmethod
-    def next_data_center_by_p_dist(cls) -> 'DataCenter':
+    def next_data_center_by_p_dist(cls,
+                                   rng: np.random.RandomState = None) -> 'DataCenter':
         """
         Pick an existing data center from the existing DC's according to the probability distribution. There
         will be a bias if not all data centers are created as we pick only from existing DC's
+        :param rng: Optional random state to draw from, if not given the global numpy random state is used.
         :return: An existing Data Center
         """
         if cls.__all_data_centers is None:
             return None
 
+        rnd = np.random if rng is None else rng
         dc_by_dist = None
         while dc_by_dist is None:
             dc_pick_by_dist = cls.__country_codes[
-                np.random.choice(np.arange(0, len(cls.__country_codes)), p=cls.__p_dist)]
+                rnd.choice(np.arange(0, len(cls.__country_codes)), p=cls.__p_dist)]
             cc = DataCenter.CountryCode(dc_pick_by_dist)
             if cc in cls.__all_data_centers:
                 dc_by_dist = cls.__all_data_centers[cc]
@@ -105,7 +108,7 @@ class DataCenter:
         :param sys_time: The global system time to reference local time from.
         :return: The local system time for the timezone of the data center.
         """
-        offset = self.__hour_of_day_offset[self.region]
+        offset = self.hour_offset
         hour_of_local_day = sys_time.hour_of_day + offset
         day_offset = 0
         if hour_of_local_day < 0:
@@ -116,6 +119,34 @@ class DataCenter:
             day_offset = -1
         return SystemTime(sys_time.day_of_year + day_offset, hour_of_local_day)
 
+    @classmethod
+    def local_hours(cls,
+                    gmt_hours: np.ndarray,
+                    hour_offsets: np.ndarray) -> np.ndarray:
+        """
+        The local hour of day for a batch of global hours & data center offsets, this is the vectorised equivalent
+        of local_system_time(..).hour_of_day
+        :param gmt_hours: The global hours of day
+        :param hour_offsets: The hour offsets of the data centers (see hour_offset) broadcast against gmt_hours
+        :return: The local hours of day
+        """
+        hour_of_local_day = np.asarray(gmt_hours) + np.asarray(hour_offsets)
+        hour_of_local_day = np.where(hour_of_local_day < 0, hour_of_local_day + 23, hour_of_local_day)
+        hour_of_local_day = np.where(hour_of_local_day > 23, hour_of_local_day - 23, hour_of_local_day)
+        return hour_of_local_day
+
+    @classmethod
+    def get_by_country_code(cls,
+                            country_code: 'DataCenter.CountryCode') -> 'DataCenter':
+        """
+        The existing data center in the given country
+        :param country_code: The country code of the data center
+        :return: The Data Center
+        """
+        if country_code not in cls.__all_data_centers:
+            raise ValueError(str(country_code) + ' : Data Center does not exist')
+        return cls.__all_data_centers[country_code]
+
     @classmethod
     def country_codes(cls) -> List['DataCenter.CountryCode']:
         """
@@ -152,6 +183,22 @@ class DataCenter:
         """
         return deepcopy((self.__countries[self._country_code])[self.__compute_cost_i])
 
+    @property
+    def hour_offset(self) -> int:
+        """
+        The offset in hours of the local time of the data center from global (GMT) time
+        :return: The hour offset
+        """
+        return deepcopy(self.__hour_of_day_offset[self.region])
+
+    @property
+    def host_probability(self) -> float:
+        """
+        The probability of a host being located in this data center
+        :return: Probability in range 0 to 1
+        """
+        return deepcopy((self.__countries[self._country_code])[self.__p_dist_i])
+
     @property
     def performance_tier(self):
         """
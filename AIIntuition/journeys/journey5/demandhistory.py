@@ -0,0 +1,152 @@
+import numpy as np
+from copy import copy
+
+"""
+Recent hourly resource demand of a task & a cheap forecast of the demand to come.
+"""
+
+
+class DemandHistory:
+    """
+    The last capacity hourly (compute, memory) demands of a task held in a pre allocated ring buffer, along with an
+    exponentially weighted moving average and the sum & count of the demand for each hour of the (local) day. Recording
+    a demand only updates these in place, the forecast peaks for the next 24 hours are worked out (over the 24 hours)
+    when next read and kept until the next demand is recorded.
+
+    The forecast for an hour of the day is the mean demand seen at that hour, or the moving average for hours not
+    yet seen.
+    """
+
+    COMPUTE = 0
+    MEMORY = 1
+
+    def __init__(self,
+                 capacity: int = 48,
+                 alpha: float = 0.3):
+        """
+        :param capacity: The number of most recent hourly demands to hold
+        :param alpha: The weight of the latest demand in the moving average, in range 0.0 to 1.0
+        """
+        if capacity <= 0:
+            raise ValueError('History capacity must be > 0, given: ' + str(capacity))
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError('Moving average weight must be in range 0.0 to 1.0, given: ' + str(alpha))
+        self._alpha = alpha
+        self._demand = np.zeros((capacity, 2))
+        self._count = 0
+        self._ewma = np.zeros(2)
+        self._hour_sum = np.zeros((24, 2))
+        self._hour_count = np.zeros(24, dtype=np.int64)
+        self._peak = None
+
+    def __len__(self) -> int:
+        return min(self._count, len(self._demand))
+
+    def __deepcopy__(self, memo):
+        """
+        Tasks are deep copied whenever they are handed out, so copy only the arrays rather than going through the
+        generic (and much slower) deepcopy of every member.
+        """
+        dh = copy(self)
+        for name, value in self.__dict__.items():
+            if isinstance(value, np.ndarray):
+                setattr(dh, name, value.copy())
+        memo[id(self)] = dh
+        return dh
+
+    @property
+    def count(self) -> int:
+        """
+        The total number of demands ever recorded
+        """
+        return self._count
+
+    def record(self,
+               local_hour_of_day: int,
+               compute_demand: float,
+               memory_demand: float) -> None:
+        """
+        Record the demand of the task for an hour
+        :param local_hour_of_day: The local hour of day of the demand 0 - 23
+        :param compute_demand: The compute demand
+        :param memory_demand: The memory demand
+        """
+        idx = self._count % len(self._demand)
+        self._demand[idx] = (compute_demand, memory_demand)
+        if self._count == 0:
+            self._ewma[:] = self._demand[idx]
+        else:
+            self._ewma += self._alpha * (self._demand[idx] - self._ewma)
+        self._hour_sum[local_hour_of_day] += self._demand[idx]
+        self._hour_count[local_hour_of_day] += 1
+        self._count += 1
+        self._peak = None
+        return
+
+    def recent(self,
+               num_hours: int = None) -> np.ndarray:
+        """
+        The most recent hourly demands
+        :param num_hours: The number of hours, if not given all held hours
+        :return: (hours, 2) copy of the compute & memory demands, oldest first.
+        """
+        held = len(self)
+        if num_hours is None or num_hours > held:
+            num_hours = held
+        idx = np.arange(self._count - num_hours, self._count) % len(self._demand)
+        return self._demand[idx]
+
+    @property
+    def ewma(self) -> np.ndarray:
+        """
+        The exponentially weighted moving average of the compute & memory demand
+        """
+        return self._ewma.copy()
+
+    def hourly_means(self) -> np.ndarray:
+        """
+        The mean compute & memory demand by local hour of day
+        :return: (24, 2) array, NaN for hours not yet seen
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self._hour_sum / self._hour_count[:, None]
+
+    def forecast(self) -> np.ndarray:
+        """
+        The forecast compute & memory demand for each local hour of the day
+        :return: (24, 2) array
+        """
+        seen = self._hour_count > 0
+        fc = np.tile(self._ewma, (24, 1))
+        fc[seen] = self._hour_sum[seen] / self._hour_count[seen, None]
+        return fc
+
+    @property
+    def forecast_peak_compute(self) -> float:
+        """
+        The forecast peak compute demand over the next 24 hours
+        """
+        return float(self.__forecast_peak()[self.COMPUTE])
+
+    @property
+    def forecast_peak_memory(self) -> float:
+        """
+        The forecast peak memory demand over the next 24 hours
+        """
+        return float(self.__forecast_peak()[self.MEMORY])
+
+    def __forecast_peak(self) -> np.ndarray:
+        """
+        The forecast peak compute & memory demand, worked out only if a demand has been recorded since last asked
+        """
+        if self._peak is None:
+            self._peak = np.max(self.forecast(), axis=0)
+        return self._peak
+
+
+if __name__ == "__main__":
+    dh = DemandHistory(capacity=6)
+    for hr in range(0, 30):
+        dh.record(hr % 24, 1 + (hr % 24) / 10, 10 + hr % 3)
+    print(dh.recent(3))
+    print(dh.ewma, dh.forecast_peak_compute, dh.forecast_peak_memory)
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from copy import deepcopy
 from typing import List, Tuple, Callable
+import numpy as np
 from AIIntuition.journeys.journey5.eventlabels import EventLabels
 from AIIntuition.journeys.journey5.compute import Compute
 from AIIntuition.journeys.journey5.task import Task
@@ -19,6 +20,7 @@ class Event(ABC):
         HOST = 1
         TASK = 2
         FAIL = 3
+        METRICS = 4
 
         def __str__(self):
             return self.value
@@ -26,6 +28,13 @@ class Event(ABC):
     _sep = GlobSym.separator()
     _empty_props = ([], [])
 
+    # Columns of the numeric feature row, see EventLabels.numeric_feature_labels()
+    _preamble_cols = slice(0, 4)
+    _task_cols = slice(4, 14)
+    _comp_cols = slice(14, 25)
+    _fail_col = 25
+    NUM_FEATURES = 26
+
     _seqm_event_type = SeqMap(seq_name='Event Type')
     _seqm_dc = SeqMap(seq_name='Data Centers')
     _seqm_comp = SeqMap(seq_name='Compute Id')
@@ -80,6 +89,15 @@ class Event(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def as_features(self,
+                    row: np.ndarray) -> None:
+        """
+        Write the event as numeric features into the given row, features that do not apply to the event are NaN.
+        :param row: The (Event.NUM_FEATURES,) row to write the features into in place.
+        """
+        raise NotImplementedError
+
     @classmethod
     @abstractmethod
     def dump_features(cls) -> None:
@@ -162,6 +180,96 @@ class Event(ABC):
 
         return labels, props
 
+    @classmethod
+    def metrics_properties(cls,
+                           group_seq_map: SeqMap,
+                           group: object,
+                           metrics: List[float],
+                           as_feature: bool = False) -> Tuple[List, List]:
+        """
+        Extract all relevant properties from the given group metrics for event reporting
+        :param group_seq_map: The sequence map to convert the group to a feature (only used if as_feature = True)
+        :param group: The group the metrics are aggregated over e.g. Data Center or Core Type
+        :param metrics: Num Hosts, Curr Mem, Max Mem, Curr Compute, Max Compute, Executions, Cost, Deficit, Failures,
+        Done and Migrations as given by FleetMetrics.
+        :param as_feature: return the properties in feature vector form - One Hot, Normalised etc
+        :return: List of metrics property labels, List of corresponding metrics property values as string
+        """
+        labels = EventLabels.metrics_labels(as_feature)
+        num_hosts, curr_mem, max_mem, curr_comp, max_comp, executions, cost, deficit, failures, done, migrations = \
+            metrics
+
+        props = [cls._render(str, group_seq_map, group, as_feature),
+                 cls._render(str, str, int(num_hosts), as_feature),
+                 cls._render(str, str, Util.to_pct(curr_mem, max(float(1), max_mem)), as_feature),
+                 cls._render(str, str, Util.to_pct(curr_comp, max(float(1), max_comp)), as_feature),
+                 cls._render(str, str, int(executions), as_feature),
+                 cls._render(cls._flt, cls._flt, cost, as_feature),
+                 cls._render(cls._flt, cls._flt, deficit, as_feature),
+                 cls._render(str, str, int(failures), as_feature),
+                 cls._render(str, str, int(done), as_feature),
+                 cls._render(str, str, int(migrations), as_feature)]
+
+        return labels, props
+
+    @classmethod
+    def features_into(cls,
+                      row: np.ndarray,
+                      event: 'Event',
+                      event_sub_type_idx: int,
+                      sys_time: SystemTime,
+                      task: Task = None,
+                      comp: Compute = None,
+                      exception: JException = None) -> None:
+        """
+        Write the numeric features of an event into the given row, the numeric equivalent of task_and_comp_to_str
+        with as_feature = True that uses the same sequence maps but no string formatting.
+        :param row: The (Event.NUM_FEATURES,) row to write the features into in place.
+        :param event: The event to write the features of
+        :param event_sub_type_idx: The sequence index of the event sub type
+        :param sys_time: The system time of the event
+        :param task: The task subject of the event (if any)
+        :param comp: The compute subject of the event (if any)
+        :param exception: The exception subject of the event (if any)
+        """
+        row[:] = np.nan
+        row[cls._preamble_cols] = (cls._seqm_event_type.value_as_seq_idx(event.__class__.__name__),
+                                   event_sub_type_idx,
+                                   sys_time.day_of_year,
+                                   sys_time.hour_of_day)
+        if task is not None:
+            if comp is None:
+                comp_max_mem = Compute.compute_linked_to_task(task)
+                comp_max_mem = max(float(1), task.current_mem) if comp_max_mem is None else comp_max_mem.max_memory
+            else:
+                comp_max_mem = comp.max_memory
+            row[cls._task_cols] = (cls._seqm_task.value_as_seq_idx(task.id),
+                                   cls._seqm_taskt.value_as_seq_idx(task.task_type),
+                                   cls._seqm_coret.value_as_seq_idx(task.core_type),
+                                   task.load_factor,
+                                   100.0 * task.current_mem / comp_max_mem,
+                                   task.run_time,
+                                   task.compute_deficit,
+                                   task.cost,
+                                   task.curr_run_time,
+                                   cls._seqm_taskd.value_as_seq_idx(task.done))
+        if comp is not None:
+            lt = comp.local_time(global_sys_time=sys_time)
+            row[cls._comp_cols] = (cls._seqm_dc.value_as_seq_idx(comp.data_center),
+                                   cls._seqm_comp.value_as_seq_idx(comp.id),
+                                   cls._seqm_coret.value_as_seq_idx(comp.type),
+                                   cls._seqm_ncore.value_as_seq_idx(comp.core_count),
+                                   cls._seqm_memc.value_as_seq_idx(comp.max_memory),
+                                   100.0 * comp.current_memory / comp.max_memory,
+                                   cls._seqm_compm.value_as_seq_idx(comp.max_compute),
+                                   100.0 * comp.current_compute / comp.max_compute,
+                                   comp.num_associated_task,
+                                   lt.day_of_year,
+                                   lt.hour_of_day)
+        if exception is not None:
+            row[cls._fail_col] = cls._seqm_failt.value_as_seq_idx(exception.__class__.__name__)
+        return
+
     @classmethod
     def _render(cls,
                 render_func_norm: Callable,
@@ -295,6 +403,16 @@ class FailureEvent(Event):
         return Event.task_and_comp_to_str(self._sys_time, preamble, self._task, self._compute, self._exception,
                                           as_feature)
 
+    def as_features(self,
+                    row: np.ndarray) -> None:
+        """
+        Write the event as numeric features into the given row
+        :param row: The (Event.NUM_FEATURES,) row to write the features into in place.
+        """
+        Event.features_into(row, self, self._seqm_failt.value_as_seq_idx(self._exception_class), self._sys_time,
+                            self._task, self._compute, self._exception)
+        return
+
     @classmethod
     def dump_features(cls) -> None:
         """
@@ -335,6 +453,17 @@ class SchedulerEvent(Event):
                                   as_feature)
         return Event.task_and_comp_to_str(self._sys_time, preamble, as_feature=as_feature)
 
+    def as_features(self,
+                    row: np.ndarray) -> None:
+        """
+        Write the event as numeric features into the given row
+        :param row: The (Event.NUM_FEATURES,) row to write the features into in place.
+        """
+        Event.features_into(row, self,
+                            self._seqm_schedule_event_type.value_as_seq_idx(str(self._scheduler_event_type.value)),
+                            self._sys_time)
+        return
+
     @classmethod
     def dump_features(cls) -> None:
         """
@@ -355,6 +484,8 @@ class HostEvent(Event):
         ASSOCIATE = 'Associate'
         DISASSOCIATE = 'Disassociate'
         STATUS = 'Status'
+        MIGRATE = 'Migrate'
+        RETIRE = 'Retire'
 
         def __str(self) -> str:
             return self.value
@@ -386,6 +517,16 @@ class HostEvent(Event):
         return Event.task_and_comp_to_str(self._sys_time, preamble, self._task, self._compute, self._exception,
                                           as_feature)
 
+    def as_features(self,
+                    row: np.ndarray) -> None:
+        """
+        Write the event as numeric features into the given row
+        :param row: The (Event.NUM_FEATURES,) row to write the features into in place.
+        """
+        Event.features_into(row, self, self._seqm_host_event_type.value_as_seq_idx(str(self._host_event_type)),
+                            self._sys_time, self._task, self._compute, self._exception)
+        return
+
     @classmethod
     def dump_features(cls) -> None:
         """
@@ -429,6 +570,16 @@ class TaskEvent(Event):
         return Event.task_and_comp_to_str(self._sys_time, preamble, self._task, self._compute, self._exception,
                                           as_feature)
 
+    def as_features(self,
+                    row: np.ndarray) -> None:
+        """
+        Write the event as numeric features into the given row
+        :param row: The (Event.NUM_FEATURES,) row to write the features into in place.
+        """
+        Event.features_into(row, self, self._seqm_task_event_type.value_as_seq_idx(str(self._task_event_type)),
+                            self._sys_time, self._task, self._compute, self._exception)
+        return
+
     @classmethod
     def dump_features(cls) -> None:
         """
@@ -436,3 +587,62 @@ class TaskEvent(Event):
         """
         print(cls._seqm_task_event_type)
         return
+
+
+class MetricsEvent(Event):
+    _seqm_metrics_event_type = SeqMap(seq_name='Metrics Event Type')
+
+    @unique
+    class MetricsEventType(Enum):
+        DATA_CENTER = 'Data Center'
+        CORE_TYPE = 'Core Type'
+
+        def __str__(self) -> str:
+            return self.value
+
+    def __init__(self,
+                 sys_time: SystemTime,
+                 metrics_event_type: MetricsEventType,
+                 group: object,
+                 metrics: List[float]):
+        self._metrics_event_type = metrics_event_type
+        self._group = group
+        self._metrics = metrics
+        self._sys_time = sys_time
+
+    @property
+    def id(self) -> Event.EventType:
+        return Event.EventType.METRICS
+
+    def as_str(self,
+               as_feature: bool = False) -> str:
+        """
+        The event rendered as either a regular string or as a string a features that are more applicable
+        for use in AL/ML context.
+        :return: Event as string
+        """
+        preamble = Event.preamble(self, str(self._metrics_event_type), self._seqm_metrics_event_type, as_feature)
+        if self._metrics_event_type == MetricsEvent.MetricsEventType.DATA_CENTER:
+            group_seq_map = self._seqm_dc
+        else:
+            group_seq_map = self._seqm_coret
+        metrics_props = Event.metrics_properties(group_seq_map, self._group, self._metrics, as_feature)
+        return ''.join(Event.zip_and_separate(as_feature, preamble, metrics_props))
+
+    def as_features(self,
+                    row: np.ndarray) -> None:
+        """
+        Write the event as numeric features into the given row, only the preamble applies to metrics events.
+        :param row: The (Event.NUM_FEATURES,) row to write the features into in place.
+        """
+        Event.features_into(row, self, self._seqm_metrics_event_type.value_as_seq_idx(str(self._metrics_event_type)),
+                            self._sys_time)
+        return
+
+    @classmethod
+    def dump_features(cls) -> None:
+        """
+        Print to stdout the current state of all SeqMaps
+        """
+        print(cls._seqm_metrics_event_type)
+        return
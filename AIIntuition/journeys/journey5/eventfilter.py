@@ -0,0 +1,140 @@
+from enum import Enum, unique
+from random import Random
+from typing import Callable, Type
+from AIIntuition.journeys.journey5.event import Event, HostEvent, FailureEvent
+
+"""
+Decide if an event should be logged - before the (potentially expensive) event is built.
+"""
+
+
+class EventFilter:
+    """
+    Filter and sample events by Event sub class and event sub type. Each (class, sub type) can be given a level, a
+    sampling rate and a predicate, an event is only accepted if its level is at or above the current threshold, the
+    predicate (if any) holds for the event subjects and it survives sampling.
+
+    The check is made by the code raising the event before the event is built, so rejected events cost only the
+    check:
+
+        if EventFilter.accept(HostEvent, HostEvent.HostEventType.EXECUTE, host, task):
+            Log.log_event(sys_time, HostEvent(sys_time, HostEvent.HostEventType.EXECUTE, host, task))
+
+    The sub type of a FailureEvent is the class of the exception that caused the failure. By default all events
+    are accepted.
+    """
+
+    @unique
+    class Level(Enum):
+        DEBUG = 0
+        INFO = 1
+        WARNING = 2
+
+    class Rule:
+        """
+        How to filter a given (Event class, event sub type)
+        """
+
+        def __init__(self,
+                     level: 'EventFilter.Level',
+                     rate: float = 1.0,
+                     predicate: Callable[..., bool] = None):
+            """
+            :param level: The level of the event
+            :param rate: The fraction of events to keep in range 0.0 to 1.0
+            :param predicate: Optional callable, given the event subjects (e.g. compute, task) returns True if the
+            event should be kept.
+            """
+            if not 0.0 <= rate <= 1.0:
+                raise ValueError('Sample rate must be in range 0.0 to 1.0, given: ' + str(rate))
+            self.level = level
+            self.rate = rate
+            self.predicate = predicate
+
+    __seed = 42
+
+    # Default levels, where no rule is configured
+    __default_levels = {
+        (HostEvent, HostEvent.HostEventType.EXECUTE): Level.DEBUG,
+        (FailureEvent, None): Level.WARNING
+    }
+
+    __threshold = Level.DEBUG
+    __rules = {}
+    __rnd = Random(__seed)  # Own random stream so that sampling does not change the simulation
+
+    @classmethod
+    def configure(cls,
+                  event_class: Type[Event],
+                  event_sub_type: object = None,
+                  rate: float = 1.0,
+                  level: 'EventFilter.Level' = None,
+                  predicate: Callable[..., bool] = None) -> None:
+        """
+        Set the filter rule for the given Event class and (optional) event sub type. A rule for a sub type takes
+        precedence over the rule for the Event class as a whole.
+        :param event_class: The Event sub class e.g. HostEvent
+        :param event_sub_type: The event sub type e.g. HostEvent.HostEventType.EXECUTE or None for all sub types
+        :param rate: The fraction of events to keep in range 0.0 to 1.0
+        :param level: The level of the event, if not given the default level for the event is used
+        :param predicate: Optional callable, given the event subjects returns True if the event should be kept
+        """
+        if level is None:
+            level = cls.__default_level(event_class, event_sub_type)
+        cls.__rules[(event_class, event_sub_type)] = EventFilter.Rule(level, rate, predicate)
+        return
+
+    @classmethod
+    def set_threshold(cls,
+                      level: 'EventFilter.Level') -> None:
+        """
+        Only accept events at or above the given level e.g. Level.WARNING to keep only FailureEvents
+        :param level: The minimum level of event to accept
+        """
+        cls.__threshold = level
+        return
+
+    @classmethod
+    def reset(cls) -> None:
+        """
+        Remove all rules and accept all events.
+        """
+        cls.__rules = {}
+        cls.__threshold = cls.Level.DEBUG
+        cls.__rnd = Random(cls.__seed)
+        return
+
+    @classmethod
+    def accept(cls,
+               event_class: Type[Event],
+               event_sub_type: object = None,
+               *argv) -> bool:
+        """
+        Should an event of the given class & sub type be built and logged
+        :param event_class: The Event sub class e.g. HostEvent
+        :param event_sub_type: The event sub type e.g. HostEvent.HostEventType.EXECUTE
+        :param argv: The subjects of the event (e.g. compute, task) passed to the rule predicate, if any
+        :return: True if the event should be logged
+        """
+        rule = cls.__rules.get((event_class, event_sub_type), None)
+        if rule is None:
+            rule = cls.__rules.get((event_class, None), None)
+        if rule is None:
+            return cls.__default_level(event_class, event_sub_type).value >= cls.__threshold.value
+
+        if rule.level.value < cls.__threshold.value:
+            return False
+        if rule.predicate is not None and not rule.predicate(*argv):
+            return False
+        if rule.rate < 1.0 and cls.__rnd.random() >= rule.rate:
+            return False
+        return True
+
+    @classmethod
+    def __default_level(cls,
+                        event_class: Type[Event],
+                        event_sub_type: object) -> 'EventFilter.Level':
+        level = cls.__default_levels.get((event_class, event_sub_type), None)
+        if level is None:
+            level = cls.__default_levels.get((event_class, None), cls.Level.INFO)
+        return level
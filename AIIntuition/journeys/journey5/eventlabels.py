@@ -66,3 +66,62 @@ class EventLabels:
         else:
             labels = ['Error: ']
         return labels
+
+    @classmethod
+    def metrics_labels(cls,
+                       as_feature_labels: bool = False) -> List[str]:
+        if as_feature_labels:
+            labels = ['',
+                      '',
+                      '',
+                      '',
+                      '',
+                      '',
+                      '',
+                      '',
+                      '',
+                      '']
+        else:
+            labels = ['Group: ',
+                      'Num Hosts: ',
+                      'Mem Util %: ',
+                      'Comp Util %: ',
+                      'Executions: ',
+                      'Cost: ',
+                      'Deficit: ',
+                      'Failures: ',
+                      'Done: ',
+                      'Migrations: ']
+        return labels
+
+    @classmethod
+    def numeric_feature_labels(cls) -> List[str]:
+        """
+        The names of the columns of the numeric feature row written by Event.as_features()
+        """
+        return ['Event Type',
+                'Event Sub Type',
+                'Sys Day',
+                'Sys Hour',
+                'Task',
+                'Profile',
+                'Pref Core',
+                'Load Factor',
+                'Curr Mem %',
+                'Run Time',
+                'Deficit',
+                'Cost',
+                'Time Left',
+                'Done',
+                'DC',
+                'Host',
+                'Type',
+                'Cores',
+                'Mem',
+                'Mem Util %',
+                'Comp',
+                'Comp Util %',
+                'Num Tasks',
+                'Local Day',
+                'Local Hour',
+                'Error']
@@ -0,0 +1,182 @@
+import numpy as np
+
+"""
+Fixed size, pre allocated buffer of numeric feature rows.
+"""
+
+
+class FeatureRingBuffer:
+    """
+    A pre allocated (capacity, width) float32 array that rows are written into in place, once full the oldest rows
+    are over written. The producer fills the row returned by next_row() and then publishes it with commit(), a
+    consumer sharing the buffer reads recent rows with recent() or rows_since() - there is no string formatting or
+    parsing in either direction.
+
+    If a file name is given the rows are held in a memory mapped file so they can be shared with a consumer in
+    another process, which maps the same file with FeatureRingBuffer.attach(file_name). The file starts with a
+    header of the capacity, width & count of rows committed; the count is only updated after a row is written so a
+    consumer never reads a partly written row. A consumer discards any rows the producer over wrote while they were
+    being read, including the oldest row held which the producer may be over writing, so a consumer sees at most
+    capacity - 1 rows.
+    """
+
+    __header_capacity = 0
+    __header_width = 1
+    __header_count = 2
+    __header_bytes = 64  # capacity, width & count as int64, padded so the rows start aligned
+
+    def __init__(self,
+                 capacity: int,
+                 width: int,
+                 file_name: str = None):
+        """
+        :param capacity: The maximum number of rows held
+        :param width: The number of features per row
+        :param file_name: Optional file to memory map the rows to, any existing file is over written
+        """
+        if capacity <= 0 or width <= 0:
+            raise ValueError('Buffer capacity & width must be > 0, given: ' + str(capacity) + ', ' + str(width))
+        self._capacity = capacity
+        self._writable = True
+        self._count = 0
+        if file_name is None:
+            self._header = None
+            self._rows = np.zeros((capacity, width), dtype=np.float32)
+        else:
+            self._rows = np.memmap(file_name, dtype=np.float32, mode='w+', offset=self.__header_bytes,
+                                   shape=(capacity, width))
+            self._header = np.memmap(file_name, dtype=np.int64, mode='r+', shape=(3,))
+            self._header[self.__header_capacity] = capacity
+            self._header[self.__header_width] = width
+            self._header[self.__header_count] = 0
+        return
+
+    @classmethod
+    def attach(cls,
+               file_name: str) -> 'FeatureRingBuffer':
+        """
+        A read only view of a buffer a producer (in this or another process) is writing to the given file
+        :param file_name: The file given to the producer buffer
+        :return: Buffer that reads the rows committed by the producer
+        """
+        header = np.memmap(file_name, dtype=np.int64, mode='r', shape=(3,))
+        capacity = int(header[cls.__header_capacity])
+        width = int(header[cls.__header_width])
+        if capacity <= 0 or width <= 0:
+            raise ValueError('Not a feature ring buffer file: ' + file_name)
+        frb = cls.__new__(cls)
+        frb._capacity = capacity
+        frb._writable = False
+        frb._count = 0
+        frb._header = header
+        frb._rows = np.memmap(file_name, dtype=np.float32, mode='r', offset=cls.__header_bytes,
+                              shape=(capacity, width))
+        return frb
+
+    @property
+    def capacity(self) -> int:
+        """
+        The maximum number of rows held
+        """
+        return self._capacity
+
+    @property
+    def width(self) -> int:
+        """
+        The number of features per row
+        """
+        return self._rows.shape[1]
+
+    @property
+    def count(self) -> int:
+        """
+        The total number of rows ever committed, the rows held are the last min(count, capacity) of them.
+        """
+        if self._header is not None:
+            return int(self._header[self.__header_count])
+        return self._count
+
+    def __len__(self) -> int:
+        return min(self.count, self._capacity)
+
+    def next_row(self) -> np.ndarray:
+        """
+        The next row to write, the row is a view on the buffer so features are written in place. The row is not
+        visible to consumers until commit() is called.
+        :return: Writable (width,) view of the next row.
+        """
+        if not self._writable:
+            raise RuntimeError('Feature ring buffer is read only')
+        return self._rows[self._count % self._capacity]
+
+    def commit(self) -> None:
+        """
+        Publish the row returned by next_row() once it has been written.
+        """
+        if not self._writable:
+            raise RuntimeError('Feature ring buffer is read only')
+        self._count += 1
+        if self._header is not None:
+            self._header[self.__header_count] = self._count
+        return
+
+    def append(self,
+               row: np.ndarray) -> None:
+        """
+        Copy the given features into the next row and commit it
+        :param row: The (width,) features
+        """
+        self.next_row()[:] = row
+        self.commit()
+        return
+
+    def recent(self,
+               num_rows: int = None) -> np.ndarray:
+        """
+        The most recent rows in the order they were written
+        :param num_rows: The number of rows, if not given all held rows
+        :return: (num_rows, width) copy of the rows, oldest first.
+        """
+        count = self.count
+        held = min(count, self._capacity)
+        if num_rows is None or num_rows > held:
+            num_rows = held
+        return self.rows_since(count - num_rows)
+
+    def rows_since(self,
+                   count: int) -> np.ndarray:
+        """
+        The rows committed since the buffer count was at the given value, a consumer keeps the count of the last
+        read & polls for the new rows. Rows that have already been over written, or were over written while being
+        read, are skipped.
+        :param count: The buffer count as at the last read
+        :return: (rows, width) copy of the rows, oldest first.
+        """
+        end = self.count
+        start = max(count, end - self._capacity, 0)
+        rows = self._rows[np.arange(start, end) % self._capacity]
+        if not self._writable:
+            # The producer may have moved on while the rows were copied, the row it is writing now over writes
+            # row (count - capacity) so only rows after that are known good.
+            first_good = self.count - self._capacity + 1
+            if first_good > start:
+                rows = rows[min(first_good - start, len(rows)):]
+        return rows
+
+    def flush(self) -> None:
+        """
+        Flush the rows to the memory mapped file, if any.
+        """
+        if isinstance(self._rows, np.memmap) and self._writable:
+            self._rows.flush()
+            self._header.flush()
+        return
+
+
+if __name__ == "__main__":
+    frb = FeatureRingBuffer(capacity=4, width=3)
+    for i in range(0, 6):
+        frb.next_row()[:] = [i, i * 10, i * 100]
+        frb.commit()
+    print(frb.recent())
+    print(frb.rows_since(4))
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+from typing import Dict, List
+import numpy as np
+
+"""
+Disk cache of generated fleet & workload definitions.
+"""
+
+
+class FleetCache:
+    """
+    Generated fleet & workload definitions (the columns of the host & task profile batches and the data center picks)
+    held as compressed .npz files in a cache directory. Entries are keyed by a hash of the random
+    seed, the generation parameters and the source code of the modules that do the generating, so a change to any of
+    them is a miss rather than a stale hit.
+
+    Once the cache holds more than max_entries, the least recently used entries (by file modification time, which is
+    refreshed on every hit) are removed.
+    """
+
+    __file_ext = '.npz'
+
+    def __init__(self,
+                 cache_dir: str = '.fleet_cache',
+                 max_entries: int = 16):
+        """
+        :param cache_dir: The directory to hold the cache entries, created if it does not exist
+        :param max_entries: The maximum number of entries to keep
+        """
+        if max_entries <= 0:
+            raise ValueError('Max cache entries must be > 0, given: ' + str(max_entries))
+        self._cache_dir = cache_dir
+        self._max_entries = max_entries
+        self._hits = 0
+        self._misses = 0
+        os.makedirs(self._cache_dir, exist_ok=True)
+
+    @property
+    def hits(self) -> int:
+        """
+        The number of loads that found an entry
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        The number of loads that found no entry
+        """
+        return self._misses
+
+    @classmethod
+    def key(cls,
+            seed: int,
+            params: Dict[str, object],
+            source_files: List[str]) -> str:
+        """
+        The cache key of a generated fleet
+        :param seed: The seed of the random state the fleet was generated from
+        :param params: The generation parameters e.g. number of hosts & tasks, must be JSON serialisable
+        :param source_files: The source files of the code that generates the fleet, the code version
+        :return: The key as a hex string
+        """
+        sha = hashlib.sha1()
+        sha.update(json.dumps({'seed': seed, 'params': params}, sort_keys=True, default=str).encode('utf-8'))
+        for source_file in source_files:
+            with open(source_file, 'rb') as sf:
+                sha.update(sf.read())
+        return sha.hexdigest()
+
+    def load(self,
+             key: str) -> Dict[str, np.ndarray]:
+        """
+        The cached arrays for the given key
+        :param key: The cache key as given by key()
+        :return: The arrays keyed by name or None if there is no entry for the key
+        """
+        file_name = self.__file_name(key)
+        if not os.path.exists(file_name):
+            self._misses += 1
+            return None
+        with np.load(file_name) as entry:
+            arrays = {k: entry[k] for k in entry.files}
+        os.utime(file_name)
+        self._hits += 1
+        return arrays
+
+    def store(self,
+              key: str,
+              arrays: Dict[str, np.ndarray]) -> None:
+        """
+        Add (or replace) the entry for the given key and evict the least recently used entries over the limit
+        :param key: The cache key as given by key()
+        :param arrays: The arrays to cache keyed by name
+        """
+        file_name = self.__file_name(key)
+        tmp_name = file_name + '.tmp'
+        with open(tmp_name, 'wb') as fh:
+            np.savez_compressed(fh, **arrays)
+        os.replace(tmp_name, file_name)
+        self.__evict()
+        return
+
+    def clear(self) -> None:
+        """
+        Remove all cache entries.
+        """
+        for file_name in self.__entries():
+            os.remove(file_name)
+        return
+
+    def __file_name(self,
+                    key: str) -> str:
+        return os.path.join(self._cache_dir, key + self.__file_ext)
+
+    def __entries(self) -> List[str]:
+        return [os.path.join(self._cache_dir, f) for f in os.listdir(self._cache_dir) if f.endswith(self.__file_ext)]
+
+    def __evict(self) -> None:
+        """
+        Remove the least recently used entries until no more than max_entries remain.
+        """
+        entries = sorted(self.__entries(), key=os.path.getmtime)
+        for file_name in entries[:max(0, len(entries) - self._max_entries)]:
+            os.remove(file_name)
+        return
+
+
+if __name__ == "__main__":
+    fc = FleetCache(max_entries=2)
+    for s in [1, 2, 1, 3]:
+        k = FleetCache.key(s, {'num_hosts': 10}, [__file__])
+        if fc.load(k) is None:
+            fc.store(k, {'x': np.random.RandomState(s).uniform(size=10)})
+    print('hits: ' + str(fc.hits) + ' misses: ' + str(fc.misses))
+    fc.clear()
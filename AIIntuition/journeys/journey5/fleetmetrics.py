@@ -0,0 +1,248 @@
+from enum import Enum, unique
+from typing import Dict, Tuple
+import numpy as np
+from AIIntuition.journeys.journey5.compute import Compute
+from AIIntuition.journeys.journey5.task import Task
+from AIIntuition.journeys.journey5.cputype import CPUType
+from AIIntuition.journeys.journey5.log import Log
+from AIIntuition.journeys.journey5.event import MetricsEvent
+from AIIntuition.journeys.journey5.eventfilter import EventFilter
+from AIIntuition.journeys.journey5.systemtime import SystemTime
+
+"""
+Running fleet wide metrics, maintained incrementally as tasks execute.
+"""
+
+
+class FleetMetrics:
+    """
+    Running utilisation, cost, deficit & failure counters by Host, Data Center & CPU Type. The counters are updated
+    as the Hosts execute their tasks so that the daily summary costs O(groups) rather than O(hosts + tasks).
+
+    Utilisation counters (memory & compute) are levels that track the current state, the activity counters
+    (executions, cost, deficit, failures, done & migrations) accumulate for the life of a Host and since the last publish for
+    the Data Center & CPU Type groups.
+    """
+
+    @unique
+    class Counter(Enum):
+        NUM_HOSTS = 0
+        CURR_MEM = 1
+        MAX_MEM = 2
+        CURR_COMP = 3
+        MAX_COMP = 4
+        EXECUTIONS = 5
+        COST = 6
+        DEFICIT = 7
+        FAILURES = 8
+        DONE = 9
+        MIGRATIONS = 10
+
+    __num_counters = len(Counter)
+    __activity = slice(Counter.EXECUTIONS.value, __num_counters)
+
+    __by_host = {}  # Host Id : [Data Center, CPU Type, Counters]
+    __by_dc = {}
+    __by_core = {}
+
+    @classmethod
+    def register_host(cls,
+                      compute: Compute) -> None:
+        """
+        Start tracking the given host and add its capacity to its Data Center & CPU Type groups.
+        :param compute: The compute (Host) to track
+        """
+        if compute.id in cls.__by_host:
+            return
+        counters = np.zeros(cls.__num_counters)
+        counters[cls.Counter.NUM_HOSTS.value] = 1
+        counters[cls.Counter.MAX_MEM.value] = compute.max_memory
+        counters[cls.Counter.MAX_COMP.value] = compute.max_compute
+        dc = compute.data_center
+        core_type = compute.type
+        cls.__by_host[compute.id] = [dc, core_type, counters]
+        cls.__group(cls.__by_dc, dc)[:cls.Counter.EXECUTIONS.value] += counters[:cls.Counter.EXECUTIONS.value]
+        cls.__group(cls.__by_core, core_type)[:cls.Counter.EXECUTIONS.value] += \
+            counters[:cls.Counter.EXECUTIONS.value]
+        return
+
+    @classmethod
+    def deregister_host(cls,
+                        compute: Compute) -> None:
+        """
+        Stop tracking the given host and remove its capacity & current utilisation from its Data Center & CPU Type
+        groups, the activity of the host up to now stays in the group counters.
+        :param compute: The compute (Host) to stop tracking
+        """
+        if compute.id not in cls.__by_host:
+            raise ValueError('Compute id:' + compute.id + ' is not tracked by ' + cls.__name__)
+        cls.__apply(compute, cls.__sync_utilisation(compute))
+        dc, core_type, counters = cls.__by_host.pop(compute.id)
+        cls.__by_dc[dc][:cls.Counter.EXECUTIONS.value] -= counters[:cls.Counter.EXECUTIONS.value]
+        cls.__by_core[core_type][:cls.Counter.EXECUTIONS.value] -= counters[:cls.Counter.EXECUTIONS.value]
+        return
+
+    @classmethod
+    def record_execute(cls,
+                       compute: Compute,
+                       task: Task,
+                       cost: float) -> None:
+        """
+        Record the execution of a task on a compute (Host)
+        :param compute: The compute (Host) the task executed on
+        :param task: The task that was executed
+        :param cost: The cost booked to the task for the execution
+        """
+        delta = cls.__sync_utilisation(compute)
+        delta[cls.Counter.EXECUTIONS.value] = 1
+        delta[cls.Counter.COST.value] = cost
+        delta[cls.Counter.DEFICIT.value] = task.compute_deficit
+        cls.__apply(compute, delta)
+        return
+
+    @classmethod
+    def record_done(cls,
+                    compute: Compute,
+                    task: Task) -> None:
+        """
+        Record the successful completion of a task on a compute (Host)
+        :param compute: The compute (Host) the task completed on
+        :param task: The task that completed
+        """
+        delta = cls.__sync_utilisation(compute)
+        delta[cls.Counter.DONE.value] = 1
+        cls.__apply(compute, delta)
+        return
+
+    @classmethod
+    def record_failure(cls,
+                       compute: Compute,
+                       task: Task) -> None:
+        """
+        Record the failure of a task on a compute (Host)
+        :param compute: The compute (Host) the task failed on
+        :param task: The task that failed
+        """
+        delta = cls.__sync_utilisation(compute)
+        delta[cls.Counter.FAILURES.value] = 1
+        cls.__apply(compute, delta)
+        return
+
+    @classmethod
+    def record_migration(cls,
+                         source: Compute,
+                         target: Compute,
+                         task: Task,
+                         cost: float) -> None:
+        """
+        Record the migration of a task between computes (Hosts), the migration is counted against the source & the
+        migration cost against the target.
+        :param source: The compute (Host) the task migrated from
+        :param target: The compute (Host) the task migrated to
+        :param task: The task that migrated
+        :param cost: The cost booked to the task for the migration
+        """
+        delta = cls.__sync_utilisation(source)
+        delta[cls.Counter.MIGRATIONS.value] = 1
+        cls.__apply(source, delta)
+        delta = cls.__sync_utilisation(target)
+        delta[cls.Counter.COST.value] = cost
+        cls.__apply(target, delta)
+        return
+
+    @classmethod
+    def host_metrics(cls,
+                     compute_id: str) -> np.ndarray:
+        """
+        The current (life to date) counters of the given host
+        :param compute_id: The id of the compute (Host)
+        :return: Copy of the counters indexed by FleetMetrics.Counter.value
+        """
+        if compute_id not in cls.__by_host:
+            raise ValueError('Compute id:' + compute_id + ' is not tracked by ' + cls.__name__)
+        return cls.__by_host[compute_id][2].copy()
+
+    @classmethod
+    def data_center_metrics(cls) -> Dict[str, np.ndarray]:
+        """
+        The current counters of all Data Centers (activity counters are since the last publish)
+        :return: Dictionary of copies of the counters indexed by FleetMetrics.Counter.value keyed by Data Center
+        """
+        return {k: v.copy() for k, v in cls.__by_dc.items()}
+
+    @classmethod
+    def core_type_metrics(cls) -> Dict[CPUType, np.ndarray]:
+        """
+        The current counters of all CPU Types (activity counters are since the last publish)
+        :return: Dictionary of copies of the counters indexed by FleetMetrics.Counter.value keyed by CPU Type
+        """
+        return {k: v.copy() for k, v in cls.__by_core.items()}
+
+    @classmethod
+    def utilisation(cls,
+                    counters: np.ndarray) -> Tuple[float, float]:
+        """
+        The memory and compute utilisation given a set of counters
+        :param counters: Counters as returned by host_metrics, data_center_metrics or core_type_metrics
+        :return: Memory utilisation, Compute utilisation both in range 0.0 to 1.0 (or above if over committed)
+        """
+        mem_util = counters[cls.Counter.CURR_MEM.value] / max(float(1), counters[cls.Counter.MAX_MEM.value])
+        comp_util = counters[cls.Counter.CURR_COMP.value] / max(float(1), counters[cls.Counter.MAX_COMP.value])
+        return mem_util, comp_util
+
+    @classmethod
+    def publish(cls,
+                sys_time: SystemTime) -> None:
+        """
+        Log a compact summary event for each Data Center & CPU Type and then reset the group activity counters
+        ready for the next period.
+        :param sys_time: The current system time.
+        """
+        if EventFilter.accept(MetricsEvent, MetricsEvent.MetricsEventType.DATA_CENTER):
+            for dc in sorted(cls.__by_dc.keys()):
+                Log.log_event(sys_time, MetricsEvent(sys_time,
+                                                     MetricsEvent.MetricsEventType.DATA_CENTER,
+                                                     dc,
+                                                     cls.__by_dc[dc].tolist()))
+        if EventFilter.accept(MetricsEvent, MetricsEvent.MetricsEventType.CORE_TYPE):
+            for core_type in sorted(cls.__by_core.keys(), key=lambda x: x.ordinal):
+                Log.log_event(sys_time, MetricsEvent(sys_time,
+                                                     MetricsEvent.MetricsEventType.CORE_TYPE,
+                                                     core_type,
+                                                     cls.__by_core[core_type].tolist()))
+        for group in list(cls.__by_dc.values()) + list(cls.__by_core.values()):
+            group[cls.__activity] = 0
+        return
+
+    @classmethod
+    def __group(cls,
+                groups: Dict,
+                key: object) -> np.ndarray:
+        if key not in groups:
+            groups[key] = np.zeros(cls.__num_counters)
+        return groups[key]
+
+    @classmethod
+    def __sync_utilisation(cls,
+                           compute: Compute) -> np.ndarray:
+        """
+        The change in memory & compute utilisation of the compute since it was last seen.
+        :return: Counter delta with the utilisation change set and all other counters zero.
+        """
+        if compute.id not in cls.__by_host:
+            cls.register_host(compute)
+        counters = cls.__by_host[compute.id][2]
+        delta = np.zeros(cls.__num_counters)
+        delta[cls.Counter.CURR_MEM.value] = compute.current_memory - counters[cls.Counter.CURR_MEM.value]
+        delta[cls.Counter.CURR_COMP.value] = compute.current_compute - counters[cls.Counter.CURR_COMP.value]
+        return delta
+
+    @classmethod
+    def __apply(cls,
+                compute: Compute,
+                delta: np.ndarray) -> None:
+        dc, core_type, counters = cls.__by_host[compute.id]
+        counters += delta
+        cls.__by_dc[dc] += delta
+        cls.__by_core[core_type] += delta
+        return
@@ -0,0 +1,65 @@
+from typing import List
+import numpy as np
+from AIIntuition.journeys.journey5.compute import Compute
+from AIIntuition.journeys.journey5.host import Host
+from AIIntuition.journeys.journey5.policy import Policy
+from AIIntuition.journeys.journey5.task import Task
+
+
+class FollowTheSunPolicy(Policy):
+    """
+    Place each task on the host where, with the task added, the peak of the expected hourly demand is lowest. The
+    expected demand of every host is held by GMT hour (Host.gmt_load) and the load shape of a task is shifted by the
+    time zone of each candidate host, so a task that peaks at local midday is drawn to hosts whose other tasks peak at
+    a different GMT hour - e.g. in a data center on the other side of the world.
+
+    The score of a host is the higher of its peak compute & peak memory utilisation with the task added plus
+    cost_weight times its unit compute cost relative to the most expensive host, so of hosts with similar peaks the
+    cheaper is preferred. Hosts whose memory peak would exceed their memory are only chosen if no host can take the
+    task.
+    """
+
+    def __init__(self,
+                 cost_weight: float = 0.25):
+        """
+        :param cost_weight: The weight of the relative compute cost against the peak utilisation in the host score
+        """
+        if cost_weight < 0:
+            raise ValueError('Cost weight must be >= 0, given: ' + str(cost_weight))
+        self._cost_weight = cost_weight
+
+    def select_optimal_compute(self,
+                               task: Task) -> Compute:
+        """
+        The host with the lowest peak utilisation, weighted by cost, with the task added
+        :return: The Compute to associated the task with
+        """
+        return self.select_optimal_computes([task])[0]
+
+    def select_optimal_computes(self,
+                                tasks: List[Task]) -> List[Compute]:
+        """
+        Place the tasks one after another, largest first, each placement taking account of the tasks placed before it
+        in the batch.
+        :return: The Compute to associated each task with, in task order
+        """
+        hosts = Host.all_hosts()
+        if len(hosts) == 0:
+            raise RuntimeError('No hosts exist to place tasks on')
+        loads = [h.gmt_load for h in hosts]
+        capacity = np.array([[h.max_compute, h.max_memory] for h in hosts], dtype=np.float64)
+        costs = np.array([h.compute_cost for h in hosts], dtype=np.float64)
+        rel_cost = costs / max(float(np.max(costs)), 1e-12)
+
+        placement = [None] * len(tasks)
+        for idx in sorted(range(0, len(tasks)), key=lambda i: -tasks[i].max_mem):
+            task = tasks[idx]
+            task_loads = [h.gmt_task_load(task) for h in hosts]
+            peaks = np.array([np.max(load + task_load, axis=1) for load, task_load in zip(loads, task_loads)])
+            peaks /= capacity
+            scores = np.max(peaks, axis=1) + self._cost_weight * rel_cost
+            scores[peaks[:, 1] > 1.0] += np.inf if np.any(peaks[:, 1] <= 1.0) else 0.0
+            best = int(np.argmin(scores))
+            loads[best] = loads[best] + task_loads[best]
+            placement[idx] = hosts[best]
+        return placement
@@ -0,0 +1,253 @@
+import random
+from typing import List, Tuple
+import numpy as np
+from AIIntuition.journeys.journey5.host import Host
+from AIIntuition.journeys.journey5.task import Task
+from AIIntuition.journeys.journey5.systemtime import SystemTime
+
+"""
+A compact, canonical record of a schedule run that later runs can be checked against.
+"""
+
+
+class GoldenTrace:
+    """
+    Record the memory & compute of every Host at the end of every hour and the cost, deficit, remaining run time
+    & number of failures of every Task at the end of every day. The trace is saved as a compressed npz file, a later
+    run of the same seeded case can then be compared to it to prove that a change (e.g. a performance refactor of
+    Host.run_next_task) has not changed the behaviour of the simulation.
+
+    Rows are held in time order and, within an hour, in id order, so the first row that differs is the first
+    divergence in time. Values are compared with numpy.isclose tolerances.
+    """
+
+    HOST_FIELDS = ['memory', 'compute']
+    TASK_FIELDS = ['cost', 'deficit', 'run_time', 'failures']
+
+    class Divergence:
+        """
+        The first point at which two traces differ
+        """
+
+        def __init__(self,
+                     hours: int,
+                     host_id: str,
+                     task_id: str,
+                     field: str,
+                     expected: object,
+                     actual: object):
+            self.sys_time = SystemTime(hours // 24, hours % 24)
+            self.host_id = host_id
+            self.task_id = task_id
+            self.field = field
+            self.expected = expected
+            self.actual = actual
+
+        def __str__(self) -> str:
+            s = 'First divergence at ' + self.sys_time.as_str(False)
+            if self.host_id is not None:
+                s += ' Host: ' + self.host_id
+            if self.task_id is not None:
+                s += ' Task: ' + self.task_id
+            return s + ' ' + self.field + ' expected: ' + str(self.expected) + ' actual: ' + str(self.actual)
+
+    def __init__(self):
+        self._host_rows = []  # [(hours, host id, memory, compute)]
+        self._task_rows = []  # [(hours, task id, cost, deficit, run time, failures)]
+        self._failures = {}  # Task Id : number of failures
+        self._arrays = None
+
+    @classmethod
+    def seed(cls,
+             seed: int) -> None:
+        """
+        Seed the python & numpy global random states, which between them drive the ids, profiles, placement and
+        demand of a run, so a run can be repeated exactly.
+        :param seed: The seed
+        """
+        random.seed(seed)
+        np.random.seed(seed)
+        return
+
+    def record_hour(self,
+                    sys_time: SystemTime) -> None:
+        """
+        Record the memory & compute of every Host at the end of the given hour
+        :param sys_time: The current system time
+        """
+        hours = sys_time.hours
+        for hst in sorted(Host.all_hosts(), key=lambda h: h.id):
+            self._host_rows.append((hours, hst.id, hst.current_memory, hst.current_compute))
+        self._arrays = None
+        return
+
+    def record_failure(self,
+                       task: Task) -> None:
+        """
+        Count a failure of the given task
+        """
+        self._failures[task.id] = self._failures.get(task.id, 0) + 1
+        return
+
+    def record_day(self,
+                   sys_time: SystemTime) -> None:
+        """
+        Record the cost, deficit, remaining run time & failures of every Task at the end of the given day
+        :param sys_time: The current system time, any hour of the day
+        """
+        hours = sys_time.day_of_year * 24 + 23
+        for task in sorted(Task.all_tasks(), key=lambda t: t.id):
+            self._task_rows.append((hours, task.id, task.cost, task.compute_deficit, task.curr_run_time,
+                                    self._failures.get(task.id, 0)))
+        self._arrays = None
+        return
+
+    def arrays(self) -> dict:
+        """
+        The trace as arrays
+        :return: Dictionary of the host_hours, host_ids, host_values, task_hours, task_ids & task_values arrays
+        """
+        if self._arrays is None:
+            self._arrays = {'host_hours': np.array([r[0] for r in self._host_rows], dtype=np.int64),
+                            'host_ids': np.array([r[1] for r in self._host_rows], dtype=np.str_),
+                            'host_values': np.array([r[2:] for r in self._host_rows],
+                                                    dtype=np.float64).reshape(-1, len(self.HOST_FIELDS)),
+                            'task_hours': np.array([r[0] for r in self._task_rows], dtype=np.int64),
+                            'task_ids': np.array([r[1] for r in self._task_rows], dtype=np.str_),
+                            'task_values': np.array([r[2:] for r in self._task_rows],
+                                                    dtype=np.float64).reshape(-1, len(self.TASK_FIELDS))}
+        return self._arrays
+
+    def save(self,
+             file_name: str) -> None:
+        """
+        Save the trace as a compressed npz file
+        """
+        np.savez_compressed(file_name, **self.arrays())
+        return
+
+    @classmethod
+    def load(cls,
+             file_name: str) -> 'GoldenTrace':
+        """
+        Load a trace saved by save, the loaded trace can be compared with but not recorded into.
+        """
+        gt = GoldenTrace()
+        with np.load(file_name, allow_pickle=False) as npz:
+            gt._arrays = {k: npz[k] for k in npz.files}
+        return gt
+
+    @classmethod
+    def record_case(cls,
+                    test_case: str,
+                    seed: int,
+                    file_name: str,
+                    **scheduler_args) -> None:
+        """
+        Run the named test case seeded and save its trace. Hosts, tasks & data centers are global so each run must be
+        made in a fresh process e.g. with multiprocessing.
+        :param test_case: The name of the TestCaseSetUp.TestCase e.g. 'STEADY_STATE'
+        :param seed: The seed of the run
+        :param file_name: The npz file to save the trace to
+        :param scheduler_args: Other arguments to the Scheduler e.g. log_first_execution_only=True
+        """
+        from AIIntuition.journeys.journey5.scheduler import Scheduler  # The Scheduler itself imports GoldenTrace
+        from AIIntuition.journeys.journey5.testcasesetup import TestCaseSetUp
+
+        cls.seed(seed)
+        gt = GoldenTrace()
+        Scheduler(TestCaseSetUp.TestCase[test_case].value, golden_trace=gt, **scheduler_args).run()
+        gt.save(file_name)
+        return
+
+    def compare(self,
+                actual: 'GoldenTrace',
+                rtol: float = 1e-6,
+                atol: float = 1e-9) -> 'GoldenTrace.Divergence':
+        """
+        Compare the given trace with this (golden) trace
+        :param actual: The trace of the run to check
+        :param rtol: The relative tolerance of the values
+        :param atol: The absolute tolerance of the values
+        :return: The earliest divergence or None if the traces match within tolerance.
+        """
+        expected = self.arrays()
+        got = actual.arrays()
+        divergences = [d for d in (self.__first(expected, got, 'host', self.HOST_FIELDS, rtol, atol),
+                                   self.__first(expected, got, 'task', self.TASK_FIELDS, rtol, atol)) if d is not None]
+        if len(divergences) == 0:
+            return None
+        return min(divergences, key=lambda d: d.sys_time.hours)
+
+    @classmethod
+    def __first(cls,
+                expected: dict,
+                actual: dict,
+                kind: str,
+                fields: List[str],
+                rtol: float,
+                atol: float) -> 'GoldenTrace.Divergence':
+        """
+        The first row of the given kind (host or task) at which the traces differ
+        """
+        e_hours, e_ids, e_values = expected[kind + '_hours'], expected[kind + '_ids'], expected[kind + '_values']
+        a_hours, a_ids, a_values = actual[kind + '_hours'], actual[kind + '_ids'], actual[kind + '_values']
+        n = min(len(e_hours), len(a_hours))
+        bad = (e_hours[:n] != a_hours[:n]) | (e_ids[:n] != a_ids[:n])
+        bad |= ~np.all(np.isclose(e_values[:n], a_values[:n], rtol=rtol, atol=atol, equal_nan=True), axis=1)
+        idx = np.flatnonzero(bad)
+        if len(idx) == 0:
+            if len(e_hours) == len(a_hours):
+                return None
+            i = n
+            longer = e_hours if len(e_hours) > n else a_hours
+            longer_ids = e_ids if len(e_hours) > n else a_ids
+            return cls.__divergence(kind, int(longer[i]), str(longer_ids[i]), 'rows',
+                                    len(e_hours), len(a_hours))
+        i = int(idx[0])
+        if e_hours[i] != a_hours[i] or e_ids[i] != a_ids[i]:
+            return cls.__divergence(kind, int(min(e_hours[i], a_hours[i])), str(e_ids[i]), 'id',
+                                    (int(e_hours[i]), str(e_ids[i])), (int(a_hours[i]), str(a_ids[i])))
+        f = int(np.flatnonzero(~np.isclose(e_values[i], a_values[i], rtol=rtol, atol=atol, equal_nan=True))[0])
+        return cls.__divergence(kind, int(e_hours[i]), str(e_ids[i]), fields[f], e_values[i, f], a_values[i, f])
+
+    @classmethod
+    def __divergence(cls,
+                     kind: str,
+                     hours: int,
+                     entity_id: str,
+                     field: str,
+                     expected: object,
+                     actual: object) -> 'GoldenTrace.Divergence':
+        host_id, task_id = (entity_id, None) if kind == 'host' else (None, entity_id)
+        return GoldenTrace.Divergence(hours, host_id, task_id, field, expected, actual)
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """
+        The number of host rows & task rows in the trace
+        """
+        arrays = self.arrays()
+        return len(arrays['host_hours']), len(arrays['task_hours'])
+
+
+if __name__ == "__main__":
+    import multiprocessing
+    import os
+    import tempfile
+
+    # Logging only the first execution of the day of steady tasks must leave the simulation itself unchanged.
+    ctx = multiprocessing.get_context('spawn')
+    trace_dir = tempfile.mkdtemp()
+    traces = []
+    for first_only in (False, True):
+        trace_file = os.path.join(trace_dir, 'log_first_execution_only_' + str(first_only) + '.npz')
+        run = ctx.Process(target=GoldenTrace.record_case, args=('STEADY_STATE', 7, trace_file),
+                          kwargs={'log_first_execution_only': first_only})
+        run.start()
+        run.join()
+        traces.append(GoldenTrace.load(trace_file))
+    divergence = traces[0].compare(traces[1])
+    print('Log first execution only: ' + ('traces match' if divergence is None else str(divergence)))
+    if divergence is not None:
+        raise SystemExit(1)
@@ -1,5 +1,6 @@
 from copy import deepcopy
-from typing import List, Tuple
+from typing import Callable, List, Tuple
+import numpy as np
 from AIIntuition.journeys.journey5.datacenter import DataCenter
 from AIIntuition.journeys.journey5.core import Core
 from AIIntuition.journeys.journey5.compute import Compute
@@ -13,6 +14,9 @@ from AIIntuition.journeys.journey5.util import Util
 from AIIntuition.journeys.journey5.cputype import CPUType
 from AIIntuition.journeys.journey5.computeprofile import ComputeProfile
 from AIIntuition.journeys.journey5.systemtime import SystemTime
+from AIIntuition.journeys.journey5.fleetmetrics import FleetMetrics
+from AIIntuition.journeys.journey5.eventfilter import EventFilter
+from AIIntuition.journeys.journey5.taskorder import TaskOrder
 
 
 class Host(Compute):
@@ -20,10 +24,13 @@ class Host(Compute):
     def __init__(self,
                  sys_time: SystemTime,
                  data_center: DataCenter,
-                 compute_profile: ComputeProfile):
+                 compute_profile: ComputeProfile,
+                 task_order: TaskOrder = None):
         """
         Create a new random host according to the defined probability distributions
         Data Center, Type & capacity.
+        :param task_order: Optional order in which to run the associated tasks each hour, if not given tasks are
+        picked at random and may not all run an equal number of times.
         """
         self._data_center = data_center
         self._id = Compute.gen_compute_id(self)
@@ -31,9 +38,18 @@ class Host(Compute):
         self._memory_available = compute_profile.mem
         self._tasks = {}
         self._inf_task_iter = None  # The infinite iterate to use when running associated tasks.
+        self._task_order = task_order
+        self._plan = []  # The tasks to run in the plan hour, in order
+        self._plan_hour = None
+        self._plan_idx = 0
         self._curr_mem = 0
         self._curr_comp = 0
-        Log.log_event(sys_time, HostEvent(sys_time, HostEvent.HostEventType.INSTANTIATE, self), '')
+        self._execution_logged = {}  # Task Id : Day the EXECUTE event of the task in a steady state was last logged
+        self._gmt_local_hours = DataCenter.local_hours(np.arange(0, 24), data_center.hour_offset)
+        self._gmt_load = np.zeros((2, 24))  # Expected compute & memory demand of associated tasks by GMT hour
+        FleetMetrics.register_host(self)
+        if EventFilter.accept(HostEvent, HostEvent.HostEventType.INSTANTIATE, self):
+            Log.log_event(sys_time, HostEvent(sys_time, HostEvent.HostEventType.INSTANTIATE, self), '')
         return
 
     @property
@@ -98,6 +114,14 @@ class Host(Compute):
         """
         return deepcopy(self._curr_comp)
 
+    @property
+    def compute_cost(self) -> float:
+        """
+        The cost of one unit of compute on the host, the data center compute cost scaled by the core cost
+        :return: The unit compute cost
+        """
+        return self._data_center.compute_cost * self._core.core_cost
+
     def associate_task(self,
                        sys_time: SystemTime,
                        task: Task) -> None:
@@ -108,8 +132,10 @@ class Host(Compute):
         :param task: The task to associate with the Host
         """
         self._tasks[task.id] = task
+        self._gmt_load += self.gmt_task_load(task)
         self.__update_inf_iter()
-        Log.log_event(sys_time, HostEvent(sys_time, HostEvent.HostEventType.ASSOCIATE, self, task), '')
+        if EventFilter.accept(HostEvent, HostEvent.HostEventType.ASSOCIATE, self, task):
+            Log.log_event(sys_time, HostEvent(sys_time, HostEvent.HostEventType.ASSOCIATE, self, task), '')
         return
 
     def disassociate_task(self,
@@ -125,11 +151,115 @@ class Host(Compute):
             raise ValueError(task.id + ' is not associated with host :' + self.id)
 
         del self._tasks[task.id]
+        self._gmt_load -= self.gmt_task_load(task)
+        self._execution_logged.pop(task.id, None)
         self.__update_inf_iter()
-        Log.log_event(sys_time, HostEvent(sys_time, HostEvent.HostEventType.DISASSOCIATE, self, task), '')
+        if EventFilter.accept(HostEvent, HostEvent.HostEventType.DISASSOCIATE, self, task):
+            Log.log_event(sys_time, HostEvent(sys_time, HostEvent.HostEventType.DISASSOCIATE, self, task), '')
+
+        return
+
+    def migrate_task(self,
+                     sys_time: SystemTime,
+                     task: Task,
+                     target: 'Host',
+                     migration_cost: float = 0.0) -> None:
+        """
+        Move the given task to the target host with its progress (remaining run time & deficit) intact. The current
+        memory & compute of the task is paid back to this host and reserved on the target (compute up to the target
+        max compute) until the task next executes there.
+        :param sys_time: The current system time.
+        :param task: The task to migrate, must be associated with this Host
+        :param target: The Host to move the task to
+        :param migration_cost: The cost booked to the task for the migration
+        """
+        if task.id not in self._tasks:
+            raise ValueError(task.id + ' is not associated with host :' + self.id)
+        if target.id == self.id:
+            raise ValueError(task.id + ' cannot be migrated to the host it is on :' + self.id)
+
+        cm, cc = task.current_mem, task.current_compute
+        self._curr_mem = max(0, self._curr_mem - cm)
+        self._curr_comp = max(0, self._curr_comp - cc)
+        del self._tasks[task.id]
+        self._gmt_load -= self.gmt_task_load(task)
+        self._execution_logged.pop(task.id, None)
+        self.__update_inf_iter()
+        if EventFilter.accept(HostEvent, HostEvent.HostEventType.MIGRATE, self, task):
+            Log.log_event(sys_time, HostEvent(sys_time, HostEvent.HostEventType.MIGRATE, self, task), '')
+
+        target._curr_mem += cm
+        target._curr_comp = min(target.max_compute, target._curr_comp + cc)
+        target.associate_task(sys_time, task)
+
+        task.book_cost(migration_cost)
+        FleetMetrics.record_migration(self, target, task, migration_cost)
+        return
+
+    def retire(self,
+               sys_time: SystemTime) -> None:
+        """
+        Remove the host from the fleet, the host must have no associated tasks (e.g. they have all been migrated).
+        :param sys_time: The current system time.
+        """
+        if len(self._tasks) > 0:
+            raise RuntimeError('Host :' + self.id + ' cannot be retired with ' + str(len(self._tasks)) + ' tasks')
+        self._curr_mem = 0
+        self._curr_comp = 0
+        FleetMetrics.deregister_host(self)
+        Compute.deregister(self.id)
+        if EventFilter.accept(HostEvent, HostEvent.HostEventType.RETIRE, self):
+            Log.log_event(sys_time, HostEvent(sys_time, HostEvent.HostEventType.RETIRE, self), '')
+        return
 
+    def migration_candidate(self) -> Task:
+        """
+        The associated task that would free the most memory if migrated
+        :return: The task with the largest current memory use, None if no tasks are associated
+        """
+        if len(self._tasks) == 0:
+            return None
+        return max(self._tasks.values(), key=lambda t: t.current_mem)
+
+    def migration_candidates(self) -> List[Task]:
+        """
+        All the associated tasks in the order they would be migrated, largest current memory use first
+        :return: The tasks, empty if no tasks are associated
+        """
+        return sorted(self._tasks.values(), key=lambda t: t.current_mem, reverse=True)
+
+    def set_task_order(self,
+                       task_order: TaskOrder) -> None:
+        """
+        Set the order in which to run the associated tasks each hour, takes effect from the next hour.
+        :param task_order: The order, None to revert to picking tasks at random
+        """
+        self._task_order = task_order
+        self._plan = []
+        self._plan_hour = None
         return
 
+    def gmt_task_load(self,
+                      task: Task) -> np.ndarray:
+        """
+        The expected demand of the given task, if it ran on this host, by GMT hour of day. The load shape of the task
+        is in local time so it is shifted by the time zone of the host data center.
+        :param task: The task
+        :return: (2, 24) array, compute demand (adjusted for the core type of the host) & memory demand by GMT hour
+        """
+        shape = Task.load_shape_matrix()[task.task_type.ordinal][self._gmt_local_hours]
+        ef = Core.core_compute_equivalency(required_core_type=task.core_type, given_core_type=self._core.core_type)
+        return np.stack([shape * (task.load_factor / ef), shape * task.max_mem])
+
+    @property
+    def gmt_load(self) -> np.ndarray:
+        """
+        The expected demand of all the associated tasks by GMT hour of day, maintained as tasks are associated and
+        disassociated.
+        :return: (2, 24) array, compute demand & memory demand by GMT hour
+        """
+        return self._gmt_load.copy()
+
     @property
     def num_associated_task(self) -> int:
         """
@@ -139,18 +269,25 @@ class Host(Compute):
         return len(self._tasks)
 
     def run_next_task(self,
-                      sys_time: SystemTime) -> None:
+                      sys_time: SystemTime,
+                      log_first_execution_only: bool = False) -> None:
         """
-        Randomly pick a task from the list of associated and run it - eventually all tasks will be run. It is possible
-        that tasks will not all be run an equal number of times.
+        Pick the next task from the list of associated and run it. With no task order, tasks are picked at random,
+        eventually all tasks will be run but it is possible that tasks will not all be run an equal number of times.
+        With a task order every task associated at the start of the hour is run exactly once in the hour, in the
+        planned order.
         :param sys_time: The system time according to the scheduler.
+        :param log_first_execution_only: If True only the first execution of the day of a task in a steady state (whose
+        executions are identical from hour to hour) is logged, the task is still run exactly as if False.
         """
         if len(self._tasks) == 0:
             print("No tasks to run on Host:" + self.id)
             return
 
-        # Get next (random) task to run
-        task_to_run = self.__next_task_to_execute()
+        # Get next task to run
+        task_to_run = self.__next_task_to_execute(sys_time)
+        if task_to_run is None:
+            return  # All tasks have had their run for this hour
 
         # Get current & required demand - return current resources
         local_sys_time = self._data_center.local_system_time(sys_time)
@@ -166,16 +303,38 @@ class Host(Compute):
             self._curr_comp += min(compute_available, cd)
 
             compute_used = task_to_run.execute(compute_available, cd)
-            task_to_run.book_cost(self._data_center.compute_cost * self._core.core_cost * compute_used)
-
-            Log.log_event(sys_time,
-                          HostEvent(sys_time,
-                                    HostEvent.HostEventType.EXECUTE,
-                                    compute=self,
-                                    task=task_to_run),
-                          '')
+            cost = self.compute_cost * compute_used
+            task_to_run.book_cost(cost)
+            FleetMetrics.record_execute(self, task_to_run, cost)
+
+            if log_first_execution_only and self.__logged_today(sys_time, task_to_run):
+                return
+            if EventFilter.accept(HostEvent, HostEvent.HostEventType.EXECUTE, self, task_to_run):
+                Log.log_event(sys_time,
+                              HostEvent(sys_time,
+                                        HostEvent.HostEventType.EXECUTE,
+                                        compute=self,
+                                        task=task_to_run),
+                              '')
         return
 
+    def __logged_today(self,
+                       sys_time: SystemTime,
+                       task: Task) -> bool:
+        """
+        Has an EXECUTE event already been logged today for the given task, while it has been in a steady state. The
+        first execution of the day of a task in a steady state is logged (and so recorded as logged).
+        :return: True if the execution need not be logged
+        """
+        if not task.steady_state:
+            self._execution_logged.pop(task.id, None)
+            return False
+        day = sys_time.day_of_year
+        if self._execution_logged.get(task.id, None) == day:
+            return True
+        self._execution_logged[task.id] = day
+        return False
+
     def _check_memory_not_exhausted(self,
                                     sys_time: SystemTime,
                                     task: Task,
@@ -187,6 +346,7 @@ class Host(Compute):
             e = OutOfMemoryException(task, self)
             task.task_failure(e)
             self.disassociate_task(sys_time, task)
+            FleetMetrics.record_failure(self, task)
             raise e
 
     def _task_done_ok(self,
@@ -203,10 +363,13 @@ class Host(Compute):
                 e = FailedToCompleteException(task, self)
                 task.task_failure(e)
                 self.disassociate_task(sys_time, task)
+                FleetMetrics.record_failure(self, task)
                 raise e
             else:
-                Log.log_event(sys_time, HostEvent(sys_time, HostEvent.HostEventType.DONE, self, task), '')
+                if EventFilter.accept(HostEvent, HostEvent.HostEventType.DONE, self, task):
+                    Log.log_event(sys_time, HostEvent(sys_time, HostEvent.HostEventType.DONE, self, task), '')
                 self.disassociate_task(sys_time, task)
+                FleetMetrics.record_done(self, task)
         return done
 
     def _compute_availability(self,
@@ -229,12 +392,25 @@ class Host(Compute):
         self._inf_task_iter = InfRndIter(list(self._tasks.keys()))
         return
 
-    def __next_task_to_execute(self) -> Task:
+    def __next_task_to_execute(self,
+                               sys_time: SystemTime) -> Task:
         """
-        The random next associated task to execute
-        :return: The task to execute
+        The next associated task to execute, at random or the next in the plan for the hour if there is a task order
+        :return: The task to execute, None if all tasks in the plan have been run this hour
         """
-        return self._tasks[next(self._inf_task_iter)]
+        if self._task_order is None:
+            return self._tasks[next(self._inf_task_iter)]
+
+        if self._plan_hour != sys_time.hours:
+            self._plan = self._task_order.order(list(self._tasks.values()))
+            self._plan_hour = sys_time.hours
+            self._plan_idx = 0
+        while self._plan_idx < len(self._plan):
+            task = self._plan[self._plan_idx]
+            self._plan_idx += 1
+            if task.id in self._tasks:
+                return task
+        return None
 
     @classmethod
     def all_hosts(cls) -> List['Host']:
@@ -250,14 +426,26 @@ class Host(Compute):
                 host_list.append(comp)
         return host_list
 
-    def all_tasks(self) -> List['Task']:
+    def is_associated(self,
+                      task_id: str) -> bool:
+        """
+        Is the task with the given id currently associated with this Host
+        :param task_id: The id of the task
+        :return: True if the task is associated
+        """
+        return task_id in self._tasks
+
+    def all_tasks(self,
+                  accept: Callable[['Task'], bool] = None) -> List['Task']:
         """
         Create a deepcopy list of all tasks associated with the host at this point in time
+        :param accept: Optional test of each (live) task, only the tasks accepted are copied & listed
         :return: A list of tasks
         """
         task_list = []
         for k in self._tasks.keys():
-            task_list.append(deepcopy(self._tasks[k]))
+            if accept is None or accept(self._tasks[k]):
+                task_list.append(deepcopy(self._tasks[k]))
         return task_list
 
     def __str__(self) -> str:
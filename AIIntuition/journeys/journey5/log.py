@@ -2,13 +2,16 @@ import uuid
 from datetime import datetime
 from AIIntuition.journeys.journey5.event import Event, FailureEvent
 from AIIntuition.journeys.journey5.systemtime import SystemTime
+from AIIntuition.journeys.journey5.featureringbuffer import FeatureRingBuffer
+from AIIntuition.journeys.journey5.logsink import LogSink, FileLogSink
 
 
 class Log:
-    _file_handle = None
-    _file_handle_feature = None
-    _fhs = [_file_handle, _file_handle_feature]
     _inst = None
+    _feature_buffer = None
+    _text_features = True
+    _sink = None
+    _feature_sink = None
 
     def __init__(self):
         if Log._inst is None:
@@ -18,10 +21,7 @@ class Log:
     def __del__(self):
         Log._inst -= 1
         if Log._inst <= 0:
-            for fh in Log._fhs:
-                fh.flush()
-                fh.close()
-                fh = None
+            Log.close()
             Log._inst = None
 
     @classmethod
@@ -37,9 +37,56 @@ class Log:
         """
         log_msg = cls.log_message(sys_time, event, False, *argv)
         print(log_msg)
-        cls._log_to_file(log_msg)
-        log_msg_f = cls.log_message(sys_time, event, True, *argv)
-        cls._log_to_feature_file(log_msg_f)
+        cls._log_to_file(sys_time, event, log_msg)
+        if cls._feature_buffer is not None:
+            event.as_features(cls._feature_buffer.next_row())
+            cls._feature_buffer.commit()
+        if cls._text_features:
+            log_msg_f = cls.log_message(sys_time, event, True, *argv)
+            cls._log_to_feature_file(sys_time, event, log_msg_f)
+
+    @classmethod
+    def set_sinks(cls,
+                  sink: LogSink,
+                  feature_sink: LogSink = None) -> None:
+        """
+        Write log messages to the given sinks in place of the default timestamped text files, any current sinks are
+        closed first. e.g. ChunkedLogSink to write compressed, day indexed chunks.
+        :param sink: The sink for the log messages, None to revert to the default text file
+        :param feature_sink: The sink for the feature style log messages, None to revert to the default text file
+        """
+        cls.close()
+        cls._sink = sink
+        cls._feature_sink = feature_sink
+        return
+
+    @classmethod
+    def close(cls) -> None:
+        """
+        Flush and close the current sinks.
+        """
+        for s in (cls._sink, cls._feature_sink):
+            if s is not None:
+                s.close()
+        cls._sink = None
+        cls._feature_sink = None
+        return
+
+    @classmethod
+    def attach_feature_buffer(cls,
+                              feature_buffer: FeatureRingBuffer,
+                              text_features: bool = False) -> None:
+        """
+        Write the numeric features of every logged event into the given buffer.
+        :param feature_buffer: Buffer of width Event.NUM_FEATURES shared with the consumer of the features, None to
+        detach the current buffer.
+        :param text_features: If False the (now redundant) text feature log file is no longer written.
+        """
+        if feature_buffer is not None and feature_buffer.width != Event.NUM_FEATURES:
+            raise ValueError('Feature buffer must have width: ' + str(Event.NUM_FEATURES))
+        cls._feature_buffer = feature_buffer
+        cls._text_features = text_features or feature_buffer is None
+        return
 
     @classmethod
     def log_message(cls,
@@ -72,10 +119,13 @@ class Log:
         return datetime.now().strftime('%Y-%m-%d-%H-%M-%S-') + uuid.uuid4().hex + '.log'
 
     @classmethod
-    def _log_to_file(cls, log_msg: str) -> None:
-        if cls._file_handle is None:
-            cls._file_handle = open(cls._log_file_name(), "w")
-        cls._file_handle.write(log_msg + '\n')
+    def _log_to_file(cls,
+                     sys_time: SystemTime,
+                     event: Event,
+                     log_msg: str) -> None:
+        if cls._sink is None:
+            cls._sink = FileLogSink(cls._log_file_name())
+        cls._sink.write(sys_time, event, log_msg)
         return
 
     @classmethod
@@ -83,10 +133,13 @@ class Log:
         return datetime.now().strftime('%Y-%m-%d-%H-%M-%S-') + uuid.uuid4().hex + '_features.log'
 
     @classmethod
-    def _log_to_feature_file(cls, log_msg: str) -> None:
-        if cls._file_handle_feature is None:
-            cls._file_handle_feature = open(cls._feature_file_name(), "w")
-        cls._file_handle_feature.write(log_msg + '\n')
+    def _log_to_feature_file(cls,
+                             sys_time: SystemTime,
+                             event: Event,
+                             log_msg: str) -> None:
+        if cls._feature_sink is None:
+            cls._feature_sink = FileLogSink(cls._feature_file_name())
+        cls._feature_sink.write(sys_time, event, log_msg)
         return
 
 
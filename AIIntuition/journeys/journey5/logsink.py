@@ -0,0 +1,377 @@
+import atexit
+import glob
+import gzip
+import json
+import os
+import re
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List
+from AIIntuition.journeys.journey5.event import Event
+from AIIntuition.journeys.journey5.systemtime import SystemTime
+
+"""
+Destinations for log messages.
+"""
+
+
+class LogSink(ABC):
+    """
+    Somewhere the Log writes its messages to.
+    """
+
+    @abstractmethod
+    def write(self,
+              sys_time: SystemTime,
+              event: Event,
+              log_msg: str) -> None:
+        """
+        Write the given log message
+        :param sys_time: The system time of the event being logged
+        :param event: The event being logged
+        :param log_msg: The formatted log message
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def flush(self) -> None:
+        """
+        Write any buffered messages.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def close(self) -> None:
+        """
+        Flush and release the sink, no further messages can be written.
+        """
+        raise NotImplementedError
+
+
+class FileLogSink(LogSink):
+    """
+    A plain, uncompressed text file of one message per line, the file is created on the first write.
+    """
+
+    def __init__(self,
+                 file_name: str):
+        """
+        :param file_name: The name of the file to write to
+        """
+        self._file_name = file_name
+        self._file_handle = None
+
+    def write(self,
+              sys_time: SystemTime,
+              event: Event,
+              log_msg: str) -> None:
+        if self._file_handle is None:
+            self._file_handle = open(self._file_name, "w")
+        self._file_handle.write(log_msg + '\n')
+        return
+
+    def flush(self) -> None:
+        if self._file_handle is not None:
+            self._file_handle.flush()
+        return
+
+    def close(self) -> None:
+        if self._file_handle is not None:
+            self._file_handle.close()
+            self._file_handle = None
+        return
+
+
+class ChunkedLogSink(LogSink):
+    """
+    Messages are gathered into chunks, each chunk is gzip compressed and appended to a single file as its own gzip
+    member. A new chunk is started at the start of every simulated day and, if a maximum chunk size is given, when
+    the uncompressed chunk reaches that size - so no chunk spans more than one simulated day.
+
+    For every chunk a line is appended to a JSON lines index file (file name + '.idx') giving the byte offset &
+    length of the chunk in the log file, the day & the first and last hour of system time it covers (the lowest &
+    highest hour written, whatever order they were written in) and the count of events by Event class.
+    ChunkedLogReader uses the index to decompress only the chunks of the day(s) wanted. The whole file is also a
+    valid multi member gzip file, so gunzip / zcat read it as normal.
+
+    If a maximum file size is given, once the file reaches that size the sink rotates to a new segment file (e.g.
+    run.log.gz, then run.log.1.gz, run.log.2.gz ..) each with its own index, and if a maximum number of files is given the
+    oldest segments (and their indexes) are deleted so that disk use is bounded. Rotation is only ever between
+    chunks so a file can exceed the maximum size by at most one chunk.
+    """
+
+    def __init__(self,
+                 file_name: str,
+                 max_chunk_bytes: int = None,
+                 compress_level: int = 6,
+                 max_file_bytes: int = None,
+                 max_files: int = None):
+        """
+        :param file_name: The name of the compressed log file e.g. run.log.gz, the index is file_name + '.idx'
+        :param max_chunk_bytes: Optional maximum uncompressed size of a chunk, by default one chunk per day
+        :param compress_level: The gzip compression level 1 (fastest) to 9 (smallest)
+        :param max_file_bytes: Optional (compressed) size at which to rotate to a new segment file, by default all
+        chunks are written to the one file
+        :param max_files: Optional maximum number of segment files to keep, the oldest are deleted on rotation
+        """
+        if max_chunk_bytes is not None and max_chunk_bytes <= 0:
+            raise ValueError('Max chunk bytes must be > 0, given: ' + str(max_chunk_bytes))
+        if max_file_bytes is not None and max_file_bytes <= 0:
+            raise ValueError('Max file bytes must be > 0, given: ' + str(max_file_bytes))
+        if max_files is not None and max_files <= 0:
+            raise ValueError('Max files must be > 0, given: ' + str(max_files))
+        self._file_name = file_name
+        self._max_chunk_bytes = max_chunk_bytes
+        self._compress_level = compress_level
+        self._max_file_bytes = max_file_bytes
+        self._max_files = max_files
+        for old_segment in ChunkedLogReader.segment_names(file_name):  # Do not mix segments of an earlier run
+            self.__remove_segment(old_segment)
+        self._segment = 0
+        self._segments = []
+        self._file_handle = None
+        self._index_handle = None
+        self._num_chunks = 0
+        self._offset = 0
+        self._chunk = None
+        self._lines = None
+        self._chunk_bytes = None
+        self.__open_segment()
+        self._new_chunk()
+        atexit.register(self.close)
+
+    @property
+    def num_chunks(self) -> int:
+        """
+        The number of chunks written so far
+        """
+        return self._num_chunks
+
+    @property
+    def segment(self) -> int:
+        """
+        The number of the segment file being written, 0 until the first rotation
+        """
+        return self._segment
+
+    def write(self,
+              sys_time: SystemTime,
+              event: Event,
+              log_msg: str) -> None:
+        if self._file_handle is None:
+            raise RuntimeError('Log sink is closed: ' + self._file_name)
+        chunk = self._chunk
+        if chunk['events'] > 0 and sys_time.day_of_year != chunk['day']:
+            self.flush()
+            chunk = self._chunk
+        hour = sys_time.hour_of_day
+        if chunk['events'] == 0:
+            chunk['day'] = sys_time.day_of_year
+            chunk['first_hour'] = hour
+            chunk['last_hour'] = hour
+        else:  # Messages are not always written in hour order e.g. the end of day status is logged at hour 0
+            chunk['first_hour'] = min(chunk['first_hour'], hour)
+            chunk['last_hour'] = max(chunk['last_hour'], hour)
+        chunk['events'] += 1
+        event_name = event.__class__.__name__
+        chunk['event_counts'][event_name] = chunk['event_counts'].get(event_name, 0) + 1
+        self._lines.append(log_msg)
+        self._chunk_bytes += len(log_msg) + 1
+        if self._max_chunk_bytes is not None and self._chunk_bytes >= self._max_chunk_bytes:
+            self.flush()
+        return
+
+    def flush(self) -> None:
+        """
+        Compress and write the current chunk (if it has any messages) and start a new chunk.
+        """
+        if self._file_handle is None or self._chunk['events'] == 0:
+            return
+        if self._max_file_bytes is not None and self._offset >= self._max_file_bytes:
+            self.__rotate()
+        raw = ('\n'.join(self._lines) + '\n').encode('utf-8')
+        data = gzip.compress(raw, compresslevel=self._compress_level)
+        self._file_handle.write(data)
+        self._file_handle.flush()
+        self._chunk['chunk'] = self._num_chunks
+        self._chunk['segment'] = self._segment
+        self._chunk['offset'] = self._offset
+        self._chunk['length'] = len(data)
+        self._chunk['raw_length'] = len(raw)
+        self._index_handle.write(json.dumps(self._chunk) + '\n')
+        self._index_handle.flush()
+        self._num_chunks += 1
+        self._offset += len(data)
+        self._new_chunk()
+        return
+
+    def close(self) -> None:
+        if self._file_handle is None:
+            return
+        self.flush()
+        self.__close_segment()
+        atexit.unregister(self.close)
+        return
+
+    def __open_segment(self) -> None:
+        """
+        Start writing the current segment file & its index, deleting the oldest segments beyond the maximum number
+        of files.
+        """
+        segment_name = ChunkedLogReader.segment_name(self._file_name, self._segment)
+        self._file_handle = open(segment_name, "wb")
+        self._index_handle = open(ChunkedLogReader.index_name(segment_name), "w")
+        self._offset = 0
+        self._segments.append(segment_name)
+        while self._max_files is not None and len(self._segments) > self._max_files:
+            self.__remove_segment(self._segments.pop(0))
+        return
+
+    def __close_segment(self) -> None:
+        self._file_handle.close()
+        self._index_handle.close()
+        self._file_handle = None
+        self._index_handle = None
+        return
+
+    def __rotate(self) -> None:
+        """
+        Close the current segment file and start the next.
+        """
+        self.__close_segment()
+        self._segment += 1
+        self.__open_segment()
+        return
+
+    @classmethod
+    def __remove_segment(cls,
+                         segment_name: str) -> None:
+        for name in (segment_name, ChunkedLogReader.index_name(segment_name)):
+            if os.path.exists(name):
+                os.remove(name)
+        return
+
+    def _new_chunk(self) -> None:
+        self._chunk = {'day': None, 'first_hour': None, 'last_hour': None, 'events': 0, 'event_counts': {}}
+        self._lines = []
+        self._chunk_bytes = 0
+        return
+
+
+class ChunkedLogReader:
+    """
+    Read the log messages written by a ChunkedLogSink, by simulated day, decompressing only the chunks needed. The
+    messages of all the segment files still on disk are read, in the order written.
+    """
+
+    def __init__(self,
+                 file_name: str):
+        """
+        :param file_name: The name of the compressed log file written by ChunkedLogSink
+        """
+        self._file_name = file_name
+        self._index = []
+        for segment_name in self.segment_names(file_name):
+            with open(self.index_name(segment_name), "r") as idx:
+                self._index.extend(json.loads(line) for line in idx if line.strip() != '')
+
+    @classmethod
+    def index_name(cls,
+                   file_name: str) -> str:
+        """
+        The name of the index file that goes with the given compressed log file
+        """
+        return file_name + '.idx'
+
+    @classmethod
+    def segment_name(cls,
+                     file_name: str,
+                     segment: int) -> str:
+        """
+        The name of the given segment of a rotated log file, segment 0 is the file name itself, later segments are
+        numbered before the .gz extension e.g. run.log.gz, run.log.1.gz, run.log.2.gz
+        """
+        if segment == 0:
+            return file_name
+        root, ext = (file_name[:-3], '.gz') if file_name.endswith('.gz') else (file_name, '')
+        return root + '.' + str(segment) + ext
+
+    @classmethod
+    def segment_names(cls,
+                      file_name: str) -> List[str]:
+        """
+        The names of the segments of the given log file that exist, oldest first
+        """
+        root, ext = (file_name[:-3], '.gz') if file_name.endswith('.gz') else (file_name, '')
+        numbered = re.compile(re.escape(root) + r'\.(\d+)' + re.escape(ext) + '$')
+        segments = [int(m.group(1)) for m in (numbered.match(f) for f in glob.glob(glob.escape(root) + '.*' + ext))
+                    if m is not None and int(m.group(1)) > 0]
+        if os.path.exists(file_name):
+            segments.append(0)
+        return [cls.segment_name(file_name, n) for n in sorted(segments)]
+
+    @property
+    def index(self) -> List[Dict]:
+        """
+        The index entry of every chunk, in the order written
+        """
+        return [dict(entry) for entry in self._index]
+
+    def days(self) -> List[int]:
+        """
+        The simulated days for which there are messages
+        """
+        return sorted(set(entry['day'] for entry in self._index))
+
+    def event_counts(self,
+                     day: int) -> Dict[str, int]:
+        """
+        The number of messages by Event class for the given simulated day, taken from the index alone.
+        """
+        counts = {}
+        for entry in self._index:
+            if entry['day'] == day:
+                for k, v in entry['event_counts'].items():
+                    counts[k] = counts.get(k, 0) + v
+        return counts
+
+    def read_day(self,
+                 day: int) -> Iterator[str]:
+        """
+        The log messages of the given simulated day
+        :param day: The simulated day of year
+        :return: Iterator over the messages in the order written.
+        """
+        fh = None
+        segment = None
+        try:
+            for entry in self._index:
+                if entry['day'] != day:
+                    continue
+                if fh is None or entry.get('segment', 0) != segment:
+                    if fh is not None:
+                        fh.close()
+                    segment = entry.get('segment', 0)
+                    fh = open(self.segment_name(self._file_name, segment), "rb")
+                fh.seek(entry['offset'])
+                raw = gzip.decompress(fh.read(entry['length']))
+                for line in raw.decode('utf-8').splitlines():
+                    yield line
+        finally:
+            if fh is not None:
+                fh.close()
+
+
+if __name__ == "__main__":
+    from AIIntuition.journeys.journey5.event import SchedulerEvent
+
+    sink = ChunkedLogSink('example.log.gz', max_chunk_bytes=256, max_file_bytes=1024, max_files=3)
+    for d in range(0, 3):
+        for h in range(0, 24):
+            st = SystemTime(d, h)
+            ev = SchedulerEvent(st, SchedulerEvent.SchedulerEventType.NEW_DAY)
+            sink.write(st, ev, 'Day ' + str(d) + ' Hour ' + str(h))
+    sink.close()
+    reader = ChunkedLogReader('example.log.gz')
+    print(ChunkedLogReader.segment_names('example.log.gz'), reader.days(), reader.event_counts(1))
+    for m in reader.read_day(1):
+        print(m)
@@ -0,0 +1,172 @@
+import gc
+import sys
+import tracemalloc
+from typing import Dict, List, Tuple
+import numpy as np
+from AIIntuition.journeys.journey5.compute import Compute
+from AIIntuition.journeys.journey5.task import Task
+from AIIntuition.journeys.journey5.seqmap import SeqMap
+from AIIntuition.journeys.journey5.systemtime import SystemTime
+
+"""
+Where the memory of a long schedule run goes, day by day.
+"""
+
+
+class MemoryReport:
+    """
+    Opt in memory accounting, sampled by the Scheduler at the start of each day. Each sample records, by entity type
+    (class name of every live object defined in this package e.g. Host, App, HostEvent, SeqMap), the number of live
+    instances & their approximate size, the number of registered Computes & Tasks, the number of values held by
+    each SeqMap and, if enabled, the memory traced by tracemalloc & the source lines that have grown the most since
+    the previous sample.
+
+    Instances over and above those registered are copies e.g. the deep copies of Hosts & Tasks held by Events. A
+    count or size that grows every day is a leak or unbounded cache, the growth report lists these first.
+
+    The size of an instance is the size of the object, its attribute dictionary and the (shallow) size of each
+    attribute value, so shared values are counted once per holder. Counting live objects walks the whole heap, it
+    is cheap once a day but is not intended for every hour.
+    """
+
+    PACKAGE = __name__.rsplit('.', 1)[0]
+
+    def __init__(self,
+                 trace_malloc: bool = False,
+                 top_n: int = 10,
+                 file_name: str = None):
+        """
+        :param trace_malloc: If True start tracemalloc and record the traced memory & top growing source lines
+        :param top_n: The number of entity types / source lines to list in the report
+        :param file_name: If given, the growth report is written to this file when the run completes
+        """
+        if top_n <= 0:
+            raise ValueError('Top N must be > 0, given: ' + str(top_n))
+        self._trace_malloc = trace_malloc
+        self._top_n = top_n
+        self._file_name = file_name
+        self._samples = []  # [(sys_time, {entity type: (count, bytes)}, {seq map name: values}, registered)]
+        self._traced = []  # [(current bytes, peak bytes)]
+        self._top_lines = []  # [[str]] top growing source lines since previous sample
+        self._snapshot = None
+        self._started = trace_malloc and not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start()
+
+    @property
+    def num_samples(self) -> int:
+        """
+        The number of samples taken
+        """
+        return len(self._samples)
+
+    def sample(self,
+               sys_time: SystemTime) -> None:
+        """
+        Record the current memory use by entity type
+        :param sys_time: The current system time
+        """
+        by_type, seq_maps = self.__by_entity_type()
+        registered = {'Computes': len(Compute.all_compute_ids()), 'Tasks': Task.num_tasks()}
+        self._samples.append((sys_time, by_type, seq_maps, registered))
+        if self._trace_malloc:
+            self._traced.append(tracemalloc.get_traced_memory())
+            snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+            if self._snapshot is None:
+                self._top_lines.append([])
+            else:
+                self._top_lines.append([str(s) for s in snapshot.compare_to(self._snapshot, 'lineno')[:self._top_n]])
+            self._snapshot = snapshot
+        return
+
+    def __by_entity_type(self) -> Tuple[Dict[str, Tuple[int, int]], Dict[str, int]]:
+        """
+        Count & size all live objects of classes defined in this package
+        :return: {entity type: (count, bytes)}, {SeqMap name: number of values}
+        """
+        counts = {}
+        sizes = {}
+        seq_maps = {}
+        for obj in gc.get_objects():
+            cls = type(obj)
+            if not str(getattr(cls, '__module__', '')).startswith(self.PACKAGE):
+                continue
+            name = cls.__name__
+            counts[name] = counts.get(name, 0) + 1
+            sizes[name] = sizes.get(name, 0) + self.__instance_size(obj)
+            if isinstance(obj, SeqMap):
+                seq_maps[obj.name] = seq_maps.get(obj.name, 0) + len(obj)
+        return {k: (counts[k], sizes[k]) for k in counts}, seq_maps
+
+    @classmethod
+    def __instance_size(cls,
+                        obj: object) -> int:
+        size = sys.getsizeof(obj)
+        attrs = getattr(obj, '__dict__', None)
+        if attrs is not None:
+            size += sys.getsizeof(attrs)
+            for v in attrs.values():
+                size += v.nbytes if isinstance(v, np.ndarray) else sys.getsizeof(v)
+        return size
+
+    def growth(self) -> List[Tuple[str, int, int, int, int, float]]:
+        """
+        The growth of each entity type from the first to the last sample
+        :return: [(entity type, first count, last count, first bytes, last bytes, fraction of days that grew)] in
+        descending order of the bytes grown
+        """
+        if len(self._samples) == 0:
+            return []
+        first = self._samples[0][1]
+        last = self._samples[-1][1]
+        growth = []
+        for name in set(first.keys()) | set(last.keys()):
+            f_count, f_bytes = first.get(name, (0, 0))
+            l_count, l_bytes = last.get(name, (0, 0))
+            series = [s[1].get(name, (0, 0))[1] for s in self._samples]
+            grew = sum(1 for a, b in zip(series, series[1:]) if b > a)
+            growth.append((name, f_count, l_count, f_bytes, l_bytes, grew / max(1, len(series) - 1)))
+        return sorted(growth, key=lambda g: g[3] - g[4])
+
+    def report(self) -> str:
+        """
+        The growth report, entity types that grew the most first followed by the SeqMaps, the registries and the day
+        by day traced memory if enabled.
+        :return: Report as multi line string
+        """
+        if len(self._samples) == 0:
+            return 'Memory Report: no samples\n'
+        first_time, _, first_seq, first_reg = self._samples[0]
+        last_time, _, last_seq, last_reg = self._samples[-1]
+        s = 'Memory Report: ' + str(len(self._samples)) + ' samples from ' + first_time.as_str(False) + ' to ' + \
+            last_time.as_str(False) + '\n'
+        s += '{:<24}{:>10}{:>10}{:>14}{:>14}{:>10}\n'.format('Entity Type', 'Count', 'Now', 'Bytes', 'Now', 'Grew')
+        for name, f_count, l_count, f_bytes, l_bytes, grew in self.growth()[:self._top_n]:
+            s += '{:<24}{:>10}{:>10}{:>14}{:>14}{:>9.0f}%\n'.format(name, f_count, l_count, f_bytes, l_bytes,
+                                                                   100 * grew)
+        s += 'Sequence Maps (values)\n'
+        for name in sorted(set(first_seq.keys()) | set(last_seq.keys())):
+            s += '   {:<21}{:>10}{:>10}\n'.format(name, first_seq.get(name, 0), last_seq.get(name, 0))
+        s += 'Registered\n'
+        for name in sorted(last_reg.keys()):
+            s += '   {:<21}{:>10}{:>10}\n'.format(name, first_reg.get(name, 0), last_reg[name])
+        if self._trace_malloc:
+            s += 'Traced memory (current, peak bytes) by sample\n'
+            for (st, _, _, _), (current, peak), top in zip(self._samples, self._traced, self._top_lines):
+                s += '   ' + st.as_str(False) + ' ' + str(current) + ', ' + str(peak) + '\n'
+                for line in top:
+                    s += '      ' + line + '\n'
+        return s
+
+    def close(self) -> None:
+        """
+        Write the growth report to the report file, if one was given, and stop tracemalloc if it was started here.
+        """
+        if self._file_name is not None:
+            with open(self._file_name, 'w') as f:
+                f.write(self.report())
+        if self._started and tracemalloc.is_tracing():
+            tracemalloc.stop()
+            self._started = False
+        self._snapshot = None
+        return
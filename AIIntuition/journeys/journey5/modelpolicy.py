@@ -0,0 +1,177 @@
+from typing import Callable, List
+import numpy as np
+from AIIntuition.journeys.journey5.compute import Compute
+from AIIntuition.journeys.journey5.core import Core
+from AIIntuition.journeys.journey5.policy import Policy
+from AIIntuition.journeys.journey5.task import Task
+
+
+class ModelPolicy(Policy):
+    """
+    Place tasks using a learned model that scores (task, compute) pairs.
+
+    The features of all tasks & candidate computes are gathered once and broadcast into a (tasks, computes,
+    features) tensor and the model is called once to score the whole batch. Tasks are then placed in order, each on
+    the compute with the highest score; the chosen compute's memory, compute & task count features are increased by
+    the (predicted) demand of the task and its scores are marked stale, so a batch is spread over the fleet as it
+    fills rather than all going to the computes that scored best when empty. Stale scores are only refreshed when a
+    stale compute is the best for a later task, when all the stale computes are re-scored against the tasks still to
+    place in one model call - so a batch costs one model call plus one for each time a task would have gone to a
+    compute already picked, rather than one per task.
+    The model is any callable that takes a (pairs, len(FEATURES)) float32 array & returns (pairs,) or (pairs, 1)
+    scores e.g. a NumPy MLP or the predict method of a loaded Keras model.
+    """
+
+    TASK_FEATURES = ['Task Core Type', 'Load Factor', 'Max Mem', 'Profile', 'Time Left', 'Deficit']
+    COMPUTE_FEATURES = ['Core Type', 'Max Compute', 'Max Mem', 'Curr Mem', 'Curr Comp', 'Compute Cost', 'Num Tasks']
+    PAIR_FEATURES = ['Core Equivalency', 'Mem Headroom', 'Comp Headroom']
+    FEATURES = TASK_FEATURES + COMPUTE_FEATURES + PAIR_FEATURES
+
+    def __init__(self,
+                 model: Callable[[np.ndarray], np.ndarray],
+                 computes: List[Compute] = None):
+        """
+        :param model: Callable that scores a (pairs, len(FEATURES)) feature array
+        :param computes: The candidate computes, if not given all existing computes are candidates.
+        """
+        self._model = model
+        self._computes = computes
+
+    def select_optimal_compute(self,
+                               task: Task) -> Compute:
+        """
+        The compute with the highest model score for the given task
+        :return: The Compute to associated the task with
+        """
+        return self.select_optimal_computes([task])[0]
+
+    def select_optimal_computes(self,
+                                tasks: List[Task]) -> List[Compute]:
+        """
+        Score every (task, compute) pair with a single model call then place the tasks in order on the highest
+        scoring compute. After each pick the chosen compute's features include the demand of the task, its scores are
+        refreshed (with those of any other compute picked since the last refresh) only if it is the highest scoring
+        compute for a later task.
+        :return: The Compute to associated each task with, in task order
+        """
+        if len(tasks) == 0:
+            return []
+        computes = self._candidates()
+        task_f = self.__task_features(tasks)
+        comp_f = self.__compute_features(computes)
+        scores = self.__score(self.__pair_features(task_f, comp_f)).reshape(len(tasks), len(computes))
+        stale = np.zeros(len(computes), dtype=bool)
+        best = []
+        for i in range(0, len(tasks)):
+            c = int(np.argmax(scores[i]))
+            if stale[c]:
+                cols = np.flatnonzero(stale)
+                scores[i:, cols] = self.__score(self.__pair_features(task_f[i:], comp_f[cols])).reshape(-1, len(cols))
+                stale[:] = False
+                c = int(np.argmax(scores[i]))
+            best.append(c)
+            equivalency = Core.core_compute_equivalencies(int(task_f[i, 0]), int(comp_f[c, 0]))
+            comp_f[c, 3] += task_f[i, 2]  # Curr Mem
+            comp_f[c, 4] += task_f[i, 1] / equivalency  # Curr Comp
+            comp_f[c, 6] += 1  # Num Tasks
+            stale[c] = True
+        return [computes[c] for c in best]
+
+    def __score(self,
+                features: np.ndarray) -> np.ndarray:
+        """
+        The model scores of a (tasks, computes, features) tensor as a flat (tasks * computes,) array
+        """
+        num_tasks, num_computes, num_features = features.shape
+        return np.asarray(self._model(features.reshape(num_tasks * num_computes, num_features))).reshape(-1)
+
+    @classmethod
+    def feature_tensor(cls,
+                       tasks: List[Task],
+                       computes: List[Compute]) -> np.ndarray:
+        """
+        The features of every (task, compute) pair
+        :param tasks: The tasks to place
+        :param computes: The candidate computes
+        :return: float32 array (tasks, computes, len(FEATURES))
+        """
+        return cls.__pair_features(cls.__task_features(tasks), cls.__compute_features(computes))
+
+    @classmethod
+    def __task_features(cls,
+                        tasks: List[Task]) -> np.ndarray:
+        return np.array([[t.core_type.ordinal,
+                          t.load_factor,
+                          t.max_mem,
+                          t.task_type.ordinal,
+                          t.curr_run_time,
+                          t.compute_deficit] for t in tasks], dtype=np.float64)
+
+    @classmethod
+    def __compute_features(cls,
+                           computes: List[Compute]) -> np.ndarray:
+        return np.array([[c.type.ordinal,
+                          c.max_compute,
+                          c.max_memory,
+                          c.current_memory,
+                          c.current_compute,
+                          c.compute_cost,
+                          c.num_associated_task] for c in computes], dtype=np.float64)
+
+    @classmethod
+    def __pair_features(cls,
+                        task_f: np.ndarray,
+                        comp_f: np.ndarray) -> np.ndarray:
+        """
+        Broadcast the task & compute features into the (tasks, computes, len(FEATURES)) pair tensor
+        """
+        num_tasks, num_computes = len(task_f), len(comp_f)
+        task_core = task_f[:, 0].astype(np.int64)[:, None]
+        comp_core = comp_f[:, 0].astype(np.int64)[None, :]
+        equivalency = Core.core_compute_equivalencies(task_core, comp_core)
+        max_comp, max_mem, curr_mem, curr_comp = (comp_f[None, :, i] for i in (1, 2, 3, 4))
+        mem_headroom = (max_mem - curr_mem - task_f[:, 2:3]) / max_mem
+        comp_headroom = (max_comp - curr_comp - task_f[:, 1:2] / equivalency) / max_comp
+
+        return np.concatenate([np.broadcast_to(task_f[:, None, :], (num_tasks, num_computes, task_f.shape[1])),
+                               np.broadcast_to(comp_f[None, :, :], (num_tasks, num_computes, comp_f.shape[1])),
+                               np.stack([equivalency, mem_headroom, comp_headroom], axis=-1)],
+                              axis=-1).astype(np.float32)
+
+    def _candidates(self) -> List[Compute]:
+        """
+        The candidate computes, all existing computes unless a fixed list was given.
+        """
+        if self._computes is not None:
+            return self._computes
+        return [Compute.get_by_id(cid) for cid in Compute.all_compute_ids()]
+
+
+if __name__ == "__main__":
+    from AIIntuition.journeys.journey5.app import App
+    from AIIntuition.journeys.journey5.host import Host
+    from AIIntuition.journeys.journey5.datacenter import DataCenter
+    from AIIntuition.journeys.journey5.systemtime import SystemTime
+    from AIIntuition.journeys.journey5.randomhostprofiles import RandomHostProfiles
+    from AIIntuition.journeys.journey5.randomtaskprofiles import RandomTaskProfiles
+
+    for cc in DataCenter.country_codes():
+        DataCenter(cc)
+    hosts = [Host(SystemTime(0, 0), DataCenter.next_data_center_by_p_dist(), rhp) for rhp in RandomHostProfiles(10)]
+    apps = [App(rtp) for rtp in RandomTaskProfiles(50)]
+
+    # A small random weight two layer MLP stands in for a trained model.
+    w1 = np.random.normal(size=(len(ModelPolicy.FEATURES), 16))
+    w2 = np.random.normal(size=(16, 1))
+    model_calls = []
+
+    def mlp(x: np.ndarray) -> np.ndarray:
+        model_calls.append(len(x))
+        return np.maximum(0.0, x @ w1) @ w2
+
+    policy = ModelPolicy(mlp)
+    placed = policy.select_optimal_computes(apps)
+    for app, host in zip(apps, placed):
+        print(app.id + ' -> ' + host.name)
+    print(str(len(set(h.id for h in placed))) + ' hosts used for ' + str(len(apps)) + ' tasks with ' +
+          str(len(model_calls)) + ' model calls')
@@ -1,4 +1,5 @@
 from abc import ABC, abstractclassmethod, abstractmethod
+from typing import List
 from AIIntuition.journeys.journey5.compute import Compute
 from AIIntuition.journeys.journey5.task import Task
 
@@ -12,3 +13,12 @@ class Policy(ABC):
         :return: The Compute to associated the task with
         """
         raise NotImplementedError
+
+    def select_optimal_computes(self,
+                                tasks: List[Task]) -> List[Compute]:
+        """
+        Select the optimal compute for each of the given tasks, policies that can score many tasks at once
+        override this to place the whole batch in one pass.
+        :return: The Compute to associated each task with, in task order
+        """
+        return [self.select_optimal_compute(task) for task in tasks]
@@ -1,17 +1,21 @@
+import random
 from copy import deepcopy
-from typing import Tuple, Dict
+from typing import Callable, Tuple, Dict, List
 from collections.abc import Iterable
+import numpy as np
 from AIIntuition.journeys.journey5.datacenter import DataCenter
+from AIIntuition.journeys.journey5.compute import Compute
 from AIIntuition.journeys.journey5.host import Host
 from AIIntuition.journeys.journey5.app import App
 from AIIntuition.journeys.journey5.infrnditer import InfRndIter
 from AIIntuition.journeys.journey5.policy import Policy
 from AIIntuition.journeys.journey5.randompolicy import RandomPolicy
-from AIIntuition.journeys.journey5.randomhostprofile import RandomHostProfile
-from AIIntuition.journeys.journey5.randomtaskprofile import RandomTaskProfile
+from AIIntuition.journeys.journey5.randomhostprofiles import RandomHostProfiles
+from AIIntuition.journeys.journey5.randomtaskprofiles import RandomTaskProfiles
 from AIIntuition.journeys.journey5.caseproperty import CaseProperty
 from AIIntuition.journeys.journey5.case import Case
 from AIIntuition.journeys.journey5.systemtime import SystemTime
+from AIIntuition.journeys.journey5.fleetcache import FleetCache
 
 
 class RandomCase(Case):
@@ -23,6 +27,36 @@ class RandomCase(Case):
     _num_hosts = 10
     _num_apps = 50
     _num_run_days = 50
+    _seed = None
+    _cache = None
+    _policy = RandomPolicy
+    __placement_stream = 1  # Placement draws from its own stream of the fleet seed, not the fleet generation stream
+
+    @classmethod
+    def use_cache(cls,
+                  cache: FleetCache,
+                  seed: int) -> None:
+        """
+        Generate the fleet & workload from the given seed and cache the definition, such that later set-ups with the
+        same seed, parameters & generating code load the definition rather than generate it. Only the fleet is
+        cached, the tasks are placed by the policy on every set-up so a change to the policy is never a stale hit.
+        :param cache: The cache to use, None to not cache
+        :param seed: The seed of the random state to generate from, None to generate from the global random state
+        (the default) in which case nothing is cached as every set-up is a different fleet
+        """
+        cls._cache = cache
+        cls._seed = seed
+        return
+
+    @classmethod
+    def use_policy(cls,
+                   policy: Callable[[], Policy]) -> None:
+        """
+        The placement policy to use for the initial placement and re-scheduling of tasks
+        :param policy: Factory of the policy e.g. FollowTheSunPolicy, by default RandomPolicy
+        """
+        cls._policy = policy
+        return
 
     @classmethod
     def set_up(cls) -> Tuple[int, int, Policy, Iterable, int]:
@@ -37,29 +71,92 @@ class RandomCase(Case):
             The Host iterator used by the scheduler
             The number of 24 hour periods to run the schedule simulation for
         """
-        policy = RandomPolicy()  # Host selected at random
+        policy = cls._policy()  # By default Host selected at random
 
-        for country_code in DataCenter.country_codes():
+        country_codes = DataCenter.country_codes()
+        for country_code in country_codes:
             _ = DataCenter(country_code)
 
-        for i in range(0, cls._num_hosts):
-            dc = DataCenter.next_data_center_by_p_dist()  # Pick a data centre according to DC distribution
-            rhp = RandomHostProfile()
-            _ = Host(SystemTime(0, 0), dc, rhp)  # Create a Host in the chosen Data Centre
+        key = None
+        fleet = None
+        if cls._cache is not None and cls._seed is not None:
+            key = FleetCache.key(cls._seed, cls.__cache_params(), cls.__source_files())
+            fleet = cls._cache.load(key)
+        if fleet is None:
+            fleet = cls.__generate(country_codes, None if cls._seed is None else np.random.RandomState(cls._seed))
+            if key is not None:
+                cls._cache.store(key, fleet)
+
+        hosts = []
+        for rhp, dc_idx in zip(RandomHostProfiles.from_arrays(fleet), fleet['host_dc']):
+            dc = DataCenter.get_by_country_code(country_codes[int(dc_idx)])
+            hosts.append(Host(SystemTime(0, 0), dc, rhp))  # Create a Host in the chosen Data Centre
 
-        for i in range(0, cls._num_apps):
-            rtp = RandomTaskProfile()
+        for rtp in RandomTaskProfiles.from_arrays(fleet):
             App(rtp)  # Create a new random app
 
         app_list = App.all_tasks()
-        for app in app_list:
-            hst = policy.select_optimal_compute(app)
+        placement = cls.__place(policy, app_list)
+        for app, hst in zip(app_list, placement):
             hst.associate_task(SystemTime(0, 0), app)
 
         compute_iter = InfRndIter(Host.all_hosts())
 
         return deepcopy(cls._num_hosts), deepcopy(cls._num_apps), policy, compute_iter, deepcopy(cls._num_run_days)
 
+    @classmethod
+    def __generate(cls,
+                   country_codes: List[DataCenter.CountryCode],
+                   rng: np.random.RandomState) -> Dict[str, np.ndarray]:
+        """
+        Generate the host & task profiles and the data center of each host.
+        :param rng: The seeded random state to generate from, None for the global random state
+        :return: The fleet definition as named arrays
+        """
+        fleet = RandomHostProfiles(cls._num_hosts, rng).as_arrays()
+        dcs = [DataCenter.next_data_center_by_p_dist(rng) for _ in range(0, cls._num_hosts)]
+        fleet['host_dc'] = np.array([country_codes.index(DataCenter.CountryCode(dc.country_mnemonic)) for dc in dcs],
+                                    dtype=np.int64)
+        fleet.update(RandomTaskProfiles(cls._num_apps, rng).as_arrays())
+        return fleet
+
+    @classmethod
+    def __place(cls,
+                policy: Policy,
+                app_list: List[App]) -> List[Compute]:
+        """
+        The initial placement of the generated tasks. A seeded fleet is placed from a random state of its own,
+        seeded from the fleet seed, and the global random states are left as they were, so that a fleet loaded from
+        the cache is placed exactly as when it was generated and the run that follows is the same.
+        :return: The compute of each task, in task order
+        """
+        if cls._seed is None:
+            return policy.select_optimal_computes(app_list)
+        py_state, np_state = random.getstate(), np.random.get_state()
+        if isinstance(policy, RandomPolicy):
+            policy = RandomPolicy(np.random.RandomState([cls._seed, cls.__placement_stream]))
+        placement = policy.select_optimal_computes(app_list)
+        random.setstate(py_state)
+        np.random.set_state(np_state)
+        return placement
+
+    @classmethod
+    def __cache_params(cls) -> Dict[str, object]:
+        return {'num_hosts': cls._num_hosts, 'num_apps': cls._num_apps}
+
+    @classmethod
+    def __source_files(cls) -> List[str]:
+        """
+        The source of the code that generates the fleet, a change to any of them invalidates the cached fleets.
+        """
+        import AIIntuition.journeys.journey5.randomtaskprofile as rtp_mod
+        import AIIntuition.journeys.journey5.randomcoreprofile as rcp_mod
+        import AIIntuition.journeys.journey5.memory as mem_mod
+        import AIIntuition.journeys.journey5.randomhostprofiles as rhps_mod
+        import AIIntuition.journeys.journey5.randomtaskprofiles as rtps_mod
+        import AIIntuition.journeys.journey5.datacenter as dc_mod
+        return [__file__] + [m.__file__ for m in (rtp_mod, rcp_mod, mem_mod, rhps_mod, rtps_mod, dc_mod)]
+
     def properties(self) -> Dict[CaseProperty, object]:
         return {
             CaseProperty.NUM_TASK: self._num_apps,
@@ -0,0 +1,130 @@
+import numpy as np
+from typing import Dict, Iterator
+from AIIntuition.journeys.journey5.cputype import CPUType
+from AIIntuition.journeys.journey5.core import Core
+from AIIntuition.journeys.journey5.memory import Memory
+from AIIntuition.journeys.journey5.computeprofile import ComputeProfile
+from AIIntuition.journeys.journey5.fixedcoreprofile import FixedCoreProfile
+from AIIntuition.journeys.journey5.randomcoreprofile import RandomCoreProfile
+
+
+class RandomHostProfiles:
+    """
+    A batch of random Host Profiles drawn from the same probability distributions as RandomHostProfile (i.e.
+    RandomCoreProfile & Memory). Each property is drawn for the whole batch in a handful of vectorised calls and held
+    as a column (array), individual profiles are exposed as views that satisfy the ComputeProfile interface.
+    """
+
+    class View(ComputeProfile):
+        """
+        A single Host Profile backed by a row of the batch columns.
+        """
+
+        def __init__(self,
+                     profiles: 'RandomHostProfiles',
+                     idx: int):
+            self._profiles = profiles
+            self._idx = idx
+
+        @property
+        def core(self) -> Core:
+            return Core(FixedCoreProfile(core_type=CPUType.from_ordinal(int(self._profiles.core_types[self._idx])),
+                                         core_count=int(self._profiles.core_counts[self._idx])))
+
+        @property
+        def mem(self) -> Memory:
+            return Memory(mem=int(self._profiles.mem_sizes[self._idx]))
+
+    def __init__(self,
+                 num_hosts: int,
+                 rng: np.random.RandomState = None):
+        """
+        Draw a batch of random host profiles
+        :param num_hosts: The number of host profiles to draw
+        :param rng: Optional random state to draw from, if not given the global numpy random state is used.
+        """
+        rnd = np.random if rng is None else rng
+
+        self._core_type = rnd.choice(len(CPUType), size=num_hosts, p=RandomCoreProfile._p_dist_core_types)
+        self._core_count = np.zeros(num_hosts, dtype=np.int64)
+        self._mem_size = np.zeros(num_hosts, dtype=np.int64)
+        for core_type in CPUType.cpu_types():
+            of_type = self._core_type == core_type.ordinal
+            num_of_type = int(np.count_nonzero(of_type))
+            if num_of_type > 0:
+                _nc, _p_dist = RandomCoreProfile._p_dist_type[core_type]
+                self._core_count[of_type] = np.asarray(_nc)[rnd.choice(len(_nc), size=num_of_type, p=_p_dist)]
+                _mem_options, _p_dist = Memory._p_dist_type[core_type]
+                self._mem_size[of_type] = np.asarray(_mem_options)[rnd.choice(len(_mem_options),
+                                                                              size=num_of_type,
+                                                                              p=_p_dist)]
+        return
+
+    @classmethod
+    def from_arrays(cls,
+                    arrays: Dict[str, np.ndarray]) -> 'RandomHostProfiles':
+        """
+        Re-create a batch of host profiles from the columns given by as_arrays()
+        :param arrays: The columns of the batch keyed by column name
+        :return: The batch of host profiles
+        """
+        profiles = cls.__new__(cls)
+        profiles._core_type = np.asarray(arrays['host_core_type'])
+        profiles._core_count = np.asarray(arrays['host_core_count'])
+        profiles._mem_size = np.asarray(arrays['host_mem_size'])
+        return profiles
+
+    def as_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        The columns of the batch keyed by column name, as accepted by from_arrays()
+        """
+        return {'host_core_type': self._core_type,
+                'host_core_count': self._core_count,
+                'host_mem_size': self._mem_size}
+
+    def __len__(self) -> int:
+        return len(self._core_type)
+
+    def __getitem__(self,
+                    idx: int) -> ComputeProfile:
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError('Host profile index: ' + str(idx) + ' out of range')
+        return RandomHostProfiles.View(self, idx)
+
+    def __iter__(self) -> Iterator[ComputeProfile]:
+        for idx in range(0, len(self)):
+            yield RandomHostProfiles.View(self, idx)
+
+    @property
+    def core_types(self) -> np.ndarray:
+        """
+        The CPUType.ordinal of the Core of each Host
+        """
+        return self._core_type
+
+    @property
+    def core_counts(self) -> np.ndarray:
+        """
+        The number of cores of each Host
+        """
+        return self._core_count
+
+    @property
+    def mem_sizes(self) -> np.ndarray:
+        """
+        The memory size of each Host
+        """
+        return self._mem_size
+
+
+if __name__ == "__main__":
+    from datetime import datetime
+
+    start = datetime.now()
+    rhps = RandomHostProfiles(100000)
+    print('Drew ' + str(len(rhps)) + ' host profiles in: ' + str(datetime.now() - start))
+    for i in range(0, 5):
+        hp = rhps[i]
+        print(hp.core, hp.mem.size)
@@ -1,4 +1,5 @@
 import random
+import numpy as np
 from AIIntuition.journeys.journey5.compute import Compute
 from AIIntuition.journeys.journey5.policy import Policy
 from AIIntuition.journeys.journey5.task import Task
@@ -6,15 +7,25 @@ from AIIntuition.journeys.journey5.task import Task
 
 class RandomPolicy(Policy):
 
-    def __init__(self):
+    def __init__(self,
+                 rng: np.random.RandomState = None):
+        """
+        :param rng: Optional random state to pick computes from, by default the global (python) random state
+        """
+        self._rng = rng
         self._computes = None
+        self._generation = None
 
     def select_optimal_compute(self, task: Task) -> Compute:
         """
         In this implemention a random compute is selected from all the available computes
         :return: The Compute to associated the task with
         """
-        if self._computes is None:
+        if self._computes is None or self._generation != Compute.generation():
             self._computes = Compute.all_compute_ids()
-        rand_compute_id = random.randint(0, len(self._computes) - 1)
+            self._generation = Compute.generation()
+        if self._rng is None:
+            rand_compute_id = random.randint(0, len(self._computes) - 1)
+        else:
+            rand_compute_id = self._rng.randint(0, len(self._computes))
         return Compute.get_by_id(self._computes[rand_compute_id])
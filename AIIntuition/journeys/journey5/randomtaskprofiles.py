@@ -0,0 +1,189 @@
+import numpy as np
+from typing import Dict, List, Iterator
+from AIIntuition.journeys.journey5.cputype import CPUType
+from AIIntuition.journeys.journey5.task import Task
+from AIIntuition.journeys.journey5.taskprofile import TaskProfile
+from AIIntuition.journeys.journey5.randomtaskprofile import RandomTaskProfile
+
+
+class RandomTaskProfiles:
+    """
+    A batch of random Task Profiles drawn from the same probability distributions as RandomTaskProfile. Each
+    property is drawn for the whole batch in a single vectorised call and held as a column (array), individual
+    profiles are exposed as views that satisfy the TaskProfile interface.
+    """
+
+    class View(TaskProfile):
+        """
+        A single Task Profile backed by a row of the batch columns.
+        """
+
+        def __init__(self,
+                     profiles: 'RandomTaskProfiles',
+                     idx: int):
+            self._profiles = profiles
+            self._idx = idx
+
+        @property
+        def max_mem(self) -> int:
+            return int(self._profiles.max_mems[self._idx])
+
+        @property
+        def mem_volatility(self) -> float:
+            return float(self._profiles.mem_volatilities[self._idx])
+
+        @property
+        def cpu_type(self) -> CPUType:
+            return CPUType.from_ordinal(int(self._profiles.cpu_types[self._idx]))
+
+        @property
+        def task_load(self) -> int:
+            return int(self._profiles.task_loads[self._idx])
+
+        @property
+        def load_profile(self) -> Task.LoadProfile:
+            return self._profiles.load_profile_types[int(self._profiles.load_profiles[self._idx])]
+
+        @property
+        def load_shape(self) -> List[float]:
+            return self._profiles.load_shapes[int(self._profiles.load_profiles[self._idx])].tolist()
+
+        @property
+        def run_time(self) -> int:
+            return int(self._profiles.run_times[self._idx])
+
+    def __init__(self,
+                 num_tasks: int,
+                 rng: np.random.RandomState = None):
+        """
+        Draw a batch of random task profiles
+        :param num_tasks: The number of task profiles to draw
+        :param rng: Optional random state to draw from, if not given the global numpy random state is used.
+        """
+        rnd = np.random if rng is None else rng
+        memory_asks = np.asarray(RandomTaskProfile._memory_asks)
+
+        self._max_mem = memory_asks[rnd.choice(len(memory_asks),
+                                               size=num_tasks,
+                                               p=RandomTaskProfile._psidt_memory_demand)]
+        self._mem_vol = rnd.uniform(0, 0.1, size=num_tasks)
+        self._cpu_type = rnd.choice(len(CPUType), size=num_tasks, p=RandomTaskProfile._pdist_compute_core_demand)
+        self._load_profile = rnd.choice(len(Task.LoadProfile), size=num_tasks, p=RandomTaskProfile._pdist_loads)
+        self._run_time = np.ceil(rnd.uniform(0.0, 72.0, size=num_tasks)).astype(np.int64)
+        self._load = rnd.choice(10, size=num_tasks)
+
+        self._load_profile_types = list(Task.LoadProfile)
+        self._load_shapes = Task.load_shape_matrix()
+        return
+
+    @classmethod
+    def from_arrays(cls,
+                    arrays: Dict[str, np.ndarray]) -> 'RandomTaskProfiles':
+        """
+        Re-create a batch of task profiles from the columns given by as_arrays()
+        :param arrays: The columns of the batch keyed by column name
+        :return: The batch of task profiles
+        """
+        profiles = cls.__new__(cls)
+        profiles._max_mem = np.asarray(arrays['task_max_mem'])
+        profiles._mem_vol = np.asarray(arrays['task_mem_vol'])
+        profiles._cpu_type = np.asarray(arrays['task_cpu_type'])
+        profiles._load_profile = np.asarray(arrays['task_load_profile'])
+        profiles._run_time = np.asarray(arrays['task_run_time'])
+        profiles._load = np.asarray(arrays['task_load'])
+        profiles._load_profile_types = list(Task.LoadProfile)
+        profiles._load_shapes = Task.load_shape_matrix()
+        return profiles
+
+    def as_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        The columns of the batch keyed by column name, as accepted by from_arrays()
+        """
+        return {'task_max_mem': self._max_mem,
+                'task_mem_vol': self._mem_vol,
+                'task_cpu_type': self._cpu_type,
+                'task_load_profile': self._load_profile,
+                'task_run_time': self._run_time,
+                'task_load': self._load}
+
+    def __len__(self) -> int:
+        return len(self._max_mem)
+
+    def __getitem__(self,
+                    idx: int) -> TaskProfile:
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError('Task profile index: ' + str(idx) + ' out of range')
+        return RandomTaskProfiles.View(self, idx)
+
+    def __iter__(self) -> Iterator[TaskProfile]:
+        for idx in range(0, len(self)):
+            yield RandomTaskProfiles.View(self, idx)
+
+    @property
+    def max_mems(self) -> np.ndarray:
+        """
+        The maximum Memory required by each Task
+        """
+        return self._max_mem
+
+    @property
+    def mem_volatilities(self) -> np.ndarray:
+        """
+        The memory volatility of each Task
+        """
+        return self._mem_vol
+
+    @property
+    def cpu_types(self) -> np.ndarray:
+        """
+        The CPUType.ordinal (ideally) required by each Task
+        """
+        return self._cpu_type
+
+    @property
+    def task_loads(self) -> np.ndarray:
+        """
+        The load factor each Task places on the compute
+        """
+        return self._load
+
+    @property
+    def load_profiles(self) -> np.ndarray:
+        """
+        The Task.LoadProfile.ordinal of each Task
+        """
+        return self._load_profile
+
+    @property
+    def run_times(self) -> np.ndarray:
+        """
+        The runtime in hours (elapsed) of each Task
+        """
+        return self._run_time
+
+    @property
+    def load_profile_types(self) -> List[Task.LoadProfile]:
+        """
+        The Load Profiles in ordinal order
+        """
+        return self._load_profile_types
+
+    @property
+    def load_shapes(self) -> np.ndarray:
+        """
+        The load shapes as returned by Task.load_shape_matrix()
+        """
+        return self._load_shapes
+
+
+if __name__ == "__main__":
+    from datetime import datetime
+
+    start = datetime.now()
+    rtps = RandomTaskProfiles(1000000)
+    print('Drew ' + str(len(rtps)) + ' task profiles in: ' + str(datetime.now() - start))
+    for i in range(0, 5):
+        tp = rtps[i]
+        print(tp.cpu_type, tp.max_mem, tp.mem_volatility, tp.task_load, tp.load_profile, tp.run_time)
@@ -0,0 +1,142 @@
+from typing import Dict, List, Tuple
+from AIIntuition.journeys.journey5.core import Core
+from AIIntuition.journeys.journey5.host import Host
+from AIIntuition.journeys.journey5.task import Task
+from AIIntuition.journeys.journey5.systemtime import SystemTime
+
+"""
+Proactively move tasks off hosts that are close to their memory or compute limit.
+"""
+
+
+class Rebalancer:
+    """
+    Before each hour of the schedule, every host at or above the memory or compute threshold migrates its largest
+    task (by current memory) to the least utilised host that can take the task at its max memory & load without
+    itself crossing the thresholds. The migrated task keeps its progress, the task is charged the migration cost.
+
+    Migrating before the host runs out of memory avoids the OutOfMemoryException, which resets the task and
+    throws away all the run time it has completed.
+    """
+
+    def __init__(self,
+                 mem_threshold: float = 0.9,
+                 compute_threshold: float = 0.9,
+                 migration_cost: float = 1.0):
+        """
+        :param mem_threshold: Fraction of max memory at or above which a host is rebalanced
+        :param compute_threshold: Fraction of max compute at or above which a host is rebalanced
+        :param migration_cost: The cost booked to a task each time it is migrated
+        """
+        if not 0.0 < mem_threshold <= 1.0 or not 0.0 < compute_threshold <= 1.0:
+            raise ValueError('Rebalance thresholds must be in range 0.0 to 1.0, given: ' +
+                             str(mem_threshold) + ', ' + str(compute_threshold))
+        if migration_cost < 0:
+            raise ValueError('Migration cost must be >= 0, given: ' + str(migration_cost))
+        self._mem_threshold = mem_threshold
+        self._compute_threshold = compute_threshold
+        self._migration_cost = migration_cost
+        self._num_migrations = 0
+
+    @property
+    def num_migrations(self) -> int:
+        """
+        The number of tasks migrated by this rebalancer
+        """
+        return self._num_migrations
+
+    def rebalance(self,
+                  sys_time: SystemTime) -> int:
+        """
+        Migrate at most one task off each host that is at or above the memory or compute threshold
+        :param sys_time: The current system time.
+        :return: The number of tasks migrated
+        """
+        hosts = Host.all_hosts()
+        migrated = 0
+        for hst in hosts:
+            if not self._over_threshold(hst):
+                continue
+            task = hst.migration_candidate()
+            if task is None:
+                continue
+            target = self.select_target(hosts, hst, task)
+            if target is None:
+                continue
+            hst.migrate_task(sys_time, task, target, self._migration_cost)
+            migrated += 1
+        self._num_migrations += migrated
+        return migrated
+
+    def _over_threshold(self,
+                        hst: Host) -> bool:
+        """
+        Is the given host at or above the memory or compute threshold
+        """
+        return hst.current_memory >= self._mem_threshold * hst.max_memory or \
+            hst.current_compute >= self._compute_threshold * hst.max_compute
+
+    def select_target(self,
+                      hosts: List[Host],
+                      source: Host,
+                      task: Task,
+                      reserved: Dict[str, Tuple[float, float]] = None) -> Host:
+        """
+        The least memory utilised host, other than the source, that can take the task at its maximum demand and stay
+        below the thresholds.
+        :param hosts: The candidate hosts
+        :param source: The host the task is migrating from
+        :param task: The task to place
+        :param reserved: Optional host id : (memory, compute) already planned onto the host & not yet migrated
+        :return: The target host or None if no host can take the task
+        """
+        target = None
+        target_util = None
+        for hst in hosts:
+            if hst.id == source.id:
+                continue
+            reserved_mem, reserved_compute = (reserved or {}).get(hst.id, (0, 0.0))
+            mem = hst.current_memory + reserved_mem + task.max_mem
+            if mem >= self._mem_threshold * hst.max_memory:
+                continue
+            if hst.current_compute + reserved_compute + self.__compute_demand(task, hst) >= \
+                    self._compute_threshold * hst.max_compute:
+                continue
+            util = mem / hst.max_memory
+            if target_util is None or util < target_util:
+                target, target_util = hst, util
+        return target
+
+    def select_targets(self,
+                       hosts: List[Host],
+                       source: Host,
+                       tasks: List[Task]) -> List[Host]:
+        """
+        A target for every one of the given tasks, as select_target but each pick allows for the demand of the tasks
+        already planned onto the target, so the tasks can all be migrated together.
+        :param hosts: The candidate hosts
+        :param source: The host the tasks are migrating from
+        :param tasks: The tasks to place
+        :return: The target host of each task, in task order, or None if any task cannot be placed
+        """
+        reserved = {}
+        targets = []
+        for task in tasks:
+            target = self.select_target(hosts, source, task, reserved)
+            if target is None:
+                return None
+            reserved_mem, reserved_compute = reserved.get(target.id, (0, 0.0))
+            reserved[target.id] = (reserved_mem + task.max_mem,
+                                   reserved_compute + self.__compute_demand(task, target))
+            targets.append(target)
+        return targets
+
+    @classmethod
+    def __compute_demand(cls,
+                         task: Task,
+                         hst: Host) -> float:
+        """
+        The compute the task demands when run on the given host's core type
+        """
+        ef = Core.core_compute_equivalency(required_core_type=task.core_type, given_core_type=hst.type)
+        return task.load_factor / ef
@@ -0,0 +1,89 @@
+import heapq
+from typing import List
+from AIIntuition.journeys.journey5.task import Task
+from AIIntuition.journeys.journey5.systemtime import SystemTime
+
+"""
+Failed tasks waiting to be placed again.
+"""
+
+
+class RetryQueue:
+    """
+    Tasks that have failed wait here until they are due to be placed again, the delay grows exponentially with the
+    number of times the task has failed. Due tasks are taken as a batch at the hour boundary, in the order they
+    failed, so the placement policy sees the capacity of the fleet as at the start of the hour and can place the
+    whole batch at once.
+
+    Once a task has been placed again and has run for max_delay hours (at least one) without failing again, or has
+    finished, its failures are forgotten so the count of failures held does not grow over the run.
+    """
+
+    def __init__(self,
+                 base_delay: int = 0,
+                 backoff: float = 2.0,
+                 max_delay: int = 24):
+        """
+        :param base_delay: The hours to wait, after the next hour boundary, before the first retry of a task
+        :param backoff: The multiple by which the delay grows on each further failure of the same task
+        :param max_delay: The maximum delay in hours
+        """
+        if base_delay < 0 or max_delay < 0 or backoff < 1.0:
+            raise ValueError('Retry delays must be >= 0 and backoff >= 1.0, given: ' +
+                             str(base_delay) + ', ' + str(backoff) + ', ' + str(max_delay))
+        self._base_delay = base_delay
+        self._backoff = backoff
+        self._max_delay = max_delay
+        self._queue = []  # Heap of (due hour, sequence, task)
+        self._seq = 0
+        self._attempts = {}  # Task Id : (number of failures, hour after which the failures are forgotten)
+        self._forget = []  # Heap of (hour after which the failures are forgotten, Task Id)
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def attempts(self,
+                 task: Task) -> int:
+        """
+        The number of times the given task has been queued for retry
+        """
+        return self._attempts.get(task.id, (0, None))[0]
+
+    def push(self,
+             sys_time: SystemTime,
+             task: Task) -> int:
+        """
+        Queue a failed task for retry
+        :param sys_time: The system time of the failure
+        :param task: The failed task
+        :return: The absolute hour (SystemTime.hours) at which the task is due to be placed again.
+        """
+        attempts = self.attempts(task)
+        if self._base_delay == 0:
+            delay = 0
+        else:
+            delay = min(self._max_delay, int(round(self._base_delay * (self._backoff ** attempts))))
+        due = sys_time.hours + 1 + delay
+        heapq.heappush(self._queue, (due, self._seq, task))
+        self._seq += 1
+        forget = due + max(1, self._max_delay)
+        self._attempts[task.id] = (attempts + 1, forget)
+        heapq.heappush(self._forget, (forget, task.id))
+        return due
+
+    def due(self,
+            sys_time: SystemTime) -> List[Task]:
+        """
+        Take all tasks that are due to be placed by the given time
+        :param sys_time: The current system time, at the hour boundary
+        :return: The due tasks in the order they were queued
+        """
+        now = sys_time.hours
+        due_tasks = []
+        while len(self._queue) > 0 and self._queue[0][0] <= now:
+            due_tasks.append(heapq.heappop(self._queue)[2])
+        while len(self._forget) > 0 and self._forget[0][0] <= now:
+            forget, task_id = heapq.heappop(self._forget)
+            if self._attempts.get(task_id, (0, None))[1] == forget:  # Not failed again since
+                del self._attempts[task_id]
+        return due_tasks
@@ -1,5 +1,7 @@
+from typing import Callable
 from AIIntuition.journeys.journey5.compute import Compute
 from AIIntuition.journeys.journey5.host import Host
+from AIIntuition.journeys.journey5.app import App
 from AIIntuition.journeys.journey5.OutOfMemoryException import OutOfMemoryException
 from AIIntuition.journeys.journey5.FailedToCompleteException import FailedToCompleteException
 from AIIntuition.journeys.journey5.log import Log
@@ -7,6 +9,16 @@ from AIIntuition.journeys.journey5.event import SchedulerEvent, HostEvent, TaskE
 from AIIntuition.journeys.journey5.case import Case
 from AIIntuition.journeys.journey5.testcasesetup import TestCaseSetUp
 from AIIntuition.journeys.journey5.systemtime import SystemTime
+from AIIntuition.journeys.journey5.fleetmetrics import FleetMetrics
+from AIIntuition.journeys.journey5.eventfilter import EventFilter
+from AIIntuition.journeys.journey5.rebalancer import Rebalancer
+from AIIntuition.journeys.journey5.taskorder import TaskOrder
+from AIIntuition.journeys.journey5.retryqueue import RetryQueue
+from AIIntuition.journeys.journey5.autoscaler import Autoscaler
+from AIIntuition.journeys.journey5.traceworkload import TraceWorkload
+from AIIntuition.journeys.journey5.memoryreport import MemoryReport
+from AIIntuition.journeys.journey5.goldentrace import GoldenTrace
+from AIIntuition.journeys.journey5.infrnditer import InfRndIter
 
 
 class Scheduler:
@@ -15,10 +27,50 @@ class Scheduler:
     _start_day = 0
 
     def __init__(self,
-                 test_case: Case):
+                 test_case: Case,
+                 full_status: bool = False,
+                 rebalancer: Rebalancer = None,
+                 log_first_execution_only: bool = False,
+                 task_order: Callable[[], TaskOrder] = None,
+                 retry_queue: RetryQueue = None,
+                 autoscaler: Autoscaler = None,
+                 workload: TraceWorkload = None,
+                 memory_report: MemoryReport = None,
+                 golden_trace: GoldenTrace = None,
+                 demand_history: bool = False):
         """
         Instantiate a chosen schedule test case that sets up a schedule environment
+        :param test_case: The test case to set-up and run
+        :param full_status: If True log the status of every host and task at the end of each day in addition to the
+        daily fleet metrics summary.
+        :param rebalancer: If given, migrate tasks off hosts near their memory or compute limit before each hour.
+        :param log_first_execution_only: If True the executions of tasks whose demand is constant from hour to hour are
+        logged only once a day rather than every hour, to cut the size of the log. The tasks are run exactly as if
+        False, only the EXECUTE events (and their feature rows) are dropped.
+        :param task_order: Optional factory of the TaskOrder each host uses to order its tasks each hour e.g.
+        DeadlineTaskOrder, if not given hosts keep the order they were created with.
+        :param retry_queue: The queue failed tasks wait in to be placed again, by default tasks are placed again at
+        the next hour boundary with no backoff.
+        :param autoscaler: If given, add & retire hosts at each hour boundary to keep data center utilisation in band.
+        :param workload: If given, tasks submitted in the trace are created & placed as their arrival hour is reached,
+        in addition to the tasks created by the test case.
+        :param memory_report: If given, sample memory use by entity type at the start of each day and at the end of
+        the run, when the growth report is written.
+        :param golden_trace: If given, record host memory & compute at the end of each hour and task cost, deficit,
+        run time & failures at the end of each day into the trace.
+        :param demand_history: If True every App records its hourly demand history & forecast while this scheduler
+        runs, see App.demand_history. Apps are global so the setting is applied (for all Apps) when run() is called.
         """
+        self._demand_history = demand_history
+        self._golden_trace = golden_trace
+        self._memory_report = memory_report
+        self._workload = workload
+        self._autoscaler = autoscaler
+        self._task_order = task_order
+        self._retry_queue = RetryQueue() if retry_queue is None else retry_queue
+        self._log_first_execution_only = log_first_execution_only
+        self._full_status = full_status
+        self._rebalancer = rebalancer
         self._num_hosts = None
         self._num_apps = None
         self._policy = None
@@ -27,41 +79,118 @@ class Scheduler:
         self._num_hosts, self._num_apps, self._policy, self._compute_iter, self._num_run_days = \
             test_case.set_up()
 
+        if task_order is not None:
+            for h in Host.all_hosts():
+                h.set_task_order(task_order())
+
     def run(self) -> None:
         """
         Run the test case given
         """
+        App.record_demand_history(self._demand_history)
         st = SystemTime(self._start_day, self._start_hour)
-        Log.log_event(st, SchedulerEvent(st, SchedulerEvent.SchedulerEventType.START))
+        if EventFilter.accept(SchedulerEvent, SchedulerEvent.SchedulerEventType.START):
+            Log.log_event(st, SchedulerEvent(st, SchedulerEvent.SchedulerEventType.START))
 
         for day in range(0, self._num_run_days):
             st = SystemTime(day, self._start_hour)
-            Log.log_event(st, SchedulerEvent(st, SchedulerEvent.SchedulerEventType.NEW_DAY))
+            if EventFilter.accept(SchedulerEvent, SchedulerEvent.SchedulerEventType.NEW_DAY):
+                Log.log_event(st, SchedulerEvent(st, SchedulerEvent.SchedulerEventType.NEW_DAY))
+            if self._memory_report is not None:
+                self._memory_report.sample(st)
             for gmt_hour_of_day in range(self._start_hour, self._end_hour):
                 sys_time = SystemTime(day, gmt_hour_of_day)
+                self._reschedule(sys_time)
+                if self._workload is not None:
+                    self._admit(sys_time)
+                if self._rebalancer is not None:
+                    self._rebalancer.rebalance(sys_time)
+                if self._autoscaler is not None:
+                    self._autoscale(sys_time)
                 for c in range(0, self._num_hosts):
                     hst = self.next_compute()
                     for i in range(0, hst.num_associated_task):
                         try:
-                            hst.run_next_task(sys_time=sys_time)
+                            hst.run_next_task(sys_time=sys_time,
+                                              log_first_execution_only=self._log_first_execution_only)
                         except (OutOfMemoryException, FailedToCompleteException) as e:
-                            Log.log_event(sys_time, FailureEvent(sys_time, exception=e, compute=e.compute, task=e.task))
-                            self._policy.select_optimal_compute(e.task).associate_task(sys_time, e.task)  # re schedule
+                            if EventFilter.accept(FailureEvent, e.__class__, e.compute, e.task):
+                                Log.log_event(sys_time,
+                                              FailureEvent(sys_time, exception=e, compute=e.compute, task=e.task))
+                            if self._golden_trace is not None:
+                                self._golden_trace.record_failure(e.task)
+                            self._retry_queue.push(sys_time, e.task)  # re schedule at a later hour boundary
+                if self._golden_trace is not None:
+                    self._golden_trace.record_hour(sys_time)
+            if self._golden_trace is not None:
+                self._golden_trace.record_day(st)
             self._log_host_and_task_status(st)
         st = SystemTime(self._num_run_days + 1, 0)
-        Log.log_event(st, SchedulerEvent(st, SchedulerEvent.SchedulerEventType.COMPLETE))
+        if EventFilter.accept(SchedulerEvent, SchedulerEvent.SchedulerEventType.COMPLETE):
+            Log.log_event(st, SchedulerEvent(st, SchedulerEvent.SchedulerEventType.COMPLETE))
+        if self._memory_report is not None:
+            self._memory_report.sample(st)
+            self._memory_report.close()
+        return
+
+    def _reschedule(self,
+                    sys_time: SystemTime) -> None:
+        """
+        Place all failed tasks that are due for retry, as a single batch
+        :param sys_time: The current system time, at the hour boundary
+        """
+        due = self._retry_queue.due(sys_time)
+        if len(due) > 0:
+            for task, compute in zip(due, self._policy.select_optimal_computes(due)):
+                compute.associate_task(sys_time, task)
+        return
+
+    def _admit(self,
+               sys_time: SystemTime) -> None:
+        """
+        Place all tasks that arrive in the workload trace by the current time, as a single batch
+        :param sys_time: The current system time, at the hour boundary
+        """
+        arrivals = self._workload.arrivals(sys_time)
+        if len(arrivals) > 0:
+            for task, compute in zip(arrivals, self._policy.select_optimal_computes(arrivals)):
+                compute.associate_task(sys_time, task)
+            self._num_apps += len(arrivals)
+        return
+
+    def _autoscale(self,
+                   sys_time: SystemTime) -> None:
+        """
+        Let the autoscaler add or retire hosts and, if the fleet changed, iterate over the new fleet from now on.
+        :param sys_time: The current system time, at the hour boundary
+        """
+        existing = set(Compute.all_compute_ids())
+        added, retired = self._autoscaler.scale(sys_time)
+        if added == 0 and retired == 0:
+            return
+        hosts = Host.all_hosts()
+        if self._task_order is not None:
+            for h in hosts:
+                if h.id not in existing:
+                    h.set_task_order(self._task_order())
+        self._num_hosts = len(hosts)
+        self._compute_iter = InfRndIter(hosts)
         return
 
-    @staticmethod
-    def _log_host_and_task_status(sys_time: SystemTime) -> None:
+    def _log_host_and_task_status(self,
+                                  sys_time: SystemTime) -> None:
         """
-        Log the current state of all hosts and all of their tasks
+        Log the daily fleet metrics summary and, if full status is enabled, the current state of all hosts and
+        all of their tasks
         :param sys_time: The current system time.
-        :param day: The current scheduler day
         """
+        FleetMetrics.publish(sys_time)
+        if not self._full_status:
+            return
         for h in Host.all_hosts():
-            Log.log_event(sys_time, HostEvent(sys_time, HostEvent.HostEventType.STATUS, h))
-            for t in h.all_tasks():
+            if EventFilter.accept(HostEvent, HostEvent.HostEventType.STATUS, h):
+                Log.log_event(sys_time, HostEvent(sys_time, HostEvent.HostEventType.STATUS, h))
+            for t in h.all_tasks(lambda tsk: EventFilter.accept(TaskEvent, TaskEvent.TaskEventType.STATUS, tsk)):
                 Log.log_event(sys_time, TaskEvent(sys_time, TaskEvent.TaskEventType.STATUS, t))
 
     def next_compute(self) -> Compute:
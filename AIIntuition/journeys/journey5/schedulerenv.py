@@ -0,0 +1,337 @@
+from typing import Dict, Tuple
+import numpy as np
+from AIIntuition.journeys.journey5.core import Core
+from AIIntuition.journeys.journey5.task import Task
+from AIIntuition.journeys.journey5.datacenter import DataCenter
+from AIIntuition.journeys.journey5.randomhostprofiles import RandomHostProfiles
+from AIIntuition.journeys.journey5.randomtaskprofiles import RandomTaskProfiles
+
+"""
+Gym style (reset / step) environment for training a learned scheduling policy.
+"""
+
+
+class SchedulerEnv:
+    """
+    Run N independent scheduling simulations in lockstep, where each step is one simulated hour.
+
+    The Host & App objects (and their class level registries) can only support a single simulation per process,
+    so the environment holds the state of all N simulations as arrays and applies the same hourly rules as
+    Host.run_next_task & App for every task of every simulation in a handful of vectorised operations:
+
+        - A task whose run time is used up completes if it has no compute deficit, else it fails
+        - Tasks run in random order on their host, a task fails if the memory of the tasks before it on the host plus
+          its own demand exceeds the host memory.
+        - Compute is given to tasks in the same order, the shortfall against (core equivalency adjusted) demand is
+          the task compute deficit & is added to the demand of the next hour.
+        - The compute used is charged at Data Center compute cost * Core cost
+
+    A failed task is reset & returns to pending, a completed task is replaced by a newly drawn pending task so the
+    number of tasks per simulation is constant.
+
+    Observation : dict of float32 arrays 'hosts' (N, H, len(HOST_FEATURES)), 'tasks' (N, T, len(TASK_FEATURES))
+                  and bool array 'pending' (N, T)
+    Action      : int array (N, T) the host index (0 to H-1) to place each pending task on, -1 (or the action for
+                  a task that is not pending) is ignored and the task stays as is.
+    Reward      : (N,) - (cost incurred in the step + failure_penalty * number of failures in the step)
+    """
+
+    HOST_FEATURES = ['Core Type', 'Cores', 'Mem', 'Mem Util', 'Comp Util', 'Compute Cost', 'Local Hour',
+                     'Num Tasks']
+    TASK_FEATURES = ['Core Type', 'Load Factor', 'Max Mem', 'Profile', 'Run Time', 'Time Left', 'Deficit', 'Host']
+
+    __hours_per_day = 24
+
+    def __init__(self,
+                 num_envs: int,
+                 num_hosts: int,
+                 num_tasks: int,
+                 num_run_days: int = 10,
+                 failure_penalty: float = 10.0,
+                 seed: int = None):
+        """
+        :param num_envs: The number (N) of independent simulations
+        :param num_hosts: The number (H) of hosts in each simulation
+        :param num_tasks: The number (T) of tasks in each simulation
+        :param num_run_days: The number of 24 hour periods in an episode
+        :param failure_penalty: The reward penalty for each task failure
+        :param seed: Optional seed of the environments random state
+        """
+        self._num_envs = num_envs
+        self._num_hosts = num_hosts
+        self._num_tasks = num_tasks
+        self._horizon = num_run_days * self.__hours_per_day
+        self._failure_penalty = failure_penalty
+        self._rng = np.random.RandomState(seed)
+
+        dcs = [DataCenter(country_code) for country_code in DataCenter.country_codes()]
+        self._dc_cost = np.array([dc.compute_cost for dc in dcs])
+        self._dc_offset = np.array([dc.hour_offset for dc in dcs])
+        self._dc_p_dist = np.array([dc.host_probability for dc in dcs])
+        self._dc_p_dist /= self._dc_p_dist.sum()
+        self._load_shapes = Task.load_shape_matrix()
+
+        self._hour = None
+        self._host_core = None
+        self._host_cores = None
+        self._host_mem = None
+        self._host_cost = None
+        self._host_offset = None
+        self._host_curr_mem = None
+        self._host_curr_comp = None
+
+        self._task_core = None
+        self._task_load = None
+        self._task_max_mem = None
+        self._task_mem_vol = None
+        self._task_profile = None
+        self._task_run_time = None
+        self._task_time_left = None
+        self._task_deficit = None
+        self._task_host = None
+        return
+
+    @property
+    def num_envs(self) -> int:
+        return self._num_envs
+
+    @property
+    def num_hosts(self) -> int:
+        return self._num_hosts
+
+    @property
+    def num_tasks(self) -> int:
+        return self._num_tasks
+
+    def reset(self) -> Dict[str, np.ndarray]:
+        """
+        Draw a new random fleet & workload for every simulation, all tasks start pending.
+        :return: The initial observation
+        """
+        n, h, t = self._num_envs, self._num_hosts, self._num_tasks
+        self._hour = 0
+
+        rhps = RandomHostProfiles(n * h, self._rng)
+        self._host_core = rhps.core_types.reshape(n, h)
+        self._host_cores = rhps.core_counts.reshape(n, h).astype(np.float64)
+        self._host_mem = rhps.mem_sizes.reshape(n, h).astype(np.float64)
+        host_dc = self._rng.choice(len(self._dc_cost), size=(n, h), p=self._dc_p_dist)
+        self._host_cost = self._dc_cost[host_dc] * Core.core_costs(self._host_core)
+        self._host_offset = self._dc_offset[host_dc]
+        self._host_curr_mem = np.zeros((n, h))
+        self._host_curr_comp = np.zeros((n, h))
+
+        self._task_core = np.zeros((n, t), dtype=np.int64)
+        self._task_load = np.zeros((n, t))
+        self._task_max_mem = np.zeros((n, t))
+        self._task_mem_vol = np.zeros((n, t))
+        self._task_profile = np.zeros((n, t), dtype=np.int64)
+        self._task_run_time = np.zeros((n, t), dtype=np.int64)
+        self._task_time_left = np.zeros((n, t), dtype=np.int64)
+        self._task_deficit = np.zeros((n, t))
+        self._task_host = np.zeros((n, t), dtype=np.int64)
+        self._new_tasks(np.ones((n, t), dtype=bool))
+
+        return self.observation()
+
+    def step(self,
+             action: np.ndarray) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Place the pending tasks as given by the action and then run one hour of every simulation.
+        :param action: int array (N, T) of host index per task, only applied to pending tasks.
+        :return: observation, reward (N,), done (N,), info dict of (N,) arrays 'cost', 'failures' and 'completed'
+        """
+        if self._hour is None:
+            raise RuntimeError(self.__class__.__name__ + ' must be reset before it is stepped')
+
+        action = np.asarray(action)
+        place = (self._task_host < 0) & (action >= 0) & (action < self._num_hosts)
+        self._task_host[place] = action[place]
+
+        running = self._task_host >= 0
+        done = running & (self._task_time_left == 0)
+        failed = done & (self._task_deficit > 0)
+        completed = done & ~failed
+        running &= ~done
+
+        oom, step_cost = self._run_hour(running)
+        failed |= oom
+
+        env_failures = failed.sum(axis=1)
+        env_completed = completed.sum(axis=1)
+        self._reset_tasks(failed)
+        self._new_tasks(completed)
+
+        self._hour += 1
+        reward = -(step_cost + self._failure_penalty * env_failures)
+        episode_done = np.full(self._num_envs, self._hour >= self._horizon)
+        info = {'cost': step_cost, 'failures': env_failures, 'completed': env_completed}
+        return self.observation(), reward, episode_done, info
+
+    def random_action(self) -> np.ndarray:
+        """
+        An action that places every task on a host chosen at random
+        :return: int array (N, T) of host index per task
+        """
+        return self._rng.randint(0, self._num_hosts, size=(self._num_envs, self._num_tasks))
+
+    def observation(self) -> Dict[str, np.ndarray]:
+        """
+        The current host & task features of every simulation
+        :return: dict of 'hosts' (N, H, len(HOST_FEATURES)), 'tasks' (N, T, len(TASK_FEATURES)) & 'pending' (N, T)
+        """
+        env_idx, task_idx = np.nonzero(self._task_host >= 0)
+        num_tasks_on_host = np.bincount(env_idx * self._num_hosts + self._task_host[env_idx, task_idx],
+                                        minlength=self._num_envs * self._num_hosts).reshape(self._num_envs,
+                                                                                            self._num_hosts)
+
+        hosts = np.stack([self._host_core,
+                          self._host_cores,
+                          self._host_mem,
+                          self._host_curr_mem / self._host_mem,
+                          self._host_curr_comp / self._host_cores,
+                          self._host_cost,
+                          DataCenter.local_hours(self._hour % self.__hours_per_day, self._host_offset),
+                          num_tasks_on_host], axis=-1)
+        tasks = np.stack([self._task_core,
+                          self._task_load,
+                          self._task_max_mem,
+                          self._task_profile,
+                          self._task_run_time,
+                          self._task_time_left,
+                          self._task_deficit,
+                          self._task_host], axis=-1)
+        return {'hosts': self.__as_float32(hosts),
+                'tasks': self.__as_float32(tasks),
+                'pending': self._task_host < 0}
+
+    def _run_hour(self,
+                  running: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Run one hour of every running task on its host
+        :param running: bool array (N, T) of tasks to run
+        :return: bool array (N, T) of tasks that ran out of memory, cost (N,) incurred by the running tasks
+        """
+        env_idx, task_idx = np.nonzero(running)
+        host_idx = self._task_host[env_idx, task_idx]
+
+        local_hour = DataCenter.local_hours(self._hour % self.__hours_per_day, self._host_offset[env_idx, host_idx])
+        shape = self._load_shapes[self._task_profile[env_idx, task_idx], local_hour]
+
+        vol = self._task_mem_vol[env_idx, task_idx]
+        max_mem = self._task_max_mem[env_idx, task_idx]
+        mem_demand = np.clip(np.ceil(max_mem * shape * (1 + self._rng.uniform(-vol, vol))), 0, max_mem)
+
+        equivalency = Core.core_compute_equivalencies(self._task_core[env_idx, task_idx],
+                                                      self._host_core[env_idx, host_idx])
+        comp_demand = (self._task_load[env_idx, task_idx] * shape + self._task_deficit[env_idx, task_idx]) / \
+            equivalency
+
+        # Random execution order of the tasks on each host, as the hosts random task iteration.
+        group = env_idx * self._num_hosts + host_idx
+        order = np.lexsort((self._rng.random_sample(len(group)), group))
+        group, env_idx, task_idx, host_idx = group[order], env_idx[order], task_idx[order], host_idx[order]
+        mem_demand, comp_demand = mem_demand[order], comp_demand[order]
+
+        mem_before = self.__grouped_exclusive_cumsum(mem_demand, group)
+        ok = mem_before + mem_demand <= self._host_mem[env_idx, host_idx]
+
+        # Demand above the host cores can never be met, so cap it to keep the running sum well conditioned.
+        host_cores = self._host_cores[env_idx, host_idx]
+        comp_before = self.__grouped_exclusive_cumsum(np.where(ok, np.minimum(comp_demand, host_cores), 0.0), group)
+        comp_available = np.maximum(0.0, host_cores - comp_before)
+        deficit = np.maximum(0.0, comp_demand - comp_available)
+        comp_used = np.where(ok, np.minimum(comp_demand, comp_available), 0.0)
+        cost = comp_used * self._host_cost[env_idx, host_idx]
+
+        ran = (env_idx[ok], task_idx[ok])
+        self._task_time_left[ran] -= 1
+        self._task_deficit[ran] = deficit[ok]
+
+        num_groups = self._num_envs * self._num_hosts
+        self._host_curr_mem = np.bincount(group, weights=np.where(ok, mem_demand, 0.0),
+                                          minlength=num_groups).reshape(self._num_envs, self._num_hosts)
+        self._host_curr_comp = np.bincount(group, weights=comp_used,
+                                           minlength=num_groups).reshape(self._num_envs, self._num_hosts)
+
+        oom = np.zeros_like(running)
+        oom[env_idx[~ok], task_idx[~ok]] = True
+        step_cost = np.bincount(env_idx, weights=cost, minlength=self._num_envs)
+        return oom, step_cost
+
+    def _reset_tasks(self,
+                     to_reset: np.ndarray) -> None:
+        """
+        Return the given (failed) tasks to their initial launch state, pending placement.
+        :param to_reset: bool array (N, T) of tasks to reset
+        """
+        self._task_time_left[to_reset] = self._task_run_time[to_reset]
+        self._task_deficit[to_reset] = 0
+        self._task_host[to_reset] = -1
+        return
+
+    def _new_tasks(self,
+                   to_replace: np.ndarray) -> None:
+        """
+        Replace the given tasks with newly drawn random tasks, pending placement.
+        :param to_replace: bool array (N, T) of tasks to replace
+        """
+        num_new = int(np.count_nonzero(to_replace))
+        if num_new == 0:
+            return
+        rtps = RandomTaskProfiles(num_new, self._rng)
+        self._task_core[to_replace] = rtps.cpu_types
+        self._task_load[to_replace] = rtps.task_loads
+        self._task_max_mem[to_replace] = rtps.max_mems
+        self._task_mem_vol[to_replace] = rtps.mem_volatilities
+        self._task_profile[to_replace] = rtps.load_profiles
+        self._task_run_time[to_replace] = rtps.run_times
+        self._reset_tasks(to_replace)
+        return
+
+    @classmethod
+    def __as_float32(cls,
+                     features: np.ndarray) -> np.ndarray:
+        """
+        Features as float32, clipped to the float32 range as compute deficits can grow without bound.
+        """
+        f32 = np.finfo(np.float32)
+        return np.clip(features, f32.min, f32.max).astype(np.float32)
+
+    @classmethod
+    def __grouped_exclusive_cumsum(cls,
+                                   values: np.ndarray,
+                                   groups: np.ndarray) -> np.ndarray:
+        """
+        The sum of the values before each value within its group
+        :param values: The values to sum
+        :param groups: The group of each value, values of the same group must be contiguous
+        :return: Exclusive cumulative sum of values restarted at the start of each group
+        """
+        if len(values) == 0:
+            return values
+        inclusive = np.cumsum(values)
+        idx = np.arange(len(values))
+        is_start = np.ones(len(values), dtype=bool)
+        is_start[1:] = groups[1:] != groups[:-1]
+        start = np.maximum.accumulate(np.where(is_start, idx, 0))
+        return inclusive - values - (inclusive[start] - values[start])
+
+
+if __name__ == "__main__":
+    from datetime import datetime
+
+    env = SchedulerEnv(num_envs=32, num_hosts=10, num_tasks=50, num_run_days=50, seed=42)
+    obs = env.reset()
+    num_steps = 0
+    total_reward = np.zeros(env.num_envs)
+    start = datetime.now()
+    done = np.zeros(env.num_envs, dtype=bool)
+    while not done.all():
+        obs, reward, done, info = env.step(env.random_action())
+        total_reward += reward
+        num_steps += 1
+    elapsed = (datetime.now() - start).total_seconds()
+    print('Steps: ' + str(num_steps) + ' in ' + str(elapsed) + 's = ' + str(int(num_steps / elapsed)) +
+          ' steps/sec over ' + str(env.num_envs) + ' environments')
+    print('Mean episode reward: ' + str(total_reward.mean()))
@@ -21,6 +21,12 @@ class SeqMap:
         """
         return deepcopy(self._name)
 
+    def __len__(self) -> int:
+        """
+        The number of values mapped
+        """
+        return len(self._idx_map)
+
     def value_as_seq_idx(self,
                          value) -> int:
         """
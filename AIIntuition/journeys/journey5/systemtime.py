@@ -27,3 +27,10 @@ class SystemTime:
     @property
     def hour_of_day(self):
         return deepcopy(self._hour_of_day)
+
+    @property
+    def hours(self) -> int:
+        """
+        The number of whole hours since the start of day zero.
+        """
+        return self._day_of_year * 24 + self._hour_of_day
@@ -4,6 +4,7 @@ from copy import deepcopy
 from typing import List
 from typing import Dict
 from random import randint
+import numpy as np
 
 """
 Abstract Base Class for anything that can be considered a compute load e.g. an Application.
@@ -32,9 +33,21 @@ class Task(ABC):
         MIDDAY_SPIKE = 'Midday'
         SAW_TOOTH = 'Saw'
 
+        def __init__(self,
+                     mnemonic: str):
+            self._ordinal = len(self.__class__.__members__)  # Declaration order, see CPUType.ordinal
+
         def __str__(self):
             return self.value
 
+        @property
+        def ordinal(self) -> int:
+            """
+            The stable integer ordinal of the Load Profile, this is the row of the profile in Task.load_shape_matrix()
+            :return: Ordinal in range 0 to len(Task.LoadProfile) - 1
+            """
+            return self._ordinal
+
     __activity_types_l = [LoadProfile.FLAT,
                           LoadProfile.START_OF_DAY_END_OF_DAY,
                           LoadProfile.MIDDAY_SPIKE,
@@ -45,6 +58,12 @@ class Task(ABC):
         LoadProfile.MIDDAY_SPIKE: __task_mid,
         LoadProfile.SAW_TOOTH: __task_saw
     }
+    # Rows in LoadProfile.ordinal order
+    __activity_m = np.array([__task_flat,
+                             __task_st_ed,
+                             __task_mid,
+                             __task_saw])
+    __activity_m.setflags(write=False)  # Shared, read only, by every caller of load_shape_matrix()
 
     @property
     @abstractmethod
@@ -82,6 +101,15 @@ class Task(ABC):
         """
         raise NotImplementedError
 
+    @property
+    @abstractmethod
+    def max_mem(self) -> int:
+        """
+        The maximum memory the Load can demand on the Compute resource it is running on
+        :return: The amount of memory in MG (int)
+        """
+        raise NotImplementedError
+
     @property
     @abstractmethod
     def current_mem(self) -> int:
@@ -214,6 +242,25 @@ class Task(ABC):
         """
         raise NotImplementedError
 
+    @property
+    @abstractmethod
+    def demand_history(self) -> 'DemandHistory':
+        """
+        The recent hourly compute & memory demand of the task and the forecast of its demand over the next 24 hours
+        :return: The demand history of the task, None if demand history is not being recorded
+        """
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def steady_state(self) -> bool:
+        """
+        Is the resource demand of the task the same every hour - a flat load profile, no memory volatility & no
+        compute deficit
+        :return: True if the task is in a steady state
+        """
+        raise NotImplementedError
+
     @classmethod
     def activity_types(cls) -> List['Task.LoadProfile']:
         """
@@ -230,6 +277,16 @@ class Task(ABC):
         """
         return deepcopy(cls.__activity)
 
+    @classmethod
+    def load_shape_matrix(cls) -> np.ndarray:
+        """
+        All load profiles as a dense array, this is called per task per hour so the shared matrix is given as a read
+        only view rather than a copy.
+        :return: Read only array of shape (num load profiles, 24) where row i is the load shape of the profile with
+        ordinal i
+        """
+        return cls.__activity_m.view()
+
     @classmethod
     def loads(cls) -> List['Task']:
         """
@@ -245,6 +302,27 @@ class Task(ABC):
         cls.__all_tasks[id_to_register] = inst
         return
 
+    @classmethod
+    def num_tasks(cls) -> int:
+        """
+        The number of currently registered tasks
+        """
+        return len(cls.__all_tasks)
+
+    @classmethod
+    def deregister(cls,
+                   task_id: str) -> None:
+        """
+        Remove the given task from the set of registered tasks and free its id e.g. when a task that has completed
+        is no longer needed.
+        :param task_id: The id of the task to remove
+        """
+        if task_id not in cls.__all_tasks:
+            raise ValueError('Task id:' + task_id + ' does not exist')
+        del cls.__all_tasks[task_id]
+        cls.__task_ids.pop(int(task_id), None)
+        return
+
     @classmethod
     def gen_id(cls,
                inst: 'Task') -> str:
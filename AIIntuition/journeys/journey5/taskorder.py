@@ -0,0 +1,75 @@
+from abc import ABC, abstractmethod
+from random import Random
+from typing import List
+from AIIntuition.journeys.journey5.task import Task
+
+"""
+The order in which a Host runs its associated tasks in each hour.
+"""
+
+
+class TaskOrder(ABC):
+    """
+    Plan the order in which the tasks associated with a Host are run in an hour. Every task in the plan is run
+    exactly once in the hour, the order decides which tasks are first to take the available compute.
+    """
+
+    @abstractmethod
+    def order(self,
+              tasks: List[Task]) -> List[Task]:
+        """
+        The order in which to run the given tasks this hour
+        :param tasks: The tasks associated with the Host
+        :return: The same tasks in the order they are to be run.
+        """
+        raise NotImplementedError
+
+
+class RandomTaskOrder(TaskOrder):
+    """
+    A fresh random order every hour.
+    """
+
+    def __init__(self,
+                 seed: int = None):
+        """
+        :param seed: Optional seed for the ordering, so the order does not change the simulation random stream
+        """
+        self._rnd = Random(seed)
+
+    def order(self,
+              tasks: List[Task]) -> List[Task]:
+        ordered = list(tasks)
+        self._rnd.shuffle(ordered)
+        return ordered
+
+
+class WeightedRoundRobinTaskOrder(TaskOrder):
+    """
+    Tasks are ordered by weight, the compute deficit the task is carrying plus its load factor, heaviest first. So
+    that tasks of equal weight take turns at the front, the start of the order rotates each hour among equal weights.
+    """
+
+    def __init__(self):
+        self._turn = 0
+
+    def order(self,
+              tasks: List[Task]) -> List[Task]:
+        if len(tasks) == 0:
+            return []
+        self._turn += 1
+        n = len(tasks)
+        ranked = sorted(range(0, n), key=lambda i: (-(tasks[i].compute_deficit + tasks[i].load_factor),
+                                                    (i - self._turn) % n))
+        return [tasks[i] for i in ranked]
+
+
+class DeadlineTaskOrder(TaskOrder):
+    """
+    Earliest deadline first, tasks with the fewest remaining hours of run time run first with ties going to the task
+    carrying the largest compute deficit.
+    """
+
+    def order(self,
+              tasks: List[Task]) -> List[Task]:
+        return sorted(tasks, key=lambda t: (t.curr_run_time, -t.compute_deficit))
@@ -17,6 +17,7 @@ class TestCaseSetUp:
         MEMORY_RESTRICTED = Cases.MemoryRestricted
         MULTI_DATACENTER = Cases.MultiDataCenterRestricted
         CORE_MISMATCH = Cases.CoreDemandActualMistMatch
+        STEADY_STATE = Cases.SteadyState
         RANDOM = RandomCase
 
     @classmethod
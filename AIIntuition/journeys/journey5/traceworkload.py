@@ -0,0 +1,236 @@
+import csv
+import os
+from typing import Dict, Iterable, Iterator, List, Tuple
+import numpy as np
+from AIIntuition.journeys.journey5.cputype import CPUType
+from AIIntuition.journeys.journey5.task import Task
+from AIIntuition.journeys.journey5.app import App
+from AIIntuition.journeys.journey5.fixedtaskprofile import FixedTaskProfile
+from AIIntuition.journeys.journey5.systemtime import SystemTime
+
+"""
+Replay a trace of task submissions from a local file as the schedule runs.
+"""
+
+
+class TraceWorkload:
+    """
+    Stream task submissions from a CSV or binary trace file, creating each App only when the system time reaches its
+    arrival hour. Rows are read lazily (a chunk at a time for binary traces) and only the next row is held ahead of
+    time, so memory is bounded by the number of live tasks rather than the length of the trace. Completed tasks are
+    released from the Task registry so a trace of millions of jobs can be replayed.
+
+    CSV traces have a header row naming the columns, arrival_hour, cpu_type, max_mem, load_factor & run_time are
+    required, mem_volatility (default 0) & load_profile (default Flat) are optional. arrival_hour is the absolute
+    hour (SystemTime.hours) of submission, cpu_type & load_profile are given by mnemonic (e.g. CPU, Saw) or name
+    (e.g. GENERAL, SAW_TOOTH). Binary traces are a headerless sequence of RECORD_DTYPE records with the CPU Type and
+    Load Profile given by ordinal, see write_binary. Rows must be in arrival order.
+    """
+
+    CSV_SUFFIX = '.csv'
+    RECORD_DTYPE = np.dtype([('arrival_hour', '<i8'),
+                             ('cpu_type', 'u1'),
+                             ('load_profile', 'u1'),
+                             ('max_mem', '<i8'),
+                             ('mem_volatility', '<f8'),
+                             ('load_factor', '<i8'),
+                             ('run_time', '<i8')])
+
+    def __init__(self,
+                 file_name: str,
+                 chunk_rows: int = 65536):
+        """
+        :param file_name: The trace file, read as CSV if the name ends .csv else as binary records
+        :param chunk_rows: The number of binary records to read from the file at a time
+        """
+        if not os.path.isfile(file_name):
+            raise ValueError('Trace file does not exist: ' + file_name)
+        if chunk_rows <= 0:
+            raise ValueError('Chunk rows must be > 0, given: ' + str(chunk_rows))
+        self._file_name = file_name
+        self._chunk_rows = chunk_rows
+        self._last_arrival = None
+        self._rows = self.rows()
+        self._next = next(self._rows, None)
+        self._live = {}  # Task Id : App submitted & not yet released
+        self._num_submitted = 0
+        self._num_released = 0
+
+    @property
+    def exhausted(self) -> bool:
+        """
+        True if every row of the trace has been submitted
+        """
+        return self._next is None
+
+    @property
+    def num_submitted(self) -> int:
+        """
+        The number of tasks created from the trace so far
+        """
+        return self._num_submitted
+
+    @property
+    def num_released(self) -> int:
+        """
+        The number of completed tasks released from the Task registry so far
+        """
+        return self._num_released
+
+    @property
+    def num_live(self) -> int:
+        """
+        The number of tasks submitted that have not yet completed
+        """
+        return len(self._live)
+
+    def rows(self) -> Iterator[Tuple[int, FixedTaskProfile]]:
+        """
+        Generator of the rows of the trace
+        :return: Iterator of (arrival hour, profile of the task) in file order
+        """
+        if self._file_name.lower().endswith(self.CSV_SUFFIX):
+            return self.__csv_rows()
+        return self.__binary_rows()
+
+    def arrivals(self,
+                 sys_time: SystemTime) -> List[App]:
+        """
+        Release the tasks that have completed since the last call & create the tasks that arrive by the given time
+        :param sys_time: The current system time, at the hour boundary
+        :return: The newly created tasks in trace order, to be placed by the caller
+        """
+        self.release()
+        now = sys_time.hours
+        apps = []
+        while self._next is not None and self._next[0] <= now:
+            app = App(self._next[1])
+            self._live[app.id] = app
+            apps.append(app)
+            self._next = next(self._rows, None)
+        self._num_submitted += len(apps)
+        return apps
+
+    def release(self) -> int:
+        """
+        Deregister all submitted tasks that have completed, such that the Task registry only holds live tasks.
+        :return: The number of tasks released
+        """
+        done = [task_id for task_id, app in self._live.items() if app.done]
+        for task_id in done:
+            del self._live[task_id]
+            Task.deregister(task_id)
+        self._num_released += len(done)
+        return len(done)
+
+    def __csv_rows(self) -> Iterator[Tuple[int, FixedTaskProfile]]:
+        with open(self._file_name, 'r', newline='') as f:
+            for row in csv.DictReader(f):
+                yield self.__in_order(int(row['arrival_hour'])), \
+                    FixedTaskProfile(max_mem=int(row['max_mem']),
+                                     mem_vol=float(row.get('mem_volatility') or 0),
+                                     cpu_type=self.__lookup(CPUType, row['cpu_type']),
+                                     load_profile=self.__lookup(Task.LoadProfile, row.get('load_profile') or 'Flat'),
+                                     load_factor=int(row['load_factor']),
+                                     run_time=int(row['run_time']))
+
+    def __binary_rows(self) -> Iterator[Tuple[int, FixedTaskProfile]]:
+        load_profiles = Task.activity_types()
+        with open(self._file_name, 'rb') as f:
+            while True:
+                chunk = np.fromfile(f, dtype=self.RECORD_DTYPE, count=self._chunk_rows)
+                if len(chunk) == 0:
+                    break
+                for rec in chunk.tolist():
+                    arrival_hour, cpu_type, load_profile, max_mem, mem_vol, load_factor, run_time = rec
+                    yield self.__in_order(arrival_hour), \
+                        FixedTaskProfile(max_mem=max_mem,
+                                         mem_vol=mem_vol,
+                                         cpu_type=CPUType.from_ordinal(cpu_type),
+                                         load_profile=load_profiles[load_profile],
+                                         load_factor=load_factor,
+                                         run_time=run_time)
+
+    def __in_order(self,
+                   arrival_hour: int) -> int:
+        """
+        Check the trace is in arrival order
+        """
+        if self._last_arrival is not None and arrival_hour < self._last_arrival:
+            raise ValueError('Trace rows must be in arrival order, hour ' + str(arrival_hour) + ' follows hour ' +
+                             str(self._last_arrival) + ' in ' + self._file_name)
+        self._last_arrival = arrival_hour
+        return arrival_hour
+
+    @classmethod
+    def __lookup(cls,
+                 enum_type,
+                 value: str):
+        """
+        The member of the given enum with the given mnemonic or name
+        """
+        value = value.strip()
+        for member in enum_type:
+            if member.value == value or member.name == value:
+                return member
+        raise ValueError('Unknown ' + enum_type.__name__ + ': ' + value)
+
+    @classmethod
+    def write_binary(cls,
+                     file_name: str,
+                     rows: Iterable[Dict],
+                     chunk_rows: int = 65536) -> int:
+        """
+        Write trace rows to a binary trace file, a chunk at a time. Binary traces are read much faster than CSV.
+        :param file_name: The binary trace file to write
+        :param rows: Iterable of dictionaries with the same keys & values as the rows of a CSV trace
+        :param chunk_rows: The number of records to write to the file at a time
+        :return: The number of rows written
+        """
+        written = 0
+        chunk = np.zeros(chunk_rows, dtype=cls.RECORD_DTYPE)
+        n = 0
+        with open(file_name, 'wb') as f:
+            for row in rows:
+                chunk[n] = (int(row['arrival_hour']),
+                            cls.__lookup(CPUType, str(row['cpu_type'])).ordinal,
+                            cls.__lookup(Task.LoadProfile, str(row.get('load_profile') or 'Flat')).ordinal,
+                            int(row['max_mem']),
+                            float(row.get('mem_volatility') or 0),
+                            int(row['load_factor']),
+                            int(row['run_time']))
+                n += 1
+                if n == chunk_rows:
+                    chunk.tofile(f)
+                    written += n
+                    n = 0
+            chunk[:n].tofile(f)
+            written += n
+        return written
+
+    @classmethod
+    def csv_to_binary(cls,
+                      csv_file_name: str,
+                      binary_file_name: str) -> int:
+        """
+        Convert a CSV trace to a binary trace
+        :return: The number of rows converted
+        """
+        with open(csv_file_name, 'r', newline='') as f:
+            return cls.write_binary(binary_file_name, csv.DictReader(f))
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        trace_csv = os.path.join(tmp_dir, 'trace.csv')
+        with open(trace_csv, 'w', newline='') as tf:
+            writer = csv.writer(tf)
+            writer.writerow(['arrival_hour', 'cpu_type', 'max_mem', 'load_factor', 'run_time', 'load_profile'])
+            for hr in range(0, 48):
+                writer.writerow([hr, 'CPU', 4, 2, 6, 'Saw'])
+        trace_bin = os.path.join(tmp_dir, 'trace.bin')
+        print(TraceWorkload.csv_to_binary(trace_csv, trace_bin))
+        tw = TraceWorkload(trace_bin)
+        print([a.id for a in tw.arrivals(SystemTime(0, 5))], tw.num_submitted, tw.exhausted)